@@ -0,0 +1,9 @@
+# ============================================================================
+# facility — analysis & export tools around wrestling_facility_phase1.py
+# ============================================================================
+# The macro owns the parameters and geometry; everything in here reads the
+# model through build_facility() / facility_layout() so nothing drifts.
+#
+# Run tools from the repo root, e.g.:
+#   python3 -m facility.sweep --range SUPPORT_DEPTH=20:30:1 -o sweep.csv
+# ============================================================================
@@ -0,0 +1,286 @@
+# ============================================================================
+# bench.py — scaling benchmarks with JSON baselines and regression checks
+# ============================================================================
+# Grows the model synthetically along one axis at a time and measures each
+# step, so we can see where one-document-object-per-box stops scaling:
+#
+#   mats         MAT_COUNT 3 -> 9 in a 250' wide building (extra mats go
+#                north in pairs; nine is the most the complex width holds)
+#   tele_rows    TELE_ROWS 16 -> 64
+#   column_bays  BLDG_WIDTH 100' -> 250' (5 -> 11 frames at 25')
+#   building     100' x 100' -> 200' x 250' (the full complex footprint)
+#   complex      all of the above together, up to the 200' x 250' complex
+#
+# Per step (fastest of --repeat builds, after one warm-up; the minimum is
+# the least noisy estimate of a deterministic step):
+#   create_ms     all numbered sections (object creation)
+#   recompute_ms  backend.recompute() / doc.recompute()
+#   export_ms     scene: .glb bytes (facility.gltf); freecad: save .FCStd
+#   doc_objects   document objects (freecad-batch: one compound per category)
+#   peak_kb       peak Python allocations during build + export (tracemalloc)
+# and per ladder a scaling exponent: create_ms ~ boxes^k (log-log fit).
+#
+# Baselines are plain JSON (results + thresholds).  --baseline compares a
+# run against one and exits 1 when a step is slower than threshold x the
+# baseline, so CI can gate on it.  Timings under the min_ms floor in the
+# baseline are skipped: sub-millisecond steps (the scene backend) vary by
+# more than the threshold from run to run, so only the FreeCAD backends'
+# timings are gated there.
+#
+# Run:
+#   python3 -m facility.bench -o bench/baseline.json
+#   python3 -m facility.bench --baseline bench/baseline.json
+#   python3 -m facility.bench --ladder tele_rows --backend freecad   # in FreeCAD
+#   python3 -m facility.bench --backend freecad-batch                # compounds
+# ============================================================================
+
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+from facility.gltf import build_glb
+from facility.profile import Profiler
+
+FT = model.FT
+
+BENCH_VERSION = 2   # 2: fastest-of-N timings (1 was the median)
+
+# Defaults written into new baselines; a baseline's own values win
+DEFAULT_THRESHOLDS = {
+    "time": 1.5,      # x baseline
+    "memory": 1.25,   # x baseline
+    "min_ms": 5.0,    # timings shorter than this are not compared (timer noise)
+    "min_kb": 64.0,
+}
+
+
+LADDERS = {
+    "mats": [{"MAT_COUNT": n, "BLDG_WIDTH": 250 * FT} for n in (3, 5, 7, 9)],
+    "tele_rows": [{"TELE_ROWS": n} for n in (16, 32, 48, 64)],
+    "column_bays": [{"BLDG_WIDTH": w * FT} for w in (100, 150, 200, 250)],
+    "building": [{"BLDG_LENGTH": l * FT, "BLDG_WIDTH": w * FT}
+                 for l, w in ((100, 100), (133, 150), (167, 200), (200, 250))],
+    "complex": [
+        {"BLDG_LENGTH": l * FT, "BLDG_WIDTH": w * FT, "MAT_COUNT": m, "TELE_ROWS": r}
+        for l, w, m, r in ((100, 100, 3, 16), (150, 175, 5, 32),
+                           (200, 250, 7, 48), (200, 250, 9, 64))
+    ],
+}
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+BACKENDS = {
+    "scene": model.SceneBackend,
+    "freecad": lambda: model.FreeCADBackend("FacilityBench"),
+    "freecad-batch": lambda: model.FreeCADBackend("FacilityBench", batch=True),
+}
+
+
+def _backend_factory(name):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend: {name}")
+    return BACKENDS[name]
+
+
+def _export(backend):
+    if isinstance(backend, model.SceneBackend):
+        return len(build_glb(backend))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.FCStd")
+        backend.doc.saveAs(path)
+        return os.path.getsize(path)
+
+
+def _close(backend):
+    doc = getattr(backend, "doc", None)
+    if doc is not None:
+        import FreeCAD as App
+        App.closeDocument(doc.Name)
+
+
+def measure_step(params, backend="scene", repeat=5):
+    """Fastest timings (ms), peak allocations and object counts for one step."""
+    factory = _backend_factory(backend)
+    runs = []
+    for i in range(repeat + 1):  # First build is a warm-up
+        profiler = Profiler(helpers=False)
+        scene = model.build_facility(params, factory(), profiler=profiler)
+        t0 = time.perf_counter()
+        size = _export(scene)
+        export_ms = (time.perf_counter() - t0) * 1000
+        create = sum(s["ms"] for s in profiler.sections if s["name"] != "recompute")
+        recompute = sum(s["ms"] for s in profiler.sections if s["name"] == "recompute")
+        boxes, labels = len(scene), len(scene.labels)
+        objects = len(scene.doc.Objects) if hasattr(scene, "doc") else boxes + labels
+        _close(scene)
+        if i:
+            runs.append((create, recompute, export_ms))
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    scene = model.build_facility(params, factory())
+    _export(scene)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    _close(scene)
+    if not tracing:
+        tracemalloc.stop()
+
+    create, recompute, export_ms = (min(col) for col in zip(*runs))
+    return {
+        "params": {name: cli_params.from_model(name, value)
+                   for name, value in params.items()},
+        "boxes": boxes, "labels": labels, "doc_objects": objects,
+        "create_ms": round(create, 4),
+        "recompute_ms": round(recompute, 4),
+        "export_ms": round(export_ms, 4),
+        "export_bytes": size,
+        "peak_kb": round(peak / 1024, 1),
+        "us_per_box": round(1000 * create / max(boxes, 1), 3),
+    }
+
+
+def scaling_exponent(steps, key="create_ms"):
+    """k in key ~ boxes^k over a ladder (None if boxes don't vary)."""
+    boxes = np.array([s["boxes"] for s in steps], dtype=float)
+    values = np.array([max(s[key], 1e-6) for s in steps])
+    if len(set(boxes)) < 2:
+        return None
+    return round(float(np.polyfit(np.log(boxes), np.log(values), 1)[0]), 2)
+
+
+def run_suite(ladders, backend="scene", repeat=5):
+    results = {}
+    for name in ladders:
+        steps = [measure_step(params, backend, repeat) for params in LADDERS[name]]
+        results[name] = {"steps": steps, "exponent": scaling_exponent(steps)}
+    return {
+        "version": BENCH_VERSION,
+        "meta": {
+            "backend": backend, "repeat": repeat,
+            "python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.machine(), "system": platform.system(),
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "thresholds": dict(DEFAULT_THRESHOLDS),
+        "ladders": results,
+    }
+
+# ============================================================================
+# BASELINES
+# ============================================================================
+
+def compare(current, baseline):
+    """(regressions, skipped): regression dicts (ladder, step, metric,
+    baseline, current) and the number of timings under the min_ms floor."""
+    if baseline.get("version") != BENCH_VERSION:
+        raise ValueError(f"baseline is bench v{baseline.get('version')}, "
+                         f"this is v{BENCH_VERSION} - record a new one")
+    t = dict(DEFAULT_THRESHOLDS, **baseline.get("thresholds", {}))
+    regressions = []
+    skipped = 0
+    for name, ladder in current["ladders"].items():
+        base = baseline["ladders"].get(name)
+        if base is None:
+            continue
+        for i, (cur, old) in enumerate(zip(ladder["steps"], base["steps"])):
+            if cur["params"] != old["params"]:
+                continue  # Ladder definition changed - not comparable
+            for metric in ("create_ms", "recompute_ms", "export_ms"):
+                if old[metric] < t["min_ms"]:
+                    skipped += 1
+                    continue  # Too short to time reliably
+                if cur[metric] > old[metric] * t["time"]:
+                    regressions.append({"ladder": name, "step": i, "metric": metric,
+                                        "baseline": old[metric], "current": cur[metric]})
+            if (cur["peak_kb"] > old["peak_kb"] * t["memory"]
+                    and cur["peak_kb"] - old["peak_kb"] > t["min_kb"]):
+                regressions.append({"ladder": name, "step": i, "metric": "peak_kb",
+                                    "baseline": old["peak_kb"], "current": cur["peak_kb"]})
+    return regressions, skipped
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def print_results(results, baseline=None):
+    print("=" * 60)
+    print(f"  SCALING BENCHMARK ({results['meta']['backend']} backend, "
+          f"fastest of {results['meta']['repeat']})")
+    print("=" * 60)
+    for name, ladder in results["ladders"].items():
+        old = (baseline or {}).get("ladders", {}).get(name, {}).get("steps", [])
+        steps = [" ".join(f"{k}={v:g}" for k, v in s["params"].items())
+                 for s in ladder["steps"]]
+        width = max(len(step) for step in steps) + 2
+        print(f"  {name}  (create ~ boxes^{ladder['exponent']})")
+        print(f"  {'step':<{width}}{'boxes':>6}{'create':>9}{'recomp':>8}"
+              f"{'export':>8}{'KB':>8}")
+        for i, (step, s) in enumerate(zip(steps, ladder["steps"])):
+            delta = ""
+            if i < len(old) and old[i]["create_ms"]:
+                delta = f" {100 * (s['create_ms'] / old[i]['create_ms'] - 1):+.0f}%"
+            print(f"  {step:<{width}}{s['boxes']:>6}{s['create_ms']:>9.3f}"
+                  f"{s['recompute_ms']:>8.3f}{s['export_ms']:>8.3f}"
+                  f"{s['peak_kb']:>8.0f}{delta}")
+    print("=" * 60)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m facility.bench",
+                                     description="Scaling benchmarks for the model.")
+    parser.add_argument("--ladder", action="append", choices=list(LADDERS),
+                        help="run only these ladders (repeatable)")
+    parser.add_argument("--backend", choices=list(BACKENDS), default="scene")
+    parser.add_argument("--repeat", type=cli_params.positive_int, default=5)
+    parser.add_argument("-o", "--output", help="write results (.json) - a new baseline")
+    parser.add_argument("--baseline", help="compare against this results file")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = run_suite(args.ladder or list(LADDERS), args.backend, args.repeat)
+    print_results(results, baseline)
+
+    if args.output:
+        if os.path.dirname(args.output):
+            os.makedirs(os.path.dirname(args.output), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"  Saved:        {args.output}")
+
+    if baseline is not None:
+        try:
+            regressions, skipped = compare(results, baseline)
+        except ValueError as e:
+            parser.error(f"{args.baseline}: {e}")
+        for r in regressions:
+            print(f"  REGRESSION {r['ladder']}[{r['step']}] {r['metric']}: "
+                  f"{r['baseline']:g} -> {r['current']:g}")
+        if not regressions:
+            print(f"  No regressions against {args.baseline}")
+        if skipped:
+            floor = dict(DEFAULT_THRESHOLDS, **baseline.get("thresholds", {}))["min_ms"]
+            print(f"  Not compared: {skipped} timings under {floor:g} ms")
+        print("=" * 60)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,240 @@
+# ============================================================================
+# cache.py — content-addressed on-disk build cache, one entry per section
+# ============================================================================
+# Each numbered section of the macro (slab/footings, exterior walls, rooms,
+# mats, roof, columns, doors, PLEX FLEX pits/beams/flaps, labels) is keyed by
+# a SHA-256 of exactly the inputs it reads: the parameters and derived layout
+# values it touches, and the code of the section plus every model function
+# it calls (mat_positions, facility_labels, make_box, ...) with the module
+# constants they name (colors, FT, ...).  Editing a helper misses the cache.
+#
+# What is stored is the section's built geometry: one BREP compound of its
+# boxes (plus the Box/Label records, so the boxes stay editable and labels
+# can be redrawn).  A hit restores the whole section into a FreeCAD document
+# with one add_shape() call - one Part::Feature instead of a Part::Box per
+# box, nothing to tessellate per box.  The in-memory SceneBackend builds a
+# section faster than any replay, so it bypasses the cache.
+#
+# The cache directory is size-bounded: hits refresh an entry's mtime and the
+# least recently used entries are evicted once the total passes max_bytes.
+#
+#   cache = BuildCache()
+#   model.build_facility(params, model.FreeCADBackend(), cache=cache)
+#
+#   freecadcmd -c "import sys; sys.argv=['x','--build','SUPPORT_DEPTH=26']; \
+#       from facility.cache import main; main()"    # build + hit report
+#   python3 -m facility.cache --stats | --clear
+#
+# Directory: $FACILITY_CACHE_DIR, default ~/.cache/loudon-desarro/build
+# ============================================================================
+
+import argparse
+import hashlib
+import marshal
+import os
+import pickle
+import tempfile
+import types
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+
+CACHE_VERSION = 2
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "loudon-desarro", "build")
+
+# ============================================================================
+# SECTION INPUTS (which params / layout values a section reads)
+# ============================================================================
+
+class _Tracer:
+    """Namespace proxy that records every attribute name read through it."""
+
+    def __init__(self, ns):
+        self._ns = ns
+        self.read = set()
+
+    def __getattr__(self, name):
+        self.read.add(name)
+        return getattr(self._ns, name)
+
+
+_inputs = {}  # section function -> (param names, layout names)
+
+
+def section_inputs(section, p, L):
+    """Sorted parameter and layout names `section` reads (traced once)."""
+    if section not in _inputs:
+        tp, tL = _Tracer(p), _Tracer(L)
+        with model.drawing_into(model.SceneBackend()):
+            section(tp, tL)
+        _inputs[section] = (sorted(tp.read), sorted(tL.read))
+    return _inputs[section]
+
+
+def _code_inputs(code, found):
+    """Model functions and constants reachable from `code` by global name."""
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):  # Comprehensions, lambdas
+            _code_inputs(const, found)
+    for name in code.co_names:
+        if name in found or not hasattr(model, name):
+            continue
+        value = getattr(model, name)
+        if isinstance(value, types.FunctionType) and value.__module__ == model.__name__:
+            found[name] = marshal.dumps((value.__code__, value.__defaults__))
+            _code_inputs(value.__code__, found)
+        elif isinstance(value, (bool, int, float, str, tuple)):
+            found[name] = repr(value).encode()
+
+
+_code = {}  # section function -> digest of everything it runs
+
+
+def section_code(section):
+    """Digest of the section's code, the model functions it reaches and
+    the module constants they name."""
+    if section not in _code:
+        found = {section.__name__: marshal.dumps(section.__code__)}
+        _code_inputs(section.__code__, found)
+        h = hashlib.sha256()
+        for name in sorted(found):
+            h.update(name.encode() + b"\0" + found[name])
+        _code[section] = h.digest()
+    return _code[section]
+
+
+def section_key(key, section, p, L):
+    """Content address for one section at one parameter set."""
+    param_names, layout_names = section_inputs(section, p, L)
+    h = hashlib.sha256()
+    h.update(f"v{CACHE_VERSION}:{key}".encode())
+    h.update(section_code(section))
+    h.update(repr([(n, getattr(p, n)) for n in param_names]).encode())
+    h.update(repr([(n, getattr(L, n)) for n in layout_names]).encode())
+    return h.hexdigest()
+
+# ============================================================================
+# BUILD CACHE
+# ============================================================================
+
+class BuildCache:
+    """Size-bounded LRU directory of pickled section geometry."""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or os.environ.get("FACILITY_CACHE_DIR", DEFAULT_DIR)
+        self.max_bytes = max_bytes
+        self.hits = []
+        self.misses = []
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, digest):
+        return os.path.join(self.directory, digest + ".pkl")
+
+    def get(self, digest):
+        path = self._path(digest)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        os.utime(path)  # LRU: a hit makes the entry most recent
+        return entry
+
+    def put(self, digest, entry):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(digest))
+        self.evict()
+
+    def entries(self):
+        """[(mtime, size, path)] of cache entries, oldest first."""
+        out = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                st = entry.stat()
+                out.append((st.st_mtime, st.st_size, entry.path))
+        return sorted(out)
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            os.remove(path)
+
+    def run_section(self, key, section, p, L):
+        """Restore `section` from cache, or build and store it.
+
+        Backends without add_shape (the in-memory scene) just run it.
+        """
+        backend = model.active_backend()
+        if not hasattr(backend, "add_shape"):
+            section(p, L)
+            return
+        digest = section_key(key, section, p, L)
+        entry = self.get(digest)
+        if entry is None:
+            scene = model.SceneBackend()
+            with model.drawing_into(scene):
+                section(p, L)
+            brep = backend.compound_shape(scene.boxes).exportBrepToString() \
+                if scene.boxes else None
+            entry = {"brep": brep, "boxes": scene.boxes, "labels": scene.labels}
+            self.put(digest, entry)
+            self.misses.append(key)
+        else:
+            self.hits.append(key)
+        if entry["boxes"]:
+            backend.add_shape(key, entry["brep"], entry["boxes"])
+        for label in entry["labels"]:
+            backend.add_label(*label)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m facility.cache",
+                                     description="Section build cache.")
+    parser.add_argument("--build", nargs="*", metavar="NAME=VALUE",
+                        help="build with these overrides and report hits/misses")
+    parser.add_argument("--stats", action="store_true", help="show cache size")
+    parser.add_argument("--clear", action="store_true", help="delete all entries")
+    parser.add_argument("--dir", default=None, help="cache directory")
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_BYTES / 2**20)
+    args = parser.parse_args(argv)
+
+    cache = BuildCache(args.dir, int(args.max_mb * 2**20))
+    if args.clear:
+        cache.clear()
+        print(f"  Cleared {cache.directory}")
+    if args.build is not None:
+        try:
+            backend = model.FreeCADBackend("FacilityCache")
+        except ImportError:
+            parser.error("--build needs FreeCAD (run it inside freecadcmd)")
+        doc = model.build_facility(cli_params.parse_overrides(args.build), backend, cache=cache)
+        print(f"  Built {len(doc)} boxes, {len(doc.labels)} labels, "
+              f"{len(doc.doc.Objects)} document objects")
+        print(f"  Hits   ({len(cache.hits)}): {' '.join(cache.hits)}")
+        print(f"  Misses ({len(cache.misses)}): {' '.join(cache.misses)}")
+    if args.stats or args.build is None and not args.clear:
+        entries = cache.entries()
+        total = sum(size for _, size, _ in entries)
+        print(f"  {cache.directory}: {len(entries)} entries, "
+              f"{total / 1024:.1f} KB of {cache.max_bytes / 2**20:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
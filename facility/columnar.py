@@ -0,0 +1,58 @@
+# ============================================================================
+# columnar.py — streaming column-chunk writers (.parquet / .csv)
+# ============================================================================
+# Every writer takes {column name: 1-D array} chunks, all the same length,
+# and appends them to one file.  Parquet needs pyarrow; CSV is stdlib.
+# ============================================================================
+
+import csv
+
+import numpy as np
+
+
+class CsvWriter:
+    def __init__(self, path):
+        self._file = open(path, "w", newline="")
+        self._csv = csv.writer(self._file)
+        self._header = False
+
+    def write(self, cols):
+        if not self._header:
+            self._csv.writerow(cols.keys())
+            self._header = True
+        self._csv.writerows(zip(*(c.tolist() for c in cols.values())))
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    def __init__(self, path):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow (pip install pyarrow) "
+                             "- or write .csv instead")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._path = path
+        self._writer = None
+
+    def write(self, cols):
+        table = self._pa.table({k: np.ascontiguousarray(v) for k, v in cols.items()})
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_writer(path):
+    if path.endswith(".parquet"):
+        return ParquetWriter(path)
+    if path.endswith(".csv"):
+        return CsvWriter(path)
+    raise SystemExit(f"Unsupported output format: {path} (use .parquet or .csv)")
@@ -0,0 +1,283 @@
+# ============================================================================
+# diff.py — geometric change order between two parameter revisions
+# ============================================================================
+# Builds both revisions in memory and matches objects by the stable names
+# the sections already use (Floor_Office, Pit_North,
+# ElevatingBeam_South_Row_3, ...).  One dict join on names, then
+# vectorized comparison of positions and sizes quantized to TOLERANCE:
+#
+#   added / removed   name only in the new / old revision
+#   moved             same size, different origin (dx, dy, dz)
+#   resized           different length, width or height (may also move)
+#   recolored         same geometry, different color
+#   labels            text changed or moved
+#
+# Quantity deltas reuse facility.takeoff's measures: per object (what each
+# change adds or removes, in the material's pricing unit) and per material.
+# Each revision also gets a digest of its quantized geometry, colors and
+# labels, so identical models are recognised without looking at a single
+# object.  Runs in linear time - tens of thousands of objects diff in
+# milliseconds.
+#
+# Run:
+#   python3 -m facility.diff OFFICE_WIDTH=22
+#   python3 -m facility.diff TELE_PIT_WIDTH=14 --base TELE_PIT_WIDTH=12 \
+#       -o change_order.csv --totals deltas.json
+# ============================================================================
+
+import argparse
+import hashlib
+import json
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+from facility.columnar import open_writer
+from facility.takeoff import MATERIAL_NAMES, MATERIALS, measure, scene_codes
+
+FT = model.FT
+
+TOLERANCE = 0.5           # mm; smaller differences are float noise
+LIST_LIMIT = 40           # objects listed per change kind in the report
+
+# ============================================================================
+# SNAPSHOTS
+# ============================================================================
+
+def snapshot(scene, tolerance=TOLERANCE):
+    """Quantized struct-of-arrays view of a scene plus its name index."""
+    names, dims, origin = scene.to_arrays()
+    s = SimpleNamespace(names=names, dims=dims, origin=origin)
+    s.q_dims = np.round(dims / tolerance).astype(np.int64)
+    s.q_origin = np.round(origin / tolerance).astype(np.int64)
+    s.index = {name: i for i, name in enumerate(names)}
+    s.colors = [b.color for b in scene.boxes]
+    s.codes = scene_codes(scene)
+    s.labels = {lb.name: (lb.text, round(lb.x / tolerance), round(lb.y / tolerance),
+                          round(lb.z / tolerance)) for lb in scene.labels}
+    return s
+
+
+def digest(snap):
+    """sha256 of names, quantized geometry, colors and labels."""
+    h = hashlib.sha256()
+    h.update("\0".join(snap.names).encode())
+    h.update(snap.q_dims.tobytes())
+    h.update(snap.q_origin.tobytes())
+    h.update(repr(snap.colors).encode())
+    h.update(repr(sorted(snap.labels.items())).encode())
+    return h.hexdigest()
+
+# ============================================================================
+# DIFF
+# ============================================================================
+
+def diff_scenes(old, new, tolerance=TOLERANCE):
+    """Change set between two in-memory scenes.
+
+    Returns a namespace: added, removed, moved, resized, recolored (name
+    lists), labels (changed label names), delta {name: (dx, dy, dz) mm},
+    quantity {name: pricing-unit delta}, totals {material: delta dict},
+    digests (old, new), objects (old count, new count), the two
+    snapshots as old / new and the tolerance used.
+    """
+    a, b = snapshot(old, tolerance), snapshot(new, tolerance)
+    d = SimpleNamespace(old=a, new=b, digests=(digest(a), digest(b)),
+                        objects=(len(a.names), len(b.names)), tolerance=tolerance)
+    d.added = [n for n in b.names if n not in a.index]
+    d.removed = [n for n in a.names if n not in b.index]
+    d.moved, d.resized, d.recolored = [], [], []
+    d.delta, d.quantity = {}, {}
+    d.labels = sorted(n for n in set(a.labels) | set(b.labels)
+                      if a.labels.get(n) != b.labels.get(n))
+
+    qa, qb = measure(a.codes, a.dims)["quantity"], measure(b.codes, b.dims)["quantity"]
+    k = len(MATERIAL_NAMES)
+    sums_a = np.bincount(a.codes, weights=qa, minlength=k)
+    sums_b = np.bincount(b.codes, weights=qb, minlength=k)
+    count_a = np.bincount(a.codes, minlength=k)
+    count_b = np.bincount(b.codes, minlength=k)
+    d.totals = {}
+    for i, material in enumerate(MATERIAL_NAMES):
+        if abs(sums_b[i] - sums_a[i]) > 1e-9 or count_a[i] != count_b[i]:
+            info = MATERIALS[material]
+            d.totals[material] = {
+                "contractor": info.contractor, "unit": info.unit,
+                "old": round(float(sums_a[i]), 2), "new": round(float(sums_b[i]), 2),
+                "delta": round(float(sums_b[i] - sums_a[i]), 2),
+                "count_delta": int(count_b[i] - count_a[i]),
+            }
+
+    if d.digests[0] == d.digests[1]:
+        return d
+
+    common = [n for n in b.names if n in a.index]
+    ia = np.fromiter((a.index[n] for n in common), dtype=np.int64, count=len(common))
+    ib = np.fromiter((b.index[n] for n in common), dtype=np.int64, count=len(common))
+    moved = (a.q_origin[ia] != b.q_origin[ib]).any(axis=1)
+    resized = (a.q_dims[ia] != b.q_dims[ib]).any(axis=1)
+    for j in np.flatnonzero(moved | resized):
+        name = common[j]
+        (d.resized if resized[j] else d.moved).append(name)
+        if moved[j]:
+            d.delta[name] = tuple(b.origin[ib[j]] - a.origin[ia[j]])
+        if resized[j]:
+            d.quantity[name] = float(qb[ib[j]] - qa[ia[j]])
+    same = np.flatnonzero(~(moved | resized))
+    d.recolored = [common[j] for j in same if a.colors[ia[j]] != b.colors[ib[j]]]
+    d.quantity.update((n, float(qb[b.index[n]])) for n in d.added)
+    d.quantity.update((n, -float(qa[a.index[n]])) for n in d.removed)
+    return d
+
+
+def diff_params(base=None, new=None, tolerance=TOLERANCE):
+    """Build both parameter revisions and diff them."""
+    return diff_scenes(model.build_facility(base), model.build_facility(new), tolerance)
+
+
+def change_order(d):
+    """One row per changed object, for a columnar file (lengths in feet)."""
+    rows = ([(n, "added") for n in d.added] + [(n, "removed") for n in d.removed]
+            + [(n, "moved+resized" if n in d.delta else "resized") for n in d.resized]
+            + [(n, "moved") for n in d.moved] + [(n, "recolored") for n in d.recolored])
+    if not rows:
+        return None
+    cols = {k: [] for k in ("name", "change", "material", "contractor", "unit",
+                            "dx_ft", "dy_ft", "dz_ft", "old_size_ft", "new_size_ft",
+                            "quantity_delta")}
+    for name, change in rows:
+        snap = d.new if name in d.new.index else d.old
+        material = MATERIAL_NAMES[snap.codes[snap.index[name]]]
+        dx, dy, dz = d.delta.get(name, (0.0, 0.0, 0.0))
+        cols["name"].append(name)
+        cols["change"].append(change)
+        cols["material"].append(material)
+        cols["contractor"].append(MATERIALS[material].contractor)
+        cols["unit"].append(MATERIALS[material].unit)
+        cols["dx_ft"].append(dx / FT)
+        cols["dy_ft"].append(dy / FT)
+        cols["dz_ft"].append(dz / FT)
+        cols["old_size_ft"].append(_size(d.old, name))
+        cols["new_size_ft"].append(_size(d.new, name))
+        cols["quantity_delta"].append(d.quantity.get(name, 0.0))
+    return {k: np.array(v) for k, v in cols.items()}
+
+
+def _size(snap, name):
+    if name not in snap.index:
+        return ""
+    return " x ".join(f"{v / FT:.2f}'" for v in snap.dims[snap.index[name]])
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def _label_text(d, name):
+    """'added' / 'removed', or the text and/or position change of a label."""
+    old, new = d.old.labels.get(name), d.new.labels.get(name)
+    if old is None or new is None:
+        return "added" if old is None else "removed"
+    parts = []
+    if old[0] != new[0]:
+        parts.append(f"{_flat(old[0])!r} -> {_flat(new[0])!r}")
+    if old[1:] != new[1:]:
+        step = d.tolerance
+        parts.append(_move_text([(b - a) * step for a, b in zip(old[1:], new[1:])], step))
+    return "  ".join(parts)
+
+
+def _flat(text):
+    return text.replace("\n", " ")
+
+
+def _move_text(delta, tolerance=TOLERANCE):
+    return " ".join(f"d{axis} {v / FT:+.2f}'" for axis, v in zip("xyz", delta)
+                    if abs(v) >= tolerance)
+
+
+def print_diff(d, title, elapsed, limit=LIST_LIMIT):
+    print("=" * 60)
+    print(f"  CHANGE ORDER: {title}")
+    print("=" * 60)
+    print(f"  Objects:      {d.objects[0]:,} -> {d.objects[1]:,} "
+          f"({len(d.added)} added, {len(d.removed)} removed, {len(d.moved)} moved, "
+          f"{len(d.resized)} resized, {len(d.recolored)} recolored, "
+          f"{len(d.labels)} labels)")
+    if d.digests[0] == d.digests[1]:
+        print(f"  Identical model (digest {d.digests[0][:12]})")
+    groups = [("Added", d.added), ("Removed", d.removed),
+              ("Resized", d.resized), ("Moved", d.moved), ("Recolored", d.recolored),
+              ("Label", d.labels)]
+    for kind, names in groups:
+        for name in names[:limit]:
+            detail = ""
+            if kind == "Resized":
+                detail = f"{_size(d.old, name)} -> {_size(d.new, name)}"
+                if name in d.delta:
+                    detail += "  " + _move_text(d.delta[name], d.tolerance)
+            elif kind == "Moved":
+                detail = _move_text(d.delta[name], d.tolerance)
+            elif kind == "Label":
+                detail = _label_text(d, name)
+            print(f"  {kind:<10}{name:<30} {detail}")
+        if len(names) > limit:
+            print(f"  {kind:<10}... {len(names) - limit} more")
+    if d.totals:
+        print("  Quantity deltas")
+        for material, t in d.totals.items():
+            count = f" ({t['count_delta']:+d} objects)" if t["count_delta"] else ""
+            print(f"  - {material:<20} {t['delta']:>+12,.2f} {t['unit']:<3} "
+                  f"{t['contractor']}{count}")
+    print(f"  Time:         {elapsed * 1000:.1f} ms")
+    print("=" * 60)
+
+
+def _title(base, new):
+    names = [n for n in model.PARAM_NAMES if base.get(n) != new.get(n)
+             and (n in base or n in new)]
+    defaults = model.default_params()
+
+    def show(params, n):
+        return f"{cli_params.from_model(n, params.get(n, defaults[n])):g}"
+
+    return ", ".join(f"{n} {show(base, n)} -> {show(new, n)}" for n in names) \
+        or "no parameter changes"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m facility.diff",
+                                     description="Change order between two parameter revisions.")
+    parser.add_argument("overrides", nargs="*", metavar="NAME=VALUE",
+                        help="new revision (feet for lengths)")
+    parser.add_argument("--base", action="append", default=[], metavar="NAME=VALUE",
+                        help="old revision overrides (default: the macro's values)")
+    parser.add_argument("--tolerance", type=cli_params.positive_float, default=TOLERANCE,
+                        help="mm below which positions and sizes count as equal")
+    parser.add_argument("--limit", type=int, default=LIST_LIMIT,
+                        help="objects listed per change kind")
+    parser.add_argument("-o", "--output", help="per-object change order (.csv or .parquet)")
+    parser.add_argument("--totals", help="per-material quantity deltas (.json)")
+    args = parser.parse_args(argv)
+
+    base = cli_params.parse_overrides(args.base)
+    new = dict(base, **cli_params.parse_overrides(args.overrides))
+    t0 = time.perf_counter()
+    d = diff_params(base, new, args.tolerance)
+    print_diff(d, _title(base, new), time.perf_counter() - t0, args.limit)
+
+    if args.output:
+        cols = change_order(d)
+        if cols is not None:
+            writer = open_writer(args.output)
+            writer.write(cols)
+            writer.close()
+    if args.totals:
+        with open(args.totals, "w") as f:
+            json.dump(d.totals, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+# ============================================================================
+# egress.py — Monte Carlo evacuation of a full PLEX FLEX crowd
+# ============================================================================
+# Gives the fire marshal a clearance-time distribution for TELE_EXTRA_SEATS
+# spectators plus floor spectators, using only the macro's geometry:
+#
+#   grid       0.5 m cells (one person per cell) over the building plan
+#   blocked    walls and columns that stand in the 0-7' walking band
+#   exits      cells covered by Door_* boxes on the exterior walls
+#   seating    plan footprint of the ElevatingBeam_* rows, deployed (the
+#              flaps are open and the pits are filled by the rising rows) -
+#              walkable at stair speed
+#
+# Every one of the TELE_EXTRA_SEATS spectators is simulated: when the seat
+# cells run out the overflow stands on the floor with the floor spectators,
+# and a crowd that does not fit in the building is an error, not a smaller
+# run.
+#
+# A flow field (walking distance to the nearest exit, 8-connected, no
+# corner cutting) is computed once per layout.  Each run then steps a
+# floor-field cellular automaton vectorized over all agents: everyone
+# picks the free neighbour cell that lowers their distance most (plus a
+# little noise), conflicts for one cell go to a random winner, and each
+# door lets people out at most at DOOR_FLOW persons/s per metre of width.
+# Runs with different seeds are spread across a process pool.
+#
+# Outputs: clearance time percentiles, per-door counts, and two heatmaps
+# (person-seconds of occupancy and of queueing - blocked while wanting to
+# move) saved to .npz, plus an optional .ppm image of the queue map.
+#
+# Run:
+#   python3 -m facility.egress --runs 200 -o egress.npz --ppm queues.ppm
+# ============================================================================
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+
+FT = model.FT
+
+CELL = 500.0           # mm - one person per 0.5 m cell
+WALK_SPEED = 1.3       # m/s on the floor
+SEATING_SPEED = 0.5    # fraction of floor speed on the beam rows (stairs)
+DOOR_FLOW = 1.3        # persons / s / m of clear door width
+BAND_TOP = 7 * FT      # obstacles that reach into 0..7' block walking
+NOISE = 0.3            # cells - randomness in the floor-field choice
+DEFAULT_FLOOR_SPECTATORS = 400
+
+BLOCKED, FLOOR, SEATING, EXIT = 0, 1, 2, 3
+
+# 8 neighbours: (dx, dy, step length in cells)
+_NEIGHBOURS = [(1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+               (1, 1, 2 ** 0.5), (1, -1, 2 ** 0.5), (-1, 1, 2 ** 0.5), (-1, -1, 2 ** 0.5)]
+
+# ============================================================================
+# FLOOR GRID (rasterized from the model)
+# ============================================================================
+
+def _cells(box, nx, ny):
+    """Cell index ranges any part of a box's footprint covers."""
+    x0 = max(int(np.floor(box.x / CELL)), 0)
+    x1 = min(int(np.ceil((box.x + box.length) / CELL)), nx)
+    y0 = max(int(np.floor(box.y / CELL)), 0)
+    y1 = min(int(np.ceil((box.y + box.width) / CELL)), ny)
+    return slice(x0, x1), slice(y0, y1)
+
+
+def build_floor(params=None):
+    """Rasterize the model into a walking grid and its exit flow field."""
+    scene = model.build_facility(params)
+    p = scene.params
+    nx = int(np.ceil(p.BLDG_LENGTH / CELL))
+    ny = int(np.ceil(p.BLDG_WIDTH / CELL))
+    kind = np.full((nx, ny), FLOOR, dtype=np.int8)
+    door = np.full((nx, ny), -1, dtype=np.int16)
+
+    # Deployed beam rows -> seating (the footprint is the same at any height)
+    for b in scene.boxes:
+        if model.object_category(b.name) == "beam":
+            kind[_cells(b, nx, ny)] = SEATING
+
+    for b in scene.boxes:
+        cat = model.object_category(b.name)
+        in_band = b.z < BAND_TOP and b.z + b.height > 0
+        if cat in ("ext_wall", "int_wall", "column") and in_band:
+            kind[_cells(b, nx, ny)] = BLOCKED
+
+    doors = [b for b in scene.boxes if model.object_category(b.name) == "door"]
+    widths = []
+    for i, b in enumerate(doors):
+        cells = _cells(b, nx, ny)
+        kind[cells] = EXIT
+        door[cells] = i
+        widths.append(max(b.length, b.width) / 1000.0)  # clear width, m
+
+    floor = SimpleNamespace(
+        kind=kind, door=door, nx=nx, ny=ny, params=p,
+        door_names=[b.name for b in doors], door_width=np.array(widths),
+        seated=p.TELE_EXTRA_SEATS,
+    )
+    floor.dist = flow_field(floor)
+    floor.neighbours = neighbour_table(floor)
+    reachable = np.isfinite(floor.dist)
+    floor.seat_cells = int(np.count_nonzero(reachable & (kind == SEATING)))
+    floor.floor_cells = int(np.count_nonzero(reachable & (kind == FLOOR)))
+    return floor
+
+
+def occupancy(floor, floor_spectators=DEFAULT_FLOOR_SPECTATORS):
+    """(seated, overflow) - spectators on seat cells and those standing on
+    the floor because the seats ran out.  ValueError if the crowd does not fit."""
+    seated = min(floor.seated, floor.seat_cells)
+    overflow = floor.seated - seated
+    if overflow + floor_spectators > floor.floor_cells:
+        raise ValueError(
+            f"{floor.seated:,} spectators + {floor_spectators:,} on the floor do not fit: "
+            f"{floor.seat_cells:,} seat cells and {floor.floor_cells:,} floor cells")
+    return seated, overflow
+
+
+def neighbour_table(floor):
+    """(cells, 8) flat neighbour indices, -1 where blocked / corner-cut."""
+    nx, ny = floor.nx, floor.ny
+    walk = floor.kind.ravel() != BLOCKED
+    ix, iy = np.divmod(np.arange(nx * ny), ny)
+    table = np.full((nx * ny, 8), -1, dtype=np.int64)
+    for k, (dx, dy, _) in enumerate(_NEIGHBOURS):
+        jx, jy = ix + dx, iy + dy
+        ok = (jx >= 0) & (jx < nx) & (jy >= 0) & (jy < ny)
+        j = np.where(ok, jx * ny + jy, 0)
+        ok &= walk[j]
+        if dx and dy:  # No squeezing diagonally past a wall corner
+            ok &= walk[np.where(ok, jx * ny + iy, 0)] & walk[np.where(ok, ix * ny + jy, 0)]
+        table[:, k] = np.where(ok & walk, j, -1)
+    return table
+
+
+def flow_field(floor):
+    """Walking cost (cells, stair-weighted) from every cell to the nearest exit."""
+    kind = floor.kind
+    dist = np.where(kind == EXIT, 0.0, np.inf)
+    walk = kind != BLOCKED
+    slow = np.where(kind == SEATING, 1.0 / SEATING_SPEED, 1.0)
+    padded = np.full((floor.nx + 2, floor.ny + 2), np.inf)
+    while True:
+        padded[1:-1, 1:-1] = dist
+        best = dist.copy()
+        for dx, dy, length in _NEIGHBOURS:
+            shifted = padded[1 + dx:1 + dx + floor.nx, 1 + dy:1 + dy + floor.ny]
+            if dx and dy:
+                side_a = np.roll(walk, -dx, axis=0)
+                side_b = np.roll(walk, -dy, axis=1)
+                shifted = np.where(side_a & side_b, shifted, np.inf)
+            best = np.minimum(best, shifted + length * slow)
+        best = np.where(walk, best, np.inf)
+        if np.array_equal(best, dist):
+            return dist
+        dist = best
+
+# ============================================================================
+# ONE RUN
+# ============================================================================
+
+def simulate(floor, seed, floor_spectators=DEFAULT_FLOOR_SPECTATORS, max_time=3600.0):
+    """One evacuation; returns clearance time, door counts and heatmaps."""
+    rng = np.random.default_rng(seed)
+    kind = floor.kind.ravel()
+    dist = floor.dist.ravel()
+    door = floor.door.ravel()
+    nbr = floor.neighbours
+    size = kind.size
+    dt = CELL / 1000.0 / WALK_SPEED
+
+    reachable = np.isfinite(dist)
+    seats = np.flatnonzero(reachable & (kind == SEATING))
+    standing = np.flatnonzero(reachable & (kind == FLOOR))
+    n_seat, n_overflow = occupancy(floor, floor_spectators)
+    pos = np.concatenate([rng.choice(seats, n_seat, replace=False),
+                          rng.choice(standing, n_overflow + floor_spectators, replace=False)])
+    placed = len(pos)
+
+    n_doors = len(floor.door_names)
+    capacity = DOOR_FLOW * floor.door_width * dt   # persons per step per door
+    # Token bucket: an idle door saves up at most one step's worth, plus the
+    # fraction of a person carried between steps (so busy doors keep their
+    # full rate and doors under 1 person/step still open)
+    bucket = capacity + 1.0
+    tokens = np.zeros(n_doors)
+    door_count = np.zeros(n_doors, dtype=np.int64)
+    density = np.zeros(size)
+    queue = np.zeros(size)
+    ext = np.append(dist, np.inf)  # index -1 -> inf
+
+    step = 0
+    max_steps = int(max_time / dt)
+    while len(pos) and step < max_steps:
+        step += 1
+        density += np.bincount(pos, minlength=size)
+
+        # ---- Leave through doors (rate-limited per door) ----
+        at_exit = kind[pos] == EXIT
+        if at_exit.any():
+            tokens = np.minimum(tokens + capacity, bucket)
+            idx = np.flatnonzero(at_exit)
+            idx = idx[rng.permutation(len(idx))]
+            d = door[pos[idx]]
+            order = np.argsort(d, kind="stable")
+            idx, d = idx[order], d[order]
+            rank = np.arange(len(d)) - np.searchsorted(d, d)
+            leave = rank < np.floor(tokens[d])
+            released = np.bincount(d[leave], minlength=n_doors)
+            tokens -= released
+            door_count += released
+            pos = np.delete(pos, idx[leave])
+            if not len(pos):
+                break
+
+        # ---- Move along the flow field ----
+        occupied = np.zeros(size + 1, dtype=bool)
+        occupied[pos] = True
+        occupied[-1] = True
+        cand = nbr[pos]
+        cost = np.where(occupied[cand], np.inf, ext[cand])
+        cost = cost + rng.random(cost.shape) * NOISE
+        choice = np.argmin(cost, axis=1)
+        best = cost[np.arange(len(pos)), choice]
+        wants = best < dist[pos]
+        moving = wants & ((kind[pos] != SEATING) | (rng.random(len(pos)) < SEATING_SPEED))
+
+        movers = np.flatnonzero(moving)
+        target = cand[movers, choice[movers]]
+        shuffle = rng.permutation(len(movers))
+        _, first = np.unique(target[shuffle], return_index=True)
+        winners = movers[shuffle[first]]
+        pos[winners] = target[shuffle[first]]
+
+        blocked = np.ones(len(pos), dtype=bool)
+        blocked[winners] = False
+        blocked &= dist[pos] > 0
+        queue += np.bincount(pos[blocked], minlength=size)
+        if not len(winners) and not at_exit.any() and not wants.any():
+            break  # Nobody can make progress
+
+    shape = (floor.nx, floor.ny)
+    return {
+        "clearance_s": step * dt if not len(pos) else np.inf,
+        "placed": placed,
+        "seated": n_seat,
+        "overflow": n_overflow,
+        "remaining": len(pos),
+        "door_count": door_count,
+        "density": (density * dt).reshape(shape),
+        "queue": (queue * dt).reshape(shape),
+    }
+
+# ============================================================================
+# MONTE CARLO
+# ============================================================================
+
+_worker_floor = None
+
+
+def _init(floor):
+    global _worker_floor
+    _worker_floor = floor
+
+
+def _run(args):
+    seed, floor_spectators = args
+    return simulate(_worker_floor, seed, floor_spectators)
+
+
+def run_many(floor, runs, seed=0, floor_spectators=DEFAULT_FLOOR_SPECTATORS, workers=None):
+    """Run `runs` seeds; returns clearance times, door counts, mean heatmaps."""
+    occupancy(floor, floor_spectators)  # Fail before starting the pool
+    jobs = [(seed + i, floor_spectators) for i in range(runs)]
+    if workers == 1:
+        _init(floor)
+        results = map(_run, jobs)
+        return _aggregate(floor, list(results))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init,
+                             initargs=(floor,)) as pool:
+        return _aggregate(floor, list(pool.map(_run, jobs, chunksize=4)))
+
+
+def _aggregate(floor, results):
+    n = len(results)
+    return SimpleNamespace(
+        clearance_s=np.array([r["clearance_s"] for r in results]),
+        placed=results[0]["placed"] if results else 0,
+        seated=results[0]["seated"] if results else 0,
+        overflow=results[0]["overflow"] if results else 0,
+        remaining=np.array([r["remaining"] for r in results]),
+        door_count=np.array([r["door_count"] for r in results]),
+        density=sum(r["density"] for r in results) / max(n, 1),
+        queue=sum(r["queue"] for r in results) / max(n, 1),
+    )
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def write_ppm(path, heat, kind):
+    """Queue heatmap as a binary PPM (north up): walls dark, heat white->red."""
+    scale = heat / heat.max() if heat.max() > 0 else heat
+    rgb = np.empty(heat.shape + (3,), dtype=np.uint8)
+    rgb[..., 0] = 255
+    rgb[..., 1] = (255 * (1 - scale)).astype(np.uint8)
+    rgb[..., 2] = (255 * (1 - scale)).astype(np.uint8)
+    rgb[kind == BLOCKED] = (40, 40, 40)
+    rgb[kind == EXIT] = (0, 160, 0)
+    image = np.ascontiguousarray(rgb.transpose(1, 0, 2)[::-1])  # rows = y, north up
+    with open(path, "wb") as f:
+        f.write(b"P6 %d %d 255\n" % (image.shape[1], image.shape[0]))
+        f.write(image.tobytes())
+
+
+def print_summary(floor, result, elapsed):
+    t = result.clearance_s
+    done = t[np.isfinite(t)]
+    print("=" * 60)
+    print("  EGRESS SIMULATION")
+    print("=" * 60)
+    print(f"  Grid:         {floor.nx} x {floor.ny} cells of {CELL / 1000:.1f} m")
+    standing = result.placed - result.seated - result.overflow
+    overflow = f"{result.overflow:,} without a seat, " if result.overflow else ""
+    print(f"  Occupants:    {result.placed:,} per run ({result.seated:,} seated, "
+          f"{overflow}{standing:,} on the floor)")
+    if result.overflow:
+        print(f"  OVERFLOW:     {floor.seat_cells:,} seat cells for {floor.seated:,} "
+              f"spectators - the rest stand on the floor")
+    print(f"  Runs:         {len(t)} in {elapsed:.1f} s")
+    if len(done):
+        p50, p90, p99 = np.percentile(done, [50, 90, 99])
+        print(f"  Clearance:    p50 {p50:.0f} s  p90 {p90:.0f} s  "
+              f"p99 {p99:.0f} s  max {done.max():.0f} s")
+    if len(done) < len(t):
+        print(f"  NOT CLEARED:  {len(t) - len(done)} runs left people inside "
+              f"(up to {result.remaining.max():,})")
+    print(f"  Doors (mean persons per run):")
+    for name, count, width in zip(floor.door_names, result.door_count.mean(axis=0),
+                                  floor.door_width):
+        print(f"  - {name:<22} {count:>8.0f}   ({width / 0.3048:.0f}' wide)")
+    print("=" * 60)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m facility.egress",
+                                     description="Monte Carlo egress simulation.")
+    parser.add_argument("overrides", nargs="*", metavar="NAME=VALUE",
+                        help="parameter overrides (feet for lengths)")
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--floor-spectators", type=int, default=DEFAULT_FLOOR_SPECTATORS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("-o", "--output", help="save times, door counts and heatmaps (.npz)")
+    parser.add_argument("--ppm", help="write the queue heatmap as a .ppm image")
+    args = parser.parse_args(argv)
+
+    floor = build_floor(cli_params.parse_overrides(args.overrides))
+    t0 = time.perf_counter()
+    try:
+        result = run_many(floor, args.runs, args.seed, args.floor_spectators, args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    print_summary(floor, result, time.perf_counter() - t0)
+
+    if args.output:
+        np.savez_compressed(
+            args.output, clearance_s=result.clearance_s, door_count=result.door_count,
+            door_names=np.array(floor.door_names), density=result.density,
+            queue=result.queue, kind=floor.kind, cell_mm=CELL)
+    if args.ppm:
+        write_ppm(args.ppm, result.queue, floor.kind)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+# ============================================================================
+# floorplan.py — plan views sliced from the model, streamed to SVG or PDF
+# ============================================================================
+# floorplan.html and the assets/ drawings are drawn by hand and go stale on
+# every parameter change.  This cuts the in-memory scene at a height Z and
+# writes the plan straight from the box records:
+#
+#   cut      boxes whose z-range contains Z (walls, doors, columns; pits
+#            and beams at pit level)
+#   below    boxes entirely below Z, seen from above (room floors, mats,
+#            flaps); pits and beams under the floor as dashed outlines
+#   labels   the model's Label_* text, with the size of the room, mat or
+#            pit it sits in, plus overall building dimensions
+#
+# Output is streamed element by element (SVG text, or a PDF content stream
+# whose length and xref are written at the end), so nothing is held but
+# the scene.  --range/--set write one plan per sweep variant (facility.sweep
+# grid), spread over --workers processes.
+#
+# Run:
+#   python3 -m facility.floorplan -o plan.svg
+#   python3 -m facility.floorplan --z -10 -o pit_level.pdf
+#   python3 -m facility.floorplan --range TELE_PIT_WIDTH=10:14:2 -o plans/ --format pdf
+# ============================================================================
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+from facility.sweep import grid_params, grid_size
+
+FT = model.FT
+IN = model.IN
+
+CUT_Z = 4 * FT             # Plan cut height (architectural convention)
+SCALE = 6.0                # Points (SVG px) per foot
+MARGIN = 60.0              # Points around the drawing
+HIDDEN = {"pit", "beam"}   # Below the cut: dashed outline only
+SKIP = {"slab", "footing", "roof"}
+# Draw order (later on top)
+LAYERS = ["floor", "pit", "flap", "mat", "beam", "int_wall", "ext_wall",
+          "column", "door", "other"]
+FILL_OPACITY = {"floor": 0.35, "mat": 0.55, "pit": 0.25, "beam": 0.45}
+DEFAULT_COLOR = (0.5, 0.5, 0.5)
+LABEL_BOXES = ("floor", "mat", "pit")      # Label dimensions come from these
+TEXT_COLOR = (0.10, 0.10, 0.12)
+DIM_COLOR = (0.35, 0.35, 0.40)
+
+
+def ft_in(mm):
+    """Length as feet-inches text, to the nearest inch: 23'-8"."""
+    inches = int(round(mm / IN))
+    return f"{inches // 12}'-{inches % 12}\""
+
+# ============================================================================
+# WRITERS (y down, points)
+# ============================================================================
+
+def _hex(color):
+    return "#%02x%02x%02x" % tuple(int(round(255 * c)) for c in color)
+
+
+class SvgWriter:
+    def __init__(self, path, width, height):
+        self.f = open(path, "w", encoding="utf-8")
+        self.f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" '
+                     f'height="{height:.0f}" viewBox="0 0 {width:.1f} {height:.1f}" '
+                     f'font-family="Helvetica, Arial, sans-serif">\n'
+                     f'<rect width="100%" height="100%" fill="#ffffff"/>\n')
+
+    def group(self, name):
+        self.f.write(f'<g id="{name}">\n')
+
+    def end_group(self):
+        self.f.write("</g>\n")
+
+    def rect(self, x, y, w, h, fill=None, stroke=None, opacity=1.0, dashed=False,
+             title=None):
+        attrs = (f'x="{x:.2f}" y="{y:.2f}" width="{w:.2f}" height="{h:.2f}" '
+                 f'fill="{_hex(fill) if fill else "none"}"')
+        if fill and opacity < 1:
+            attrs += f' fill-opacity="{opacity:g}"'
+        if stroke:
+            attrs += f' stroke="{_hex(stroke)}" stroke-width="0.75"'
+        if dashed:
+            attrs += ' stroke-dasharray="4 3"'
+        if title:
+            self.f.write(f"<rect {attrs}><title>{escape(title)}</title></rect>\n")
+        else:
+            self.f.write(f"<rect {attrs}/>\n")
+
+    def line(self, x1, y1, x2, y2, color, width=0.6):
+        self.f.write(f'<line x1="{x1:.2f}" y1="{y1:.2f}" x2="{x2:.2f}" y2="{y2:.2f}" '
+                     f'stroke="{_hex(color)}" stroke-width="{width:g}"/>\n')
+
+    def text(self, x, y, s, size, color=TEXT_COLOR, anchor="middle", rotate=False):
+        transform = f' transform="rotate(-90 {x:.2f} {y:.2f})"' if rotate else ""
+        self.f.write(f'<text x="{x:.2f}" y="{y:.2f}" font-size="{size:g}" '
+                     f'text-anchor={quoteattr(anchor)} fill="{_hex(color)}"{transform}>'
+                     f"{escape(s)}</text>\n")
+
+    def close(self):
+        self.f.write("</svg>\n")
+        self.f.close()
+
+
+class PdfWriter:
+    """Single-page PDF, content stream written as drawing happens."""
+
+    ANCHOR = {"start": 0.0, "middle": 0.5, "end": 1.0}
+
+    def __init__(self, path, width, height):
+        self.f = open(path, "wb")
+        self.width, self.height = width, height
+        self.offsets = {}
+        self.f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._begin(5)
+        self.f.write(b"<< /Length 6 0 R >>\nstream\n")
+        self.start = self.f.tell()
+        self._out("1 1 1 rg 0 0 %.2f %.2f re f" % (width, height))
+
+    def _begin(self, num):
+        self.offsets[num] = self.f.tell()
+        self.f.write(b"%d 0 obj\n" % num)
+
+    def _out(self, op):
+        self.f.write(op.encode("latin-1", "replace") + b"\n")
+
+    def group(self, name):
+        pass
+
+    def end_group(self):
+        pass
+
+    def rect(self, x, y, w, h, fill=None, stroke=None, opacity=1.0, dashed=False,
+             title=None):
+        y = self.height - y - h
+        ops = []
+        if fill:
+            # No transparency groups: blend the fill with the white page
+            c = [1 - opacity * (1 - v) for v in fill]
+            ops.append("%.3f %.3f %.3f rg" % tuple(c))
+        if stroke:
+            ops.append("%.3f %.3f %.3f RG 0.75 w" % tuple(stroke))
+            ops.append("[4 3] 0 d" if dashed else "[] 0 d")
+        paint = "B" if fill and stroke else "f" if fill else "S"
+        ops.append("%.2f %.2f %.2f %.2f re %s" % (x, y, w, h, paint))
+        self._out(" ".join(ops))
+
+    def line(self, x1, y1, x2, y2, color, width=0.6):
+        self._out("%.3f %.3f %.3f RG %g w [] 0 d %.2f %.2f m %.2f %.2f l S"
+                  % (*color, width, x1, self.height - y1, x2, self.height - y2))
+
+    def text(self, x, y, s, size, color=TEXT_COLOR, anchor="middle", rotate=False):
+        s = s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        shift = self.ANCHOR[anchor] * 0.5 * size * len(s)    # Helvetica ~0.5 em
+        y = self.height - y
+        if rotate:
+            matrix = "0 1 -1 0 %.2f %.2f Tm" % (x, y - shift)
+        else:
+            matrix = "1 0 0 1 %.2f %.2f Tm" % (x - shift, y)
+        self._out("BT %.3f %.3f %.3f rg /F1 %g Tf %s (%s) Tj ET"
+                  % (*color, size, matrix, s))
+
+    def close(self):
+        length = self.f.tell() - self.start
+        self.f.write(b"endstream\nendobj\n")
+        self._begin(6)
+        self.f.write(b"%d\nendobj\n" % length)
+        objects = {
+            1: b"<< /Type /Catalog /Pages 2 0 R >>",
+            2: b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            3: (b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] "
+                b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>"
+                % (self.width, self.height)),
+            4: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+               b"/Encoding /WinAnsiEncoding >>",
+        }
+        for num, body in objects.items():
+            self._begin(num)
+            self.f.write(body + b"\nendobj\n")
+        xref = self.f.tell()
+        self.f.write(b"xref\n0 7\n0000000000 65535 f \n")
+        for num in range(1, 7):
+            self.f.write(b"%010d 00000 n \n" % self.offsets[num])
+        self.f.write(b"trailer\n<< /Size 7 /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % xref)
+        self.f.close()
+
+
+WRITERS = {".svg": SvgWriter, ".pdf": PdfWriter}
+
+# ============================================================================
+# PLAN
+# ============================================================================
+
+def slice_scene(scene, z):
+    """(cut, below) box lists at height z, each in LAYERS draw order."""
+    names, dims, origin = scene.to_arrays()
+    cats = [model.object_category(name) for name in names]
+    lo, hi = origin[:, 2], origin[:, 2] + dims[:, 2]
+    cut_mask = (lo <= z) & (hi > z)
+    below_mask = hi <= z
+    order = {c: i for i, c in enumerate(LAYERS)}
+    cut, below = [], []
+    for i in np.flatnonzero(cut_mask | below_mask):
+        cat = cats[i]
+        if cat in SKIP or cat == "label":
+            continue
+        if cut_mask[i]:
+            cut.append((order.get(cat, len(LAYERS)), cat, scene.boxes[i]))
+        else:
+            below.append((order.get(cat, len(LAYERS)), cat, scene.boxes[i]))
+    cut.sort(key=lambda item: item[0])
+    below.sort(key=lambda item: item[0])
+    return [item[1:] for item in cut], [item[1:] for item in below]
+
+
+def _label_box(label, boxes):
+    """Smallest room/mat/pit box containing the label point, or None."""
+    best = None
+    for cat, b in boxes:
+        if (cat in LABEL_BOXES and b.x <= label.x <= b.x + b.length
+                and b.y <= label.y <= b.y + b.width
+                and (best is None or b.length * b.width < best.length * best.width)):
+            best = b
+    return best
+
+
+def write_plan(scene, path, z=CUT_Z, scale=SCALE):
+    """Stream the plan of `scene` cut at height z (mm) to .svg or .pdf."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError(f"Unknown plan format: {ext} (use .svg or .pdf)")
+    p = scene.params
+    k = scale / FT
+    width = p.BLDG_LENGTH * k + 2 * MARGIN
+    height = p.BLDG_WIDTH * k + 2 * MARGIN
+
+    def px(x):
+        return MARGIN + x * k
+
+    def py(y):                                        # North up
+        return MARGIN + (p.BLDG_WIDTH - y) * k
+
+    cut, below = slice_scene(scene, z)
+    out = WRITERS[ext](path, width, height)
+    layer = None
+    for is_below, items in ((True, below), (False, cut)):
+        for cat, b in items:
+            dashed = is_below and cat in HIDDEN
+            if (cat, is_below) != layer:
+                if layer is not None:
+                    out.end_group()
+                out.group(f"{cat}-below" if is_below else cat)
+                layer = (cat, is_below)
+            color = b.color or DEFAULT_COLOR
+            out.rect(px(b.x), py(b.y + b.width), b.length * k, b.width * k,
+                     fill=None if dashed else color, stroke=color,
+                     opacity=FILL_OPACITY.get(cat, 1.0), dashed=dashed, title=b.name)
+    if layer is not None:
+        out.end_group()
+
+    # ---- Labels with the size of what they name ----
+    out.group("labels")
+    boxes = cut + below
+    size = max(scale * 1.1, 5.0)
+    for label in scene.labels:
+        lines = label.text.split("\n")
+        owner = _label_box(label, boxes)
+        if owner is not None:
+            lines.append(f"{ft_in(owner.length)} x {ft_in(owner.width)}")
+        top = py(label.y) - (len(lines) - 1) * size * 0.6
+        for i, line in enumerate(lines):
+            out.text(px(label.x), top + i * size * 1.2, line,
+                     size * (0.8 if owner is not None and i == len(lines) - 1 else 1.0),
+                     DIM_COLOR if owner is not None and i == len(lines) - 1 else TEXT_COLOR)
+    out.end_group()
+
+    # ---- Overall dimensions ----
+    out.group("dimensions")
+    y_dim = py(0) + MARGIN * 0.45
+    x_dim = px(0) - MARGIN * 0.45
+    tick = 4.0
+    out.line(px(0), y_dim, px(p.BLDG_LENGTH), y_dim, DIM_COLOR)
+    out.line(x_dim, py(0), x_dim, py(p.BLDG_WIDTH), DIM_COLOR)
+    for x in (0, p.BLDG_LENGTH):
+        out.line(px(x), y_dim - tick, px(x), y_dim + tick, DIM_COLOR)
+    for y in (0, p.BLDG_WIDTH):
+        out.line(x_dim - tick, py(y), x_dim + tick, py(y), DIM_COLOR)
+    out.text(px(p.BLDG_LENGTH / 2), y_dim - 3, ft_in(p.BLDG_LENGTH), size, DIM_COLOR)
+    out.text(x_dim - 3, py(p.BLDG_WIDTH / 2), ft_in(p.BLDG_WIDTH), size, DIM_COLOR,
+             rotate=True)
+    out.text(px(0), MARGIN * 0.5, f"PLAN AT {ft_in(z)}" if z >= 0 else
+             f"PLAN AT -{ft_in(-z)}", size * 1.2, TEXT_COLOR, anchor="start")
+    out.end_group()
+    out.close()
+    return len(cut), len(below)
+
+# ============================================================================
+# VARIANTS
+# ============================================================================
+
+def _plan_job(args):
+    params, path, z, scale = args
+    write_plan(model.build_facility(params), path, z, scale)
+    return path
+
+
+def plan_variants(axes, fixed, directory, fmt="svg", z=CUT_Z, scale=SCALE, workers=None):
+    """One plan per sweep grid variant: directory/variant_<n>.<fmt>."""
+    os.makedirs(directory, exist_ok=True)
+    total = grid_size(axes)
+    p = grid_params(axes, 0, total, fixed)
+    jobs = [({name: getattr(p, name)[i].item() for name in model.PARAM_NAMES},
+             os.path.join(directory, f"variant_{i:05d}.{fmt}"), z, scale)
+            for i in range(total)]
+    if workers == 1 or total <= 1:
+        return [_plan_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_plan_job, jobs, chunksize=max(total // (4 * (workers or 4)), 1)))
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m facility.floorplan",
+                                     description="Plan view of the model as SVG or PDF.")
+    parser.add_argument("overrides", nargs="*", metavar="NAME=VALUE",
+                        help="parameter overrides (feet for lengths)")
+    parser.add_argument("--z", type=float, default=CUT_Z / FT,
+                        help="cut height in feet (default 4; negative for pit level)")
+    parser.add_argument("--scale", type=float, default=SCALE, help="points per foot")
+    parser.add_argument("-o", "--output", default="plan.svg",
+                        help=".svg or .pdf (a directory with --range)")
+    parser.add_argument("--range", action="append", default=[], metavar="NAME=SPEC",
+                        help="one plan per variant of this sweep grid")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="fixed override for every variant")
+    parser.add_argument("--format", choices=["svg", "pdf"], default="svg",
+                        help="plan format with --range")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    z = args.z * FT
+    t0 = time.perf_counter()
+    if args.range:
+        axes = [cli_params.parse_range(text) for text in args.range]
+        fixed = cli_params.parse_overrides(args.overrides + args.set)
+        paths = plan_variants(axes, fixed, args.output, args.format, z, args.scale,
+                              args.workers)
+        elapsed = time.perf_counter() - t0
+        print(f"  {args.output}: {len(paths)} plans in {elapsed:.2f} s "
+              f"({elapsed * 1000 / max(len(paths), 1):.1f} ms each)")
+        return
+
+    scene = model.build_facility(cli_params.parse_overrides(args.overrides))
+    cut, below = write_plan(scene, args.output, z, args.scale)
+    elapsed = time.perf_counter() - t0
+    print(f"  {args.output}: {cut} cut + {below} below-cut boxes, "
+          f"{len(scene.labels)} labels, {os.path.getsize(args.output) / 1024:.1f} KB "
+          f"in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# ============================================================================
+# gltf.py — instanced binary glTF (.glb) export for the web viewers
+# ============================================================================
+# Writes the model's boxes straight to one .glb so the three.js pages can
+# load the same geometry the macro builds instead of re-encoding it with
+# their own bx(...) calls.
+#
+# Every box is an axis-aligned unit cube scaled and translated into place,
+# so all boxes of one color share one mesh.  Each color group becomes a
+# single node using EXT_mesh_gpu_instancing (TRANSLATION + SCALE accessors):
+# the 32 elevating beams, 15 columns and 3 mats are one draw call each, and
+# three.js GLTFLoader turns them into InstancedMesh.  Instance data is
+# written from contiguous NumPy arrays, not per-object Python copies.
+#
+# Axes: glTF is Y-up in metres -> (x, z, -y) of the model's Z-up mm.
+# Object names ride along in node extras ("instances"); room labels are
+# exported as empty nodes with extras.text for HTML overlays.
+#
+# Run:
+#   python3 -m facility.gltf -o facility.glb
+#   python3 -m facility.gltf SUPPORT_DEPTH=26 -o variant.glb
+# ============================================================================
+
+import argparse
+import json
+import struct
+
+import numpy as np
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+
+MM = 0.001  # model mm -> glTF metres
+DEFAULT_COLOR = (0.70, 0.70, 0.70)
+
+# Unit cube [0, 1]^3 with flat normals: 6 faces x 4 vertices, 2 triangles each
+_FACES = [
+    ((1, 0, 0), [(1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1)]),
+    ((-1, 0, 0), [(0, 0, 1), (0, 1, 1), (0, 1, 0), (0, 0, 0)]),
+    ((0, 1, 0), [(0, 1, 1), (1, 1, 1), (1, 1, 0), (0, 1, 0)]),
+    ((0, -1, 0), [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)]),
+    ((0, 0, 1), [(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]),
+    ((0, 0, -1), [(0, 1, 0), (1, 1, 0), (1, 0, 0), (0, 0, 0)]),
+]
+CUBE_POSITIONS = np.array([v for _, quad in _FACES for v in quad], dtype="<f4")
+CUBE_NORMALS = np.array([n for n, quad in _FACES for _ in quad], dtype="<f4")
+CUBE_INDICES = np.array([[4 * f, 4 * f + 1, 4 * f + 2, 4 * f, 4 * f + 2, 4 * f + 3]
+                         for f in range(6)], dtype="<u2").ravel()
+
+# glTF constants
+FLOAT, UNSIGNED_SHORT = 5126, 5123
+ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER = 34962, 34963
+
+# ============================================================================
+# GLB BUILDER
+# ============================================================================
+
+class GlbBuilder:
+    """Accumulates buffer views/accessors into one binary chunk."""
+
+    def __init__(self):
+        self.gltf = {
+            "asset": {"version": "2.0", "generator": "loudon-desarro facility.gltf"},
+            "scene": 0, "scenes": [{"nodes": []}],
+            "nodes": [], "meshes": [], "materials": [],
+            "accessors": [], "bufferViews": [], "buffers": [],
+        }
+        self._chunks = []
+        self._offset = 0
+
+    def add_view(self, array, target=None):
+        data = np.ascontiguousarray(array).tobytes()
+        view = {"buffer": 0, "byteOffset": self._offset, "byteLength": len(data)}
+        if target:
+            view["target"] = target
+        self._chunks.append(data)
+        pad = -len(data) % 4
+        if pad:
+            self._chunks.append(b"\0" * pad)
+        self._offset += len(data) + pad
+        self.gltf["bufferViews"].append(view)
+        return len(self.gltf["bufferViews"]) - 1
+
+    def add_accessor(self, array, kind, target=None, bounds=False):
+        array = np.asarray(array)
+        comp = UNSIGNED_SHORT if array.dtype == np.uint16 else FLOAT
+        accessor = {
+            "bufferView": self.add_view(array, target),
+            "componentType": comp, "count": len(array), "type": kind,
+        }
+        if bounds:
+            accessor["min"] = array.min(axis=0).tolist()
+            accessor["max"] = array.max(axis=0).tolist()
+        self.gltf["accessors"].append(accessor)
+        return len(self.gltf["accessors"]) - 1
+
+    def add_node(self, node):
+        self.gltf["nodes"].append(node)
+        index = len(self.gltf["nodes"]) - 1
+        self.gltf["scenes"][0]["nodes"].append(index)
+        return index
+
+    def use_extension(self, name, required=False):
+        used = self.gltf.setdefault("extensionsUsed", [])
+        if name not in used:
+            used.append(name)
+        if required:
+            req = self.gltf.setdefault("extensionsRequired", [])
+            if name not in req:
+                req.append(name)
+
+    def tobytes(self):
+        binary = b"".join(self._chunks)
+        self.gltf["buffers"] = [{"byteLength": len(binary)}]
+        text = json.dumps(self.gltf, separators=(",", ":")).encode()
+        text += b" " * (-len(text) % 4)
+        total = 12 + 8 + len(text) + 8 + len(binary)
+        return b"".join([
+            struct.pack("<4sII", b"glTF", 2, total),
+            struct.pack("<I4s", len(text), b"JSON"), text,
+            struct.pack("<I4s", len(binary), b"BIN\0"), binary,
+        ])
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def to_gltf_frame(dims, origin):
+    """Model min-corner/dims (mm, Z-up) -> glTF translation/scale (m, Y-up)."""
+    l, w, h = dims[:, 0], dims[:, 1], dims[:, 2]
+    x, y, z = origin[:, 0], origin[:, 1], origin[:, 2]
+    translation = np.stack([x, z, -(y + w)], axis=1) * MM
+    scale = np.stack([l, h, w], axis=1) * MM
+    return translation.astype("<f4"), scale.astype("<f4")
+
+
+def build_glb(scene, gpu_instancing=True):
+    """Return .glb bytes for an in-memory scene."""
+    names, dims, origin = scene.to_arrays()
+    translation, scale = to_gltf_frame(dims, origin)
+    colors = [tuple(b.color or DEFAULT_COLOR) for b in scene.boxes]
+
+    g = GlbBuilder()
+    pos = g.add_accessor(CUBE_POSITIONS, "VEC3", ARRAY_BUFFER, bounds=True)
+    nrm = g.add_accessor(CUBE_NORMALS, "VEC3", ARRAY_BUFFER)
+    idx = g.add_accessor(CUBE_INDICES, "SCALAR", ELEMENT_ARRAY_BUFFER)
+
+    groups = {}
+    for i, color in enumerate(colors):
+        groups.setdefault(color, []).append(i)
+
+    for color, members in groups.items():
+        material = len(g.gltf["materials"])
+        g.gltf["materials"].append({
+            "name": "rgb_%02x%02x%02x" % tuple(int(round(c * 255)) for c in color),
+            "pbrMetallicRoughness": {
+                "baseColorFactor": [*color, 1.0],
+                "metallicFactor": 0.0, "roughnessFactor": 0.8,
+            },
+        })
+        mesh = len(g.gltf["meshes"])
+        g.gltf["meshes"].append({
+            "name": g.gltf["materials"][material]["name"],
+            "primitives": [{"attributes": {"POSITION": pos, "NORMAL": nrm},
+                            "indices": idx, "material": material}],
+        })
+        members = np.asarray(members)
+        member_names = [names[i] for i in members]
+
+        if len(members) > 1 and gpu_instancing:
+            g.use_extension("EXT_mesh_gpu_instancing", required=True)
+            g.add_node({
+                "name": "+".join(sorted({model.object_category(n) for n in member_names}))
+                        + f"_x{len(members)}",
+                "mesh": mesh,
+                "extensions": {"EXT_mesh_gpu_instancing": {"attributes": {
+                    "TRANSLATION": g.add_accessor(translation[members], "VEC3"),
+                    "SCALE": g.add_accessor(scale[members], "VEC3"),
+                }}},
+                "extras": {"instances": member_names},
+            })
+        else:
+            for i, name in zip(members, member_names):
+                g.add_node({"name": name, "mesh": mesh,
+                            "translation": translation[i].tolist(),
+                            "scale": scale[i].tolist()})
+
+    for label in scene.labels:
+        g.add_node({"name": label.name,
+                    "translation": [label.x * MM, label.z * MM, -label.y * MM],
+                    "extras": {"text": label.text}})
+    return g.tobytes()
+
+
+def export_glb(scene, path, gpu_instancing=True):
+    data = build_glb(scene, gpu_instancing)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m facility.gltf",
+                                     description="Export the model as instanced .glb.")
+    parser.add_argument("overrides", nargs="*", metavar="NAME=VALUE",
+                        help="parameter overrides (feet for lengths)")
+    parser.add_argument("-o", "--output", default="facility.glb")
+    parser.add_argument("--no-gpu-instancing", action="store_true",
+                        help="one node per box (for loaders without the extension)")
+    args = parser.parse_args(argv)
+
+    scene = model.build_facility(cli_params.parse_overrides(args.overrides))
+    size = export_glb(scene, args.output, not args.no_gpu_instancing)
+    print(f"  {args.output}: {len(scene)} boxes, {len(scene.labels)} labels, "
+          f"{size / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# ============================================================================
+# incremental.py — re-place only the objects a parameter change affects
+# ============================================================================
+# A full rebuild makes a brand-new document and recomputes every Part::Box.
+# LiveModel keeps one document alive instead: on each edit it rebuilds the
+# in-memory scene (milliseconds), compares every record against the previous
+# scene, and pushes new Length/Width/Height/Placement onto only the objects
+# that differ.  FreeCAD then recomputes just the touched boxes.
+#
+# The parameter -> object dependency graph is derived from the model itself:
+# each parameter is nudged and the in-memory scene rebuilt (e.g. SUPPORT_DEPTH
+# -> divider_x -> Wall_Divider_Main, Floor_*, Column_East_*, Label_Office,
+# ...).  It is for reporting only: a small nudge cannot see threshold
+# effects such as the end column frame moving when BLDG_WIDTH crosses a
+# 25' bay, so updates always come from the full record comparison.
+#
+# In the FreeCAD Python console:
+#   import sys; sys.path.append("/path/to/loudon-desarro")
+#   import wrestling_facility_phase1 as model
+#   from facility.incremental import LiveModel
+#   live = LiveModel(backend=model.FreeCADBackend())
+#   live.set(SUPPORT_DEPTH=26 * model.FT)     # -> names of updated objects
+#
+# Headless what-if:
+#   python3 -m facility.incremental SUPPORT_DEPTH=26
+#   python3 -m facility.incremental --graph
+# ============================================================================
+
+import argparse
+import time
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+
+# ============================================================================
+# DEPENDENCY GRAPH
+# ============================================================================
+
+def _nudge(name, value):
+    if name in cli_params.INTEGER_PARAMS:
+        return value + 1
+    return value + max(abs(value) * 1e-3, 1.0)
+
+
+def _records(scene):
+    """{name: record} for every box and label in an in-memory scene."""
+    records = {b.name: b for b in scene.boxes}
+    records.update((lb.name, lb) for lb in scene.labels)
+    return records
+
+
+def scene_changes(old, new):
+    """(added, removed, changed) object names between two record dicts."""
+    added = [n for n in new if n not in old]
+    removed = [n for n in old if n not in new]
+    changed = [n for n in new if n in old and new[n] != old[n]]
+    return added, removed, changed
+
+
+def dependency_graph(params=None, names=None):
+    """Map each parameter to the set of object names it drives.
+
+    Built by nudging one parameter at a time against the in-memory scene,
+    so it reflects the model at `params` (defaults when None).
+    """
+    base = model.default_params()
+    base.update(params or {})
+    reference = _records(model.build_facility(base))
+
+    graph = {}
+    for name in names or model.PARAM_NAMES:
+        nudged = dict(base, **{name: _nudge(name, base[name])})
+        added, removed, changed = scene_changes(
+            reference, _records(model.build_facility(nudged)))
+        graph[name] = set(added) | set(removed) | set(changed)
+    return graph
+
+
+def invert_graph(graph):
+    """Object name -> set of parameters it depends on."""
+    inverse = {}
+    for param, names in graph.items():
+        for name in names:
+            inverse.setdefault(name, set()).add(param)
+    return inverse
+
+# ============================================================================
+# LIVE MODEL
+# ============================================================================
+
+class LiveModel:
+    """A long-lived build that applies parameter edits in place.
+
+    `backend` is the document being kept up to date (FreeCADBackend in a
+    live session); the in-memory scene mirror is always maintained and is
+    what new values are computed from.
+    """
+
+    def __init__(self, params=None, backend=None):
+        self.params = model.default_params()
+        self.params.update(params or {})
+        self.scene = model.build_facility(self.params)
+        self.backend = backend
+        if backend is not None:
+            model.build_facility(self.params, backend)
+        self.graph = dependency_graph(self.params)
+        self.last_update = None
+
+    def affected_by(self, *names):
+        """Object names that depend on any of the given parameters."""
+        affected = set()
+        for name in names:
+            affected |= self.graph.get(name, set())
+        return affected
+
+    def set(self, **changes):
+        """Apply parameter edits; returns the names of objects touched."""
+        t0 = time.perf_counter()
+        for name in changes:
+            if name not in self.params:
+                raise KeyError(f"Unknown building parameter: {name}")
+        changes = {k: v for k, v in changes.items() if self.params[k] != v}
+        if not changes:
+            return []
+
+        self.params.update(changes)
+        old = _records(self.scene)
+        self.scene = model.build_facility(self.params)
+        new = _records(self.scene)
+
+        added, removed, changed = scene_changes(old, new)
+        unexpected = sorted(set(changed) - self.affected_by(*changes))
+
+        if self.backend is not None:
+            self._push(new, added, removed, changed)
+        if added or removed:
+            # Object set changed (e.g. TELE_ROWS) - dependencies shift with it
+            self.graph = dependency_graph(self.params)
+
+        touched = changed + added + removed
+        self.last_update = {
+            "params": sorted(changes),
+            "changed": changed, "added": added, "removed": removed,
+            "unexpected": unexpected,
+            "seconds": time.perf_counter() - t0,
+        }
+        return touched
+
+    def _push(self, new, added, removed, changed):
+        backend = self.backend
+        for name in removed:
+            backend.remove(name)
+        for name in changed:
+            record = new[name]
+            if isinstance(record, model.Box):
+                backend.update_box(record)
+            else:
+                backend.update_label(record)
+        for name in added:
+            record = new[name]
+            if isinstance(record, model.Box):
+                backend.add_box(*record)
+            else:
+                backend.add_label(*record)
+        backend.recompute()
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python3 -m facility.incremental",
+        description="Show which objects a parameter edit re-places.")
+    parser.add_argument("edits", nargs="*", metavar="NAME=VALUE",
+                        help="parameter edits (feet for lengths)")
+    parser.add_argument("--graph", action="store_true",
+                        help="print the full parameter -> object graph")
+    args = parser.parse_args(argv)
+
+    live = LiveModel(backend=model.SceneBackend())
+
+    if args.graph:
+        for param in model.PARAM_NAMES:
+            names = sorted(live.graph[param])
+            print(f"{param} ({len(names)})")
+            for name in names:
+                print(f"    {name}")
+
+    if args.edits:
+        edits = cli_params.parse_overrides(args.edits)
+        live.set(**edits)
+        update = live.last_update
+        print("=" * 60)
+        print("  INCREMENTAL UPDATE: " + ", ".join(update["params"]))
+        print("=" * 60)
+        for key in ("changed", "added", "removed", "unexpected"):
+            print(f"  {key.capitalize():<10} {len(update[key]):>4}  "
+                  + " ".join(sorted(update[key])))
+        print(f"  Untouched  {len(live.scene) + len(live.scene.labels) - len(update['changed']) - len(update['added']):>4}")
+        print(f"  Time:       {update['seconds'] * 1000:.2f} ms")
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+# ============================================================================
+# kinematics.py — PLEX FLEX deployment timeline and keyframe export
+# ============================================================================
+# Section 10b places the ElevatingBeam_{end}_Row_{r} boxes stowed.  This
+# module moves them: a deploy/retract cycle is evaluated for every beam and
+# both SafetyFlap_* at once as NumPy arrays (frames x beams), at any frame
+# rate, checked for interlock violations and streamed to a binary file.
+#
+# Motion (matches animateFlex() in js/facility-core.js):
+#   deploy   flaps open, then rows rise bottom row first, each row delayed
+#            by row_delay and eased with 1 - (1 - u)^2.8
+#   retract  rows lower top row first, then flaps close
+# Stowed = the model's section 10b placement.  Deployed = every row lifted
+# by the same stroke so the top row's base reaches TELE_DEPLOY_Z; a
+# TELE_DEPLOY_Z at or below the stowed top row is rejected.  Rows move in z
+# only: x and y stay at the section 10b footprint, which already offsets
+# each row by TELE_HORIZ_STEP.  The web animation slides rows out
+# horizontally instead - a presentation effect this timeline does not model.
+#
+# Interlocks (per pit):
+#   beam_moving_flap_not_open  a beam moves while its flap is not fully open
+#   flap_moving_beams_moving   a flap moves while any of its beams moves
+#
+# Run:
+#   python3 -m facility.kinematics --fps 60 --cycles 10 -o plexflex.pfkf
+#   python3 -m facility.kinematics --flap-lead 2      # beams start early
+# ============================================================================
+
+import argparse
+import json
+import struct
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+
+FT = model.FT
+
+EASE_POWER = 2.8
+
+# Seconds, per cycle
+DEFAULT_TIMING = {
+    "flap_time": 6.0,     # flap swings fully open / closed
+    "flap_lead": 6.0,     # flap start -> first beam start (>= flap_time is safe)
+    "travel_time": 20.0,  # one row's full stroke
+    "row_delay": 0.5,     # start offset between consecutive rows
+    "hold_time": 10.0,    # dwell when fully deployed / stowed
+}
+POSITIVE_TIMING = {"flap_time", "travel_time"}   # ramp durations; the rest may be 0
+
+# ============================================================================
+# RIG (beam and flap geometry taken from the built model)
+# ============================================================================
+
+def plexflex_rig(params=None, scene=None):
+    """Beams and flaps of a built model, as arrays in mm.
+
+    Returns a namespace with names, end (0 north / 1 south), row, x, y,
+    z_stowed, z_deployed, height for each beam, and the flap names.
+    Pass an already built `scene` to reuse it instead of building `params`.
+    Raises ValueError when the rows have no upward stroke to deploy.
+    """
+    if scene is None:
+        scene = model.build_facility(params)
+    p = scene.params
+    beams = [b for b in scene.boxes if model.object_category(b.name) == "beam"]
+    rig = SimpleNamespace()
+    rig.names = [b.name for b in beams]
+    rig.end = np.array([0 if "_North_" in b.name else 1 for b in beams])
+    rig.row = np.array([int(b.name.rsplit("_", 1)[1]) for b in beams])
+    rig.x = np.array([b.x for b in beams])
+    rig.y = np.array([b.y for b in beams])
+    rig.height = np.array([b.height for b in beams])
+    rig.z_stowed = np.array([b.z for b in beams])
+    top = rig.z_stowed[rig.row == p.TELE_ROWS - 1].max()
+    rig.stroke = p.TELE_DEPLOY_Z - top
+    if rig.stroke <= 0:
+        raise ValueError(f"TELE_DEPLOY_Z {p.TELE_DEPLOY_Z / FT:g}' is not above the stowed "
+                         f"top row ({top / FT:g}'): {p.TELE_ROWS} rows have no stroke")
+    rig.z_deployed = rig.z_stowed + rig.stroke
+    rig.rows = p.TELE_ROWS
+    rig.flap_names = ["SafetyFlap_North", "SafetyFlap_South"]
+    return rig
+
+# ============================================================================
+# TIMELINE
+# ============================================================================
+
+def cycle_length(rig, timing):
+    t = timing
+    beams = t["travel_time"] + (rig.rows - 1) * t["row_delay"]
+    one_way = t["flap_lead"] + beams + max(t["flap_time"] - t["flap_lead"], 0)
+    return 2 * (one_way + t["hold_time"])
+
+
+def _ease(u):
+    return 1.0 - (1.0 - u) ** EASE_POWER
+
+
+def _ramp(t, start, duration):
+    return np.clip((t - start) / duration, 0.0, 1.0)
+
+
+def evaluate(rig, times, timing=None):
+    """Beam z and flap opening at `times` (seconds).
+
+    Returns (beam_z (frames, beams) mm, flap_open (frames, 2) 0..1,
+    beam_moving (frames, beams) bool, flap_moving (frames, 2) bool).
+    """
+    t = dict(DEFAULT_TIMING, **(timing or {}))
+    period = cycle_length(rig, t)
+    local = np.mod(np.asarray(times, dtype=float), period)[:, None]
+
+    beams = t["travel_time"] + (rig.rows - 1) * t["row_delay"]
+    one_way = t["flap_lead"] + beams + max(t["flap_time"] - t["flap_lead"], 0)
+    retract_start = one_way + t["hold_time"]
+
+    # ---- Deploy: flaps open at 0, rows rise bottom first ----
+    flap_up = _ramp(local, 0.0, t["flap_time"])
+    row_start = t["flap_lead"] + rig.row * t["row_delay"]
+    rise = _ramp(local, row_start, t["travel_time"])
+
+    # ---- Retract: rows lower top first, then flaps close ----
+    back = retract_start + (rig.rows - 1 - rig.row) * t["row_delay"]
+    lower = _ramp(local, back, t["travel_time"])
+    flap_close_start = retract_start + beams
+    flap_down = _ramp(local, flap_close_start, t["flap_time"])
+
+    progress = _ease(rise) - _ease(lower)
+    beam_z = rig.z_stowed + rig.stroke * progress
+    flap_open = np.repeat(flap_up - flap_down, 2, axis=1)
+
+    beam_moving = ((rise > 0) & (rise < 1)) | ((lower > 0) & (lower < 1))
+    flap_moving = np.repeat(((flap_up > 0) & (flap_up < 1))
+                            | ((flap_down > 0) & (flap_down < 1)), 2, axis=1)
+    return beam_z, flap_open, beam_moving, flap_moving
+
+
+def interlock_violations(rig, flap_open, beam_moving, flap_moving):
+    """Per-frame violation masks, keyed by rule name (frames,) bool."""
+    own_flap_open = flap_open[:, rig.end]            # (frames, beams)
+    any_moving = np.stack([beam_moving[:, rig.end == e].any(axis=1)
+                           for e in (0, 1)], axis=1)  # (frames, 2)
+    return {
+        "beam_moving_flap_not_open":
+            (beam_moving & (own_flap_open < 1.0)).any(axis=1),
+        "flap_moving_beams_moving": (flap_moving & any_moving).any(axis=1),
+    }
+
+# ============================================================================
+# KEYFRAME FILE
+# ============================================================================
+# Little-endian layout:
+#   b"PFKF" | u32 version | u32 frames | u32 beams | u32 flaps | f32 fps
+#   u32 len | JSON header (names, static beam x/y in mm, timing)
+#   frames x (beams + flaps) float32: beam z (mm), flap opening (0..1)
+
+MAGIC = b"PFKF"
+VERSION = 1
+_HEAD = struct.Struct("<4sIIIIf")
+
+
+class KeyframeWriter:
+    """Streams frame blocks to a .pfkf file; frame count patched on close."""
+
+    def __init__(self, path, rig, fps, timing):
+        self._f = open(path, "wb")
+        self._beams = len(rig.names)
+        self._flaps = len(rig.flap_names)
+        self._fps = fps
+        self.frames = 0
+        meta = json.dumps({
+            "beams": rig.names, "flaps": rig.flap_names,
+            "x": rig.x.tolist(), "y": rig.y.tolist(),
+            "height": rig.height.tolist(), "timing": timing,
+        }).encode()
+        self._f.write(_HEAD.pack(MAGIC, VERSION, 0, self._beams, self._flaps, fps))
+        self._f.write(struct.pack("<I", len(meta)) + meta)
+
+    def write(self, beam_z, flap_open):
+        block = np.concatenate([beam_z, flap_open], axis=1).astype("<f4", copy=False)
+        block.tofile(self._f)
+        self.frames += len(block)
+
+    def close(self):
+        self._f.seek(0)
+        self._f.write(_HEAD.pack(MAGIC, VERSION, self.frames,
+                                 self._beams, self._flaps, self._fps))
+        self._f.close()
+
+
+def read_keyframes(path):
+    """Load a .pfkf file -> (meta dict, beam_z (frames, beams), flap_open)."""
+    with open(path, "rb") as f:
+        magic, version, frames, beams, flaps, fps = _HEAD.unpack(f.read(_HEAD.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a v{VERSION} PLEX FLEX keyframe file")
+        (size,) = struct.unpack("<I", f.read(4))
+        meta = json.loads(f.read(size))
+        meta["fps"] = fps
+        data = np.fromfile(f, dtype="<f4", count=frames * (beams + flaps))
+    data = data.reshape(frames, beams + flaps)
+    return meta, data[:, :beams], data[:, beams:]
+
+
+def export_timeline(path, rig, fps, cycles, timing=None, block=50_000):
+    """Evaluate `cycles` deploy/retract cycles at `fps` into `path`.
+
+    Returns (frames written, {rule: violating frame count}, first violation
+    time per rule or None).
+    """
+    timing = dict(DEFAULT_TIMING, **(timing or {}))
+    total = int(round(cycle_length(rig, timing) * cycles * fps))
+    counts = {}
+    first = {}
+    writer = KeyframeWriter(path, rig, fps, timing)
+    try:
+        for start in range(0, total, block):
+            times = np.arange(start, min(start + block, total)) / fps
+            beam_z, flap_open, beam_moving, flap_moving = evaluate(rig, times, timing)
+            writer.write(beam_z, flap_open)
+            for rule, mask in interlock_violations(
+                    rig, flap_open, beam_moving, flap_moving).items():
+                counts[rule] = counts.get(rule, 0) + int(mask.sum())
+                if first.get(rule) is None and mask.any():
+                    first[rule] = float(times[np.argmax(mask)])
+                first.setdefault(rule, None)
+    finally:
+        writer.close()
+    return writer.frames, counts, first
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m facility.kinematics",
+                                     description="PLEX FLEX deploy/retract timeline.")
+    parser.add_argument("--fps", type=cli_params.positive_float, default=60.0)
+    parser.add_argument("--cycles", type=cli_params.positive_int, default=1)
+    for key, value in DEFAULT_TIMING.items():
+        kind = (cli_params.positive_float if key in POSITIVE_TIMING
+                else cli_params.nonnegative_float)
+        parser.add_argument("--" + key.replace("_", "-"), type=kind, default=value,
+                            help=f"seconds (default {value:g})")
+    parser.add_argument("-o", "--output", default="plexflex.pfkf")
+    args = parser.parse_args(argv)
+
+    timing = {key: getattr(args, key) for key in DEFAULT_TIMING}
+    rig = plexflex_rig()
+
+    t0 = time.perf_counter()
+    frames, counts, first = export_timeline(args.output, rig, args.fps,
+                                            args.cycles, timing)
+    elapsed = time.perf_counter() - t0
+
+    print("=" * 60)
+    print("  PLEX FLEX KINEMATICS")
+    print("=" * 60)
+    print(f"  Beams:        {len(rig.names)} ({rig.rows} rows x 2 ends)")
+    print(f"  Stroke:       {rig.stroke / FT:.1f}' (top row to {(rig.z_deployed.max()) / FT:.0f}')")
+    print(f"  Cycle:        {cycle_length(rig, timing):.1f} s x {args.cycles}")
+    print(f"  Frames:       {frames:,} @ {args.fps:g} fps in {elapsed * 1000:.0f} ms")
+    for rule, n in counts.items():
+        when = f" (first at {first[rule]:.2f} s)" if n else ""
+        print(f"  {rule}: {n} frames{when}")
+    print(f"  Output:       {args.output}")
+    print("=" * 60)
+    return 1 if any(counts.values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,408 @@
+# ============================================================================
+# optimize.py — branch-and-bound layout search for mats and support rooms
+# ============================================================================
+# Section 5 places the mats by hand (8' from the west wall, the second mat
+# MAT_GAP east of the first, a centred warm-up mat) and section 4 packs the
+# support rooms in a fixed order.  This searches both instead:
+#
+# Mats: MAT_COUNT squares of MAT_SIZE on a grid of candidate corners inside
+# the mat area (west wall to the divider), keeping --clearance from walls,
+# columns and the PLEX FLEX pits (--over-pits: stands stowed, flaps closed)
+# and MAT_GAP between mats.  Layouts are ranked by their spare clearance -
+# the smallest margin left over any of those requirements - which can only
+# shrink as mats are added, so it is also the bound: a partial layout whose
+# margin (or the best margin its remaining candidates could give) is below
+# the current --keep-th best is pruned; ties go to the larger mean margin.
+# Keep-outs come from the built scene, so they follow every parameter.
+#
+# Rooms: every order of the support rooms along the east wall (the last one
+# takes the remaining depth), pruned as soon as a room wall would cut a
+# column or a door; ranked by soft rules (the office holds its door, the
+# locker rooms share a wall), then by how far the order moves from today's.
+#
+# Run:
+#   python3 -m facility.optimize
+#   python3 -m facility.optimize MAT_COUNT=2 --over-pits --keep 5 -o layouts.json
+#   python3 -m facility.optimize BLDG_LENGTH=150 MAT_COUNT=4 --workers 4
+# ============================================================================
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+
+FT = model.FT
+
+CLEARANCE = 2 * FT        # mat edge to wall / column / pit
+GRID_STEP = 1 * FT        # candidate corner spacing
+MAX_CANDIDATES = 4000     # the grid is coarsened past this
+KEEP_OUT = {"column", "pit"}
+TIME_LIMIT = 10.0         # s
+
+# Support rooms: (name, width parameter); the last room in an order takes
+# whatever depth is left, at least its own width
+ROOMS = [("Office", "OFFICE_WIDTH"), ("LockerM", "LOCKER_M_WIDTH"),
+         ("LockerW", "LOCKER_W_WIDTH"), ("Weight", "WEIGHT_WIDTH"),
+         ("Mech", "MECH_WIDTH")]
+ROOM_DOORS = {"Office": "Door_Office"}       # room that should hold the door
+ROOM_PAIRS = [("LockerM", "LockerW")]        # rooms that should share a wall
+
+# ============================================================================
+# MAT LAYOUTS
+# ============================================================================
+
+def mat_region(scene, over_pits=False):
+    """Mat area rectangle (x0, y0, x1, y1) and keep-out footprints (k, 4)."""
+    p, L = scene.params, scene.layout
+    region = (p.EXT_WALL_THICK, p.EXT_WALL_THICK,
+              L.divider_x, p.BLDG_WIDTH - p.EXT_WALL_THICK)
+    kinds = KEEP_OUT - {"pit"} if over_pits else KEEP_OUT
+    keep_out = [(b.x, b.y, b.x + b.length, b.y + b.width) for b in scene.boxes
+                if model.object_category(b.name) in kinds
+                and b.x < region[2] and b.x + b.length > region[0]
+                and b.y < region[3] and b.y + b.width > region[1]]
+    return region, np.array(keep_out, dtype=float).reshape(-1, 4)
+
+
+def site_slack(x, y, size, region, keep_out, clearance=CLEARANCE):
+    """Spare clearance (mm) of mats with corners (x, y) to walls and keep-outs."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    x0, y0, x1, y1 = region
+    slack = np.minimum.reduce([x - x0, x1 - (x + size), y - y0, y1 - (y + size)])
+    if len(keep_out):
+        ox0, oy0, ox1, oy1 = (keep_out[:, k, None] for k in range(4))
+        apart = np.maximum.reduce([ox0 - (x + size), x - ox1, oy0 - (y + size), y - oy1])
+        slack = np.minimum(slack, apart.min(axis=0))
+    return slack - clearance
+
+
+def pair_slack(x, y, j, size, gap):
+    """Spare gap (mm) between mat j and every mat in (x, y)."""
+    return np.maximum(np.abs(x - x[j]), np.abs(y - y[j])) - size - gap
+
+
+def layout_slack(mats, size, gap, region, keep_out, clearance=CLEARANCE):
+    """Smallest spare clearance (mm) of a complete mat layout.
+
+    The same rules as site_slack and pair_slack, but `mats` is a list of
+    (x, y) corners and `keep_out` of (x0, y0, x1, y1) footprints whose
+    coordinates may be arrays (one element per variant) - the sweep checks
+    every variant's hand layout at once.  Keep-outs outside the region can
+    change the margin of a layout that already leaves it, never the sign.
+    """
+    x0, y0, x1, y1 = region
+    slack = np.inf
+    for i, (x, y) in enumerate(mats):
+        site = np.minimum.reduce([x - x0, x1 - (x + size), y - y0, y1 - (y + size)])
+        for ox0, oy0, ox1, oy1 in keep_out:
+            site = np.minimum(site, np.maximum.reduce(
+                [ox0 - (x + size), x - ox1, oy0 - (y + size), y - oy1]))
+        slack = np.minimum(slack, site - clearance)
+        for x2, y2 in mats[i + 1:]:
+            slack = np.minimum(slack, np.maximum(np.abs(x - x2), np.abs(y - y2)) - size - gap)
+    return slack
+
+
+def candidates(p, region, keep_out, clearance=CLEARANCE, step=GRID_STEP):
+    """Feasible corner positions (x, y, slack) and the grid step used."""
+    x0, y0, x1, y1 = region
+    lo_x, hi_x = x0 + clearance, x1 - clearance - p.MAT_SIZE
+    lo_y, hi_y = y0 + clearance, y1 - clearance - p.MAT_SIZE
+    if hi_x < lo_x or hi_y < lo_y:
+        return np.empty(0), np.empty(0), np.empty(0), step
+    while True:
+        xs = np.unique(np.append(np.arange(lo_x, hi_x, step), hi_x))
+        ys = np.unique(np.append(np.arange(lo_y, hi_y, step), hi_y))
+        if len(xs) * len(ys) <= MAX_CANDIDATES:
+            break
+        step *= 2
+    gy, gx = np.meshgrid(ys, xs, indexing="ij")    # Row-major: south to north
+    slack = site_slack(gx.ravel(), gy.ravel(), p.MAT_SIZE, region, keep_out, clearance)
+    ok = slack >= 0
+    return gx.ravel()[ok], gy.ravel()[ok], slack[ok], step
+
+
+def search_mats(x, y, base, n, size, gap, keep=5, firsts=None, deadline=None):
+    """Best `keep` sets of n candidate indices by spare clearance.
+
+    Depth-first branch and bound over increasing index sets (mats are
+    interchangeable).  Returns ([(score, mean, indices), ...] best first,
+    complete) - complete is False when the deadline cut the search short.
+    """
+    best = []        # Min-heap of (score, mean margin, indices)
+    complete = True
+
+    def threshold():
+        return best[0][0] if len(best) >= keep else -np.inf
+
+    def dfs(chosen, avail, start, score):
+        nonlocal complete
+        need = n - len(chosen)
+        if need == 0:
+            idx = np.array(chosen)
+            margins = base[idx].copy()
+            for k in range(n):
+                pair = pair_slack(x[idx], y[idx], k, size, gap)
+                pair[k] = np.inf
+                margins = np.minimum(margins, pair)
+            item = (score, float(margins.mean()), tuple(chosen))
+            if len(best) < keep:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+            return
+        if deadline is not None and time.monotonic() > deadline:
+            complete = False
+            return
+        bar = threshold()
+        idx = start + np.flatnonzero(avail[start:] >= max(bar, -1e-6))
+        if len(idx) < need:
+            return
+        # Bound: the finished layout is no better than the need-th best margin left
+        if min(score, np.partition(avail[idx], len(idx) - need)[len(idx) - need]) < bar:
+            return
+        for j in idx[np.argsort(-avail[idx], kind="stable")]:
+            if avail[j] < threshold():
+                break
+            if not chosen and firsts is not None and j not in firsts:
+                continue
+            dfs(chosen + [j], np.minimum(avail, pair_slack(x, y, j, size, gap)),
+                j + 1, min(score, avail[j]))
+
+    dfs([], base.copy(), 0, np.inf)
+    return sorted(best, reverse=True), complete
+
+
+def _search_part(args):
+    x, y, base, n, size, gap, keep, part, parts, limit = args
+    firsts = set(range(part, len(x), parts))
+    return search_mats(x, y, base, n, size, gap, keep, firsts,
+                       time.monotonic() + limit)
+
+
+def optimize_mats(params=None, n=None, keep=5, clearance=CLEARANCE, step=GRID_STEP,
+                  over_pits=False, workers=1, time_limit=TIME_LIMIT):
+    """Ranked mat layouts.  Returns a dict: layouts [(score mm, [(x, y), ...])],
+    n, complete, step, candidates."""
+    scene = model.build_facility(params)
+    p = scene.params
+    n = p.MAT_COUNT if n is None else n
+    region, keep_out = mat_region(scene, over_pits)
+    x, y, base, step = candidates(p, region, keep_out, clearance, step)
+    result = {"n": n, "layouts": [], "complete": True, "step": step,
+              "candidates": len(x), "region": region}
+    if n <= 0 or len(x) < n:
+        return result
+
+    if workers > 1:
+        jobs = [(x, y, base, n, p.MAT_SIZE, p.MAT_GAP, keep, w, workers, time_limit)
+                for w in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_search_part, jobs))
+        found = sorted((item for part, _ in parts for item in part), reverse=True)[:keep]
+        complete = all(done for _, done in parts)
+    else:
+        found, complete = search_mats(x, y, base, n, p.MAT_SIZE, p.MAT_GAP, keep,
+                                      deadline=time.monotonic() + time_limit)
+    result["complete"] = complete
+    result["layouts"] = [(float(score), [(float(x[j]), float(y[j])) for j in idx])
+                         for score, _mean, idx in found]
+    return result
+
+
+def current_mat_slack(params=None, clearance=CLEARANCE, over_pits=False):
+    """Spare clearance (mm) of each mat in today's hand layout (negative = violation)."""
+    scene = model.build_facility(params)
+    p, L = scene.params, scene.layout
+    region, keep_out = mat_region(scene, over_pits)
+    mats = model.mat_positions(p, L)
+    x = np.array([m[3] for m in mats], dtype=float)
+    y = np.array([m[4] for m in mats], dtype=float)
+    slack = site_slack(x, y, p.MAT_SIZE, region, keep_out, clearance)
+    for j in range(len(x)):
+        others = np.delete(pair_slack(x, y, j, p.MAT_SIZE, p.MAT_GAP), j)
+        if len(others):
+            slack[j] = min(slack[j], others.min())
+    return [(m[0], float(s)) for m, s in zip(mats, slack)]
+
+
+def current_room_cuts(params=None):
+    """(wall name, y) of today's room walls that cut a column or door."""
+    scene = model.build_facility(params)
+    p, L = scene.params, scene.layout
+    spans = room_keep_out(scene)
+    cuts, y = [], 0.0
+    for wall, width in L.rooms:
+        y += width
+        if any(lo < y + p.INT_WALL_THICK and hi > y for lo, hi in spans):
+            cuts.append((wall, y))
+    return cuts
+
+# ============================================================================
+# SUPPORT ROOMS
+# ============================================================================
+
+def room_keep_out(scene):
+    """(y0, y1) spans along the east strip that a room wall must not cut."""
+    p, L = scene.params, scene.layout
+    spans = []
+    for b in scene.boxes:
+        if (model.object_category(b.name) in ("column", "door")
+                and b.x < p.BLDG_LENGTH and b.x + b.length > L.divider_x):
+            spans.append((b.y, b.y + b.width))
+    return spans
+
+
+def room_score(order, walls, doors, baseline):
+    """(penalty, moves): broken soft rules, then pairwise swaps from baseline."""
+    penalty = 0
+    bounds = [0.0] + walls
+    for room, door in ROOM_DOORS.items():
+        if door in doors:
+            k = order.index(room)
+            lo, hi = bounds[k], bounds[k + 1] if k + 1 < len(bounds) else np.inf
+            if not lo <= doors[door] < hi:
+                penalty += 1
+    for a, b in ROOM_PAIRS:
+        if abs(order.index(a) - order.index(b)) != 1:
+            penalty += 1
+    rank = [baseline.index(room) for room in order]
+    moves = sum(1 for i, j in itertools.combinations(range(len(rank)), 2)
+                if rank[i] > rank[j])
+    return penalty, moves
+
+
+def optimize_rooms(params=None, keep=5):
+    """Ranked room orders: [(penalty, moves, [(room, y0, y1), ...])]."""
+    scene = model.build_facility(params)
+    p = scene.params
+    widths = {name: getattr(p, attr) for name, attr in ROOMS}
+    baseline = [name for name, _ in ROOMS]
+    spans = room_keep_out(scene)
+    doors = {b.name: min(max(b.y + b.width / 2, 0.0), p.BLDG_WIDTH)
+             for b in scene.boxes if b.name in ROOM_DOORS.values()}
+    if sum(widths.values()) > p.BLDG_WIDTH + 1e-6:
+        return []
+
+    results = []
+
+    def cuts(y):
+        return any(lo < y + p.INT_WALL_THICK and hi > y for lo, hi in spans)
+
+    def place(order, walls, y):
+        left = [name for name in baseline if name not in order]
+        if len(left) == 1:
+            full = order + left
+            results.append((*room_score(full, walls, doors, baseline), full, walls))
+            return
+        for name in left:
+            wall = y + widths[name]
+            if cuts(wall):
+                continue  # Prune: this wall lands on a column or door
+            place(order + [name], walls + [wall], wall)
+
+    place([], [], 0.0)
+    results.sort(key=lambda r: (r[0], r[1]))
+    ranked = []
+    for penalty, moves, order, walls in results[:keep]:
+        bounds = [0.0] + walls + [p.BLDG_WIDTH]
+        ranked.append((penalty, moves, [(name, bounds[k], bounds[k + 1])
+                                        for k, name in enumerate(order)]))
+    return ranked
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def print_layouts(mats, current, cuts, rooms, elapsed):
+    print("=" * 60)
+    print("  LAYOUT OPTIMIZER")
+    print("=" * 60)
+    print("  Current mats (spare clearance, ft):")
+    for name, slack in current:
+        flag = "" if slack >= -1e-6 else "  <- violates"
+        print(f"    {name:<24}{slack / FT:>8.2f}{flag}")
+    for wall, y in cuts:
+        print(f"  Current room wall {wall} at {y / FT:g}' cuts a column or door")
+    status = "optimal" if mats["complete"] else "time limit - best found"
+    print(f"  Mat layouts for {mats['n']} mats ({mats['candidates']} candidates "
+          f"at {mats['step'] / FT:g}' grid, {status}):")
+    if not mats["layouts"]:
+        print(f"    none feasible (max feasible: {mats.get('max_n', 0)} mats)")
+    for rank, (score, corners) in enumerate(mats["layouts"], 1):
+        where = "  ".join(f"({x / FT:.1f}', {y / FT:.1f}')" for x, y in corners)
+        print(f"    #{rank}  spare {score / FT:>5.2f}'   {where}")
+    print("  Room orders (south to north; broken rules, swaps from current):")
+    if not rooms:
+        print("    none feasible")
+    for rank, (penalty, moves, placed) in enumerate(rooms, 1):
+        order = " / ".join(f"{name} {y0 / FT:.0f}-{y1 / FT:.0f}'" for name, y0, y1 in placed)
+        print(f"    #{rank}  {penalty} {moves}  {order}")
+    print(f"  Time:         {elapsed:.2f} s")
+    print("=" * 60)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m facility.optimize",
+                                     description="Search mat and support room layouts.")
+    parser.add_argument("overrides", nargs="*", metavar="NAME=VALUE",
+                        help="parameter overrides (feet for lengths)")
+    parser.add_argument("--keep", type=int, default=5, help="layouts to rank (default 5)")
+    parser.add_argument("--clearance", type=float, default=CLEARANCE / FT,
+                        help="mat clearance to walls, columns and pits (ft)")
+    parser.add_argument("--step", type=float, default=GRID_STEP / FT,
+                        help="candidate grid step (ft)")
+    parser.add_argument("--over-pits", action="store_true",
+                        help="allow mats over the pits (stands stowed, flaps closed)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes splitting the first-mat branches")
+    parser.add_argument("--time-limit", type=float, default=TIME_LIMIT, help="seconds")
+    parser.add_argument("-o", "--output", help="write ranked layouts (.json, feet)")
+    args = parser.parse_args(argv)
+
+    params = cli_params.parse_overrides(args.overrides)
+    clearance, step = args.clearance * FT, args.step * FT
+    t0 = time.perf_counter()
+    mats = optimize_mats(params, None, args.keep, clearance, step, args.over_pits,
+                         args.workers, args.time_limit)
+    if not mats["layouts"]:
+        # Largest count that fits at all (one layout is enough to prove it)
+        for n in range(mats["n"] - 1, 0, -1):
+            if optimize_mats(params, n, 1, clearance, step, args.over_pits,
+                             args.workers, args.time_limit)["layouts"]:
+                mats["max_n"] = n
+                break
+    current = current_mat_slack(params, clearance, args.over_pits)
+    rooms = optimize_rooms(params, args.keep)
+    print_layouts(mats, current, current_room_cuts(params), rooms,
+                  time.perf_counter() - t0)
+
+    if args.output:
+        data = {
+            "mats": [{"spare_ft": round(score / FT, 3),
+                      "corners_ft": [[round(x / FT, 3), round(y / FT, 3)]
+                                     for x, y in corners]}
+                     for score, corners in mats["layouts"]],
+            "complete": mats["complete"],
+            "rooms": [{"penalty": penalty, "moves": moves,
+                       "order": [{"room": name, "y0_ft": round(y0 / FT, 3),
+                                  "y1_ft": round(y1 / FT, 3)} for name, y0, y1 in placed]}
+                      for penalty, moves, placed in rooms],
+        }
+        if os.path.dirname(args.output):
+            os.makedirs(os.path.dirname(args.output), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(data, f, indent=2)
+        print(f"  Saved:        {args.output}")
+
+
+if __name__ == "__main__":
+    main()
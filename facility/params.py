@@ -0,0 +1,164 @@
+# ============================================================================
+# params.py — command-line parameter parsing shared by the facility tools
+# ============================================================================
+# Lengths are typed in FEET on the command line and converted to the model's
+# millimetres; counts and ratios (rows, seats, mats, roof pitch) are taken as-is.
+#
+#   NAME=value              single override   SUPPORT_DEPTH=26
+#   NAME=start:stop:step    inclusive range   TELE_HORIZ_STEP=3:5:0.5
+#   NAME=a,b,c              explicit list     TELE_ROWS=16,24,32
+#
+# Values the model cannot build are rejected with ValueError: the stowed /
+# deployed heights may be anything finite, pitch, counts, the mat gap and
+# offset may be zero, every other size must be positive.  check_fit() adds
+# the cross-parameter checks on a resolved set: support area, rooms, pits
+# and doors must fit inside the building.
+# ============================================================================
+
+import argparse
+import math
+
+import wrestling_facility_phase1 as model
+
+UNITLESS_PARAMS = {"ROOF_PITCH", "TELE_ROWS", "TELE_EXTRA_SEATS", "MAT_COUNT"}
+INTEGER_PARAMS = {"TELE_ROWS", "TELE_EXTRA_SEATS", "MAT_COUNT"}
+SIGNED_PARAMS = {"TELE_STOW_Z", "TELE_DEPLOY_Z"}
+NONNEGATIVE_PARAMS = {"ROOF_PITCH", "TELE_EXTRA_SEATS", "MAT_COUNT", "MAT_GAP",
+                      "MAT_OFFSET_Y"}
+
+
+def check_name(name):
+    if name not in model.PARAM_NAMES:
+        raise ValueError(f"Unknown building parameter: {name}")
+    return name
+
+
+def check_value(name, value):
+    """Range-check a model value; returns it (ValueError if unbuildable)."""
+    if name in SIGNED_PARAMS:
+        return value
+    if name in NONNEGATIVE_PARAMS:
+        if value < 0:
+            raise ValueError(f"{name}: must not be negative")
+    elif value <= 0:
+        raise ValueError(f"{name}: must be positive")
+    return value
+
+
+def check_fit(p):
+    """Fit-to-building checks on resolved params; returns p (ValueError if not)."""
+    wall = p.EXT_WALL_THICK
+    inside_length = p.BLDG_LENGTH - 2 * wall
+    inside_width = p.BLDG_WIDTH - 2 * wall
+    mat_area = p.BLDG_LENGTH - p.SUPPORT_DEPTH - wall
+    rooms = p.OFFICE_WIDTH + p.LOCKER_M_WIDTH + p.LOCKER_W_WIDTH + p.WEIGHT_WIDTH
+
+    def ft(value):
+        return f"{value / model.FT:g}'"
+
+    problems = []
+    if mat_area <= wall:
+        problems.append(f"SUPPORT_DEPTH {ft(p.SUPPORT_DEPTH)} leaves no mat area in a "
+                        f"{ft(p.BLDG_LENGTH)} building")
+    if rooms >= inside_width:
+        problems.append(f"support rooms ({ft(rooms)}) leave no mechanical room in a "
+                        f"{ft(p.BLDG_WIDTH)} wide building")
+    if 2 * p.TELE_PIT_WIDTH > inside_width:
+        problems.append(f"two {ft(p.TELE_PIT_WIDTH)} pits do not fit in a "
+                        f"{ft(p.BLDG_WIDTH)} wide building")
+    if p.TELE_PIT_LENGTH > inside_length:
+        problems.append(f"TELE_PIT_LENGTH {ft(p.TELE_PIT_LENGTH)} runs past the "
+                        f"{ft(p.BLDG_LENGTH)} building")
+    if 20 * model.FT + p.ROLL_DOOR_W > inside_length:
+        problems.append(f"ROLL_DOOR_W {ft(p.ROLL_DOOR_W)} runs past the building length")
+    if 50 * model.FT + p.MAN_DOOR_W > inside_width:
+        problems.append(f"the east emergency door does not fit a {ft(p.BLDG_WIDTH)} wide "
+                        f"building")
+    if problems:
+        raise ValueError("; ".join(problems))
+    return p
+
+
+def to_model(name, value):
+    """Convert a command-line value (feet for lengths) to model units."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name}: not a number: {value!r}") from None
+    if not math.isfinite(number):
+        raise ValueError(f"{name}: must be finite")
+    if name in INTEGER_PARAMS:
+        return check_value(name, int(round(number)))
+    if name in UNITLESS_PARAMS:
+        return check_value(name, number)
+    return check_value(name, number * model.FT)
+
+
+def from_model(name, value):
+    """Convert a model value back to command-line units (feet for lengths)."""
+    if name in UNITLESS_PARAMS:
+        return value
+    return value / model.FT
+
+
+def parse_values(name, spec):
+    """Expand 'start:stop:step' or 'a,b,c' into a list of model values."""
+    if ":" in spec:
+        start, stop, step = (float(s) for s in spec.split(":"))
+        if step <= 0:
+            raise ValueError(f"{name}: step must be positive")
+        count = int(round((stop - start) / step)) + 1
+        raw = [start + i * step for i in range(max(count, 0))]
+    else:
+        raw = spec.split(",")
+    return [to_model(name, v) for v in raw]
+
+
+def parse_override(text):
+    """'NAME=value' -> (NAME, model value)."""
+    name, _, value = text.partition("=")
+    name = check_name(name.strip())
+    return name, to_model(name, value)
+
+
+def parse_overrides(texts):
+    return dict(parse_override(t) for t in texts or [])
+
+
+def parse_range(text):
+    """'NAME=start:stop:step' or 'NAME=a,b,c' -> (NAME, [model values])."""
+    name, _, spec = text.partition("=")
+    name = check_name(name.strip())
+    return name, parse_values(name, spec)
+
+
+def _float_arg(text, smallest, inclusive):
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a number: {text!r}") from None
+    if not (math.isfinite(value) and (value >= smallest if inclusive else value > smallest)):
+        raise argparse.ArgumentTypeError(
+            f"must be {'at least' if inclusive else 'greater than'} {smallest:g}: {text}")
+    return value
+
+
+def positive_float(text):
+    """argparse type: a finite number greater than zero."""
+    return _float_arg(text, 0.0, inclusive=False)
+
+
+def nonnegative_float(text):
+    """argparse type: a finite number of zero or more."""
+    return _float_arg(text, 0.0, inclusive=True)
+
+
+def positive_int(text):
+    """argparse type: a whole number of at least one."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a whole number: {text!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {text}")
+    return value
@@ -0,0 +1,228 @@
+# ============================================================================
+# profile.py — per-section timing, object counts and Chrome trace output
+# ============================================================================
+# Answers "where does build time go?": each numbered section, every
+# make_box / make_text_label call and the final doc.recompute() become a
+# timed span.  Spans nest (helper calls inside their section) and are
+# written as Chrome trace events - open the file in chrome://tracing or
+# https://ui.perfetto.dev.  A PROFILE table is printed under the BUILDING
+# SUMMARY with per-section time, share, object counts and (with --memory)
+# peak Python allocations from tracemalloc.
+#
+# Hooks into the model through build_facility(..., profiler=Profiler()):
+# the profiler wraps the backend, so the same spans are recorded for the
+# in-memory scene, a FreeCAD document and cached (restored) sections.
+#
+# Run:
+#   python3 -m facility.profile --trace build.trace.json
+#   python3 -m facility.profile TELE_ROWS=40 --memory --repeat 20
+#   freecadcmd -c "import sys; sys.argv=['x','--freecad']; \
+#       from facility.profile import main; main()"
+# ============================================================================
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# backend method -> helper name in the macro
+HELPERS = {"add_box": "make_box", "add_label": "make_text_label",
+           "update_box": "update_box", "update_label": "update_label",
+           "remove": "remove", "add_shape": "add_shape"}
+
+# ============================================================================
+# PROFILER
+# ============================================================================
+
+class Profiler:
+    """Collects nested timing spans as Chrome trace 'complete' events.
+
+    sections: list of dicts (name, ms, boxes, labels, peak_kb) per
+    "section"/"document" span; helpers: {helper: [calls, total ns]}.
+    """
+
+    def __init__(self, memory=False, helpers=True):
+        self.events = []
+        self.sections = []
+        self.helpers = {}
+        self.memory = memory
+        self.time_helpers = helpers  # False: section spans only (less overhead)
+        self._open = []   # per open span: {"boxes": n, "labels": n}
+        self._t0 = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._own_tracing = memory and not tracemalloc.is_tracing()
+        if self._own_tracing:
+            tracemalloc.start()
+
+    def close(self):
+        if self._own_tracing:
+            tracemalloc.stop()
+            self._own_tracing = False
+
+    def _event(self, name, category, start, end, args):
+        self.events.append({
+            "name": name, "cat": category, "ph": "X",
+            "ts": (start - self._t0) / 1000.0, "dur": (end - start) / 1000.0,
+            "pid": self._pid, "tid": 0, "args": args,
+        })
+
+    @contextmanager
+    def span(self, name, category):
+        counts = {"boxes": 0, "labels": 0}
+        self._open.append(counts)
+        if self.memory:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self._open.pop()
+            if self._open:  # Roll counts up into the enclosing span
+                for k, v in counts.items():
+                    self._open[-1][k] += v
+            args = dict(counts)
+            if self.memory:
+                args["peak_kb"] = round((tracemalloc.get_traced_memory()[1] - base) / 1024, 1)
+            self._event(name, category, start, end, args)
+            self.sections.append({"name": name, "ms": (end - start) / 1e6, **args})
+
+    def _call(self, helper, fn, args):
+        start = time.perf_counter_ns()
+        result = fn(*args)
+        end = time.perf_counter_ns()
+        if self._open:
+            if helper == "make_box":
+                self._open[-1]["boxes"] += 1
+            elif helper == "add_shape":  # A cached section's boxes at once
+                self._open[-1]["boxes"] += len(args[2])
+            elif helper == "make_text_label":
+                self._open[-1]["labels"] += 1
+        self._event(helper, "helper", start, end, {"object": args[0]})
+        stat = self.helpers.setdefault(helper, [0, 0])
+        stat[0] += 1
+        stat[1] += end - start
+        return result
+
+    def wrap(self, backend):
+        return _ProfiledBackend(backend, self)
+
+    def trace(self, meta=None):
+        """Chrome trace JSON object."""
+        events = [{"name": "thread_name", "ph": "M", "pid": self._pid, "tid": 0,
+                   "args": {"name": "build_facility"}}] + self.events
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": meta or {}}
+
+    def write_trace(self, path, meta=None):
+        with open(path, "w") as f:
+            json.dump(self.trace(meta), f)
+
+
+class _ProfiledBackend:
+    """Backend proxy that times the helper-facing methods."""
+
+    def __init__(self, inner, profiler):
+        self.inner = inner
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        attr = getattr(self.inner, name)
+        helper = HELPERS.get(name)
+        if helper is None or not self._profiler.time_helpers:
+            return attr
+        return lambda *args: self._profiler._call(helper, attr, args)
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def peak_rss_kb():
+    """Peak resident set size of this process (KB), or None."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if os.uname().sysname == "Darwin" else rss  # macOS: bytes
+
+
+def print_profile(profiler, builds=1):
+    rows = {}
+    for s in profiler.sections:
+        row = rows.setdefault(s["name"], {"ms": 0.0, "boxes": 0, "labels": 0, "peak_kb": 0.0})
+        row["ms"] += s["ms"] / builds
+        row["boxes"] = s["boxes"]
+        row["labels"] = s["labels"]
+        row["peak_kb"] = max(row["peak_kb"], s.get("peak_kb", 0.0))
+    total = sum(r["ms"] for r in rows.values()) or 1.0
+    memory = profiler.memory
+
+    print("  PROFILE" + (f" (mean of {builds} builds)" if builds > 1 else ""))
+    print(f"  {'Section':<32}{'ms':>9}{'%':>6}{'Boxes':>7}{'Lbls':>6}"
+          + (f"{'Peak KB':>9}" if memory else ""))
+    for name, r in rows.items():
+        print(f"  {name:<32}{r['ms']:>9.3f}{100 * r['ms'] / total:>6.1f}"
+              f"{r['boxes']:>7}{r['labels']:>6}"
+              + (f"{r['peak_kb']:>9.1f}" if memory else ""))
+    print(f"  {'Total':<32}{total:>9.3f}")
+    for helper, (calls, ns) in profiler.helpers.items():
+        calls //= builds
+        ns /= builds
+        print(f"  - {helper:<17} {calls:>6} calls {ns / 1e6:>9.3f} ms "
+              f"({ns / max(calls, 1) / 1000:.1f} us/call)")
+    rss = peak_rss_kb()
+    if rss is not None:
+        print(f"  Peak RSS:     {rss / 1024:.1f} MB")
+    print("=" * 60)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m facility.profile",
+                                     description="Profile a model build.")
+    parser.add_argument("overrides", nargs="*", metavar="NAME=VALUE",
+                        help="parameter overrides (feet for lengths)")
+    parser.add_argument("--trace", help="write a Chrome trace (.json)")
+    parser.add_argument("--memory", action="store_true",
+                        help="per-section peak allocations (tracemalloc; slower)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="builds to average over (in-memory scene only)")
+    parser.add_argument("--freecad", action="store_true",
+                        help="build into a FreeCAD document (run inside FreeCAD)")
+    parser.add_argument("--batch", action="store_true",
+                        help="FreeCAD document with one compound per category")
+    args = parser.parse_args(argv)
+
+    params = cli_params.parse_overrides(args.overrides)
+    profiler = Profiler(memory=args.memory)
+    builds = 1 if args.freecad or args.batch else max(args.repeat, 1)
+    try:
+        for _ in range(builds):
+            backend = (model.FreeCADBackend(batch=args.batch)
+                       if args.freecad or args.batch else None)
+            scene = model.build_facility(params, backend, profiler=profiler)
+    finally:
+        profiler.close()
+
+    model.print_summary(scene.params, scene.layout)
+    print_profile(profiler, builds)
+    if args.trace:
+        profiler.write_trace(args.trace, {"params": args.overrides, "builds": builds,
+                                          "backend": type(scene).__name__})
+        print(f"  Trace:        {args.trace} ({len(profiler.events):,} events)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+# ============================================================================
+# seating.py — individual PLEX FLEX seats as a compact struct-of-arrays
+# ============================================================================
+# TELE_EXTRA_SEATS is a target; this module lays the actual seats out on the
+# deployed beam rows and counts them.  Every row of both ends gets the same
+# plan: aisles at both ends and between sections, at most
+# MAX_SEATS_BETWEEN_AISLES seats per section (IBC 1029 with aisles on both
+# sides), SEAT_WIDTH per seat, spare length widening the aisles.
+#
+# Rows are deployed as in facility.kinematics (every row lifted until the
+# top row's base reaches TELE_DEPLOY_Z).  Rows whose seat surface is still
+# below the floor stay in the pit and are not counted.
+#
+# Accessibility (2010 ADA 221 / IBC 1108):
+#   wheelchair spaces  table 221.2.1.1 on total capacity; each space takes
+#                      two seat widths (36") at an aisle end of a section,
+#                      lowest usable rows first, with a companion seat beside it
+#   designated aisle   5% of aisle seats, lowest rows first
+#
+# Seats are kept as NumPy columns (x, y, z float32 mm; end, row, section,
+# seat int16; kind int8), never as per-seat Python objects.  capacity()
+# gives the same totals vectorized over parameter arrays (used by
+# facility.sweep).  add_seat_geometry() pushes one compound per end into a
+# FreeCAD document instead of a Part::Box per seat.
+#
+# Run:
+#   python3 -m facility.seating
+#   python3 -m facility.seating TELE_ROWS=20 -o seats.parquet
+# ============================================================================
+
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+from facility.columnar import open_writer
+
+FT = model.FT
+IN = model.IN
+
+SEAT_WIDTH = 18 * IN               # Bench seating per person
+SEAT_DEPTH = 18 * IN
+AISLE_WIDTH = 48 * IN              # Minimum, aisle serving seats on both sides
+MAX_SEATS_BETWEEN_AISLES = 14
+WHEELCHAIR_SEATS = 2               # Seat widths a wheelchair space takes
+AISLE_SEAT_SHARE = 0.05            # Designated aisle seats
+FLUSH = 1e-6                       # mm; a seat surface flush with the floor counts
+
+STANDARD, WHEELCHAIR, COMPANION, AISLE_DESIGNATED = 0, 1, 2, 3
+KIND_NAMES = {STANDARD: "standard", WHEELCHAIR: "wheelchair",
+              COMPANION: "companion", AISLE_DESIGNATED: "designated_aisle"}
+KIND_COLORS = {STANDARD: (0.20, 0.35, 0.65), WHEELCHAIR: (0.10, 0.55, 0.20),
+               COMPANION: (0.55, 0.75, 0.35), AISLE_DESIGNATED: (0.85, 0.65, 0.15)}
+
+# ============================================================================
+# VECTORIZED COUNTS (scalars or parameter arrays)
+# ============================================================================
+
+def row_layout(beam_length):
+    """(sections, seats per row, aisle width) for a beam length in mm.
+
+    Fewest sections such that no section exceeds MAX_SEATS_BETWEEN_AISLES,
+    with an aisle at both ends and between sections.
+    """
+    length = np.asarray(beam_length, dtype=float) + 1e-6  # Exact fits stay fits
+    per = MAX_SEATS_BETWEEN_AISLES * SEAT_WIDTH + AISLE_WIDTH
+    k = np.maximum(np.ceil((length - AISLE_WIDTH) / per), 1)
+    # The seat count is floored, so one section fewer may already fit
+    fewer = np.maximum(k - 1, 1)
+    seats_fewer = np.floor((length - (fewer + 1) * AISLE_WIDTH) / SEAT_WIDTH)
+    k = np.where(seats_fewer <= MAX_SEATS_BETWEEN_AISLES * fewer, fewer, k)
+    seats = np.maximum(np.floor((length - (k + 1) * AISLE_WIDTH) / SEAT_WIDTH), 0)
+    aisle = (length - seats * SEAT_WIDTH) / (k + 1)
+    return k.astype(np.int64), seats.astype(np.int64), aisle
+
+
+def seat_surface_z(p, rows):
+    """Deployed seat surface height (mm) of beam row index `rows`."""
+    return (p.TELE_DEPLOY_Z - (p.TELE_ROWS - 1 - rows) * p.TELE_BEAM_HEIGHT
+            + p.TELE_BEAM_HEIGHT * 0.9)
+
+
+def usable_rows(p):
+    """Rows per end whose deployed seat surface is at or above the floor."""
+    surface = p.TELE_DEPLOY_Z + 0.9 * p.TELE_BEAM_HEIGHT + FLUSH
+    above = np.floor(surface / p.TELE_BEAM_HEIGHT) + 1
+    return np.clip(above, 0, p.TELE_ROWS).astype(np.int64)
+
+
+def wheelchair_required(capacity):
+    """Wheelchair spaces required for a seating capacity (ADA table 221.2.1.1)."""
+    n = np.asarray(capacity, dtype=np.int64)
+    return np.select(
+        [n < 4, n <= 25, n <= 50, n <= 150, n <= 300, n <= 500, n <= 5000],
+        [0, 1, 2, 4, 5, 6, 6 + -(-(n - 500) // 150)],
+        default=36 + -(-(n - 5000) // 200))
+
+
+def capacity(p):
+    """Seat totals for a (vectorized) parameter namespace.
+
+    capacity = positions after wheelchair conversion (each space replaces
+    WHEELCHAIR_SEATS seats with one position).
+    """
+    L = model.facility_layout(p)
+    sections, per_row, aisle = row_layout(L.beam_length)
+    rows = usable_rows(p)
+    seats = 2 * rows * per_row
+    spaces = wheelchair_required(seats)
+    return {
+        "usable_rows": rows, "sections_per_row": sections, "seats_per_row": per_row,
+        "aisle_width_ft": aisle / FT, "wheelchair_spaces": spaces,
+        "seat_capacity": seats - spaces * (WHEELCHAIR_SEATS - 1),
+    }
+
+# ============================================================================
+# SEAT ARRAYS (one parameter set)
+# ============================================================================
+
+def _row_plan(beam_length):
+    """Seat x offsets (mm, centre), section index and aisle-adjacency for one row."""
+    sections, seats, aisle = (v.item() for v in row_layout(beam_length))
+    base, extra = divmod(seats, sections)
+    counts = np.array([base + (s < extra) for s in range(sections)])
+    section = np.repeat(np.arange(sections), counts)
+    start = np.cumsum(counts) - counts                   # First seat of each section
+    local = np.arange(seats) - np.repeat(start, counts)  # Index within the section
+    x = aisle * (section + 1) + (np.arange(seats) + 0.5) * SEAT_WIDTH
+    at_aisle = (local == 0) | (local == np.repeat(counts, counts) - 1)
+    return x, section, local, np.repeat(counts, counts), at_aisle
+
+
+def generate_seats(params=None):
+    """Struct-of-arrays of every usable seat for one parameter set.
+
+    Returns a namespace of equal-length columns: x, y, z (seat centre on
+    the seat surface, mm), end (0 north / 1 south), row, section, seat
+    (index along the row), kind (STANDARD / WHEELCHAIR / COMPANION /
+    AISLE_DESIGNATED), plus per-layout scalars.
+    """
+    p = model.resolve_params(params)
+    L = model.facility_layout(p)
+    x_row, sec_row, local_row, count_row, aisle_row = _row_plan(L.beam_length)
+    per_row = len(x_row)
+
+    first = p.TELE_ROWS - int(usable_rows(p))
+    rows = np.arange(first, p.TELE_ROWS)
+    # (end, row) grid, lowest usable row first so accessible seats go low
+    end = np.repeat([0, 1], len(rows))
+    row = np.tile(rows, 2)
+    step = (p.TELE_ROWS - 1 - row) * p.TELE_HORIZ_STEP
+    beam_y = np.where(end == 0, L.pit_north_y - step, L.pit_south_y + step)
+
+    n = len(row) * per_row
+    kind = np.zeros(n, dtype=np.int8)
+    keep = np.ones(n, dtype=bool)
+    seats_total = n
+
+    # ---- Wheelchair spaces + companions at section ends, low rows first ----
+    # Candidate slots: (row block, seat) at the start or end of a section;
+    # row levels from the bottom up, north then south on each level
+    order = np.argsort(np.concatenate([rows - first, rows - first]), kind="stable")
+    slots = []
+    starts = np.flatnonzero(local_row == 0)
+    for block in order:
+        for s in starts:
+            c = count_row[s]
+            if c >= 2 * WHEELCHAIR_SEATS + 2:
+                slots.append((block, s, 1))               # Space at the left aisle
+                slots.append((block, s + c - 1, -1))      # Space at the right aisle
+    required = int(wheelchair_required(seats_total))
+    for block, s, direction in slots[:required]:
+        i = block * per_row + s
+        kind[i] = WHEELCHAIR
+        keep[i + direction * np.arange(1, WHEELCHAIR_SEATS)] = False
+        kind[i + direction * WHEELCHAIR_SEATS] = COMPANION
+    placed = min(required, len(slots))
+
+    # ---- Designated aisle seats: 5% of aisle seats, low rows first ----
+    aisle = np.tile(aisle_row, len(row)) & keep & (kind == STANDARD)
+    want = int(np.ceil(AISLE_SEAT_SHARE * aisle.sum()))
+    low_first = np.argsort(np.repeat(row, per_row), kind="stable")
+    chosen = low_first[aisle[low_first]][:want]
+    kind[chosen] = AISLE_DESIGNATED
+
+    seats = SimpleNamespace(
+        x=(p.EXT_WALL_THICK + np.tile(x_row, len(row)))[keep].astype(np.float32),
+        y=(np.repeat(beam_y, per_row) + L.beam_width / 2)[keep].astype(np.float32),
+        z=np.repeat(seat_surface_z(p, row), per_row)[keep].astype(np.float32),
+        end=np.repeat(end, per_row)[keep].astype(np.int8),
+        row=np.repeat(row, per_row)[keep].astype(np.int16),
+        section=np.tile(sec_row, len(row))[keep].astype(np.int16),
+        seat=np.tile(np.arange(per_row), len(row))[keep].astype(np.int16),
+        kind=kind[keep],
+    )
+    sections, _per, aisle_width = row_layout(L.beam_length)
+    seats.params = p
+    seats.rows_total = p.TELE_ROWS
+    seats.rows_usable = len(rows)
+    seats.sections_per_row = int(sections)
+    seats.seats_per_row = per_row
+    seats.aisle_width = float(aisle_width)
+    seats.wheelchair_required = required
+    seats.wheelchair_placed = placed
+    return seats
+
+
+def seat_counts(seats):
+    """{kind name: count} for a seat array."""
+    counts = np.bincount(seats.kind, minlength=len(KIND_NAMES))
+    return {name: int(counts[k]) for k, name in KIND_NAMES.items()}
+
+
+def seat_columns(seats):
+    """Column dict for facility.columnar writers (lengths in feet)."""
+    return {
+        "end": np.where(seats.end == 0, "north", "south"),
+        "row": seats.row, "section": seats.section, "seat": seats.seat,
+        "kind": np.array(list(KIND_NAMES.values()))[seats.kind],
+        "x_ft": seats.x / FT, "y_ft": seats.y / FT, "z_ft": seats.z / FT,
+    }
+
+# ============================================================================
+# GEOMETRY (aggregate, never one object per seat)
+# ============================================================================
+
+def add_seat_geometry(backend, seats):
+    """One compound of seat blocks per end in a FreeCADBackend document.
+
+    Per-seat colors by kind (per-face DiffuseColor).  Returns the created
+    document objects.
+    """
+    import Part
+    App = backend.App
+    objects = []
+    for e, tag in ((0, "North"), (1, "South")):
+        idx = np.flatnonzero(seats.end == e)
+        if not len(idx):
+            continue
+        width = np.where(seats.kind[idx] == WHEELCHAIR, WHEELCHAIR_SEATS * SEAT_WIDTH,
+                         SEAT_WIDTH) * 0.9
+        obj = backend.doc.addObject("Part::Feature", f"Seats_{tag}")
+        obj.Shape = Part.makeCompound([
+            Part.makeBox(float(w), SEAT_DEPTH, 2 * IN,
+                         App.Vector(float(seats.x[i] - SEAT_WIDTH / 2),
+                                    float(seats.y[i] - SEAT_DEPTH / 2),
+                                    float(seats.z[i])))
+            for i, w in zip(idx, width)])
+        obj.Label = f"Seats {tag} x{len(idx)}"
+        if obj.ViewObject is not None:
+            obj.ViewObject.DiffuseColor = [KIND_COLORS[int(k)]
+                                           for k in seats.kind[idx] for _face in range(6)]
+        objects.append(obj)
+    return objects
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def print_seating(seats, elapsed):
+    p = seats.params
+    counts = seat_counts(seats)
+    total = len(seats.kind)
+    print("=" * 60)
+    print("  PLEX FLEX SEATING")
+    print("=" * 60)
+    print(f"  Rows:         {seats.rows_usable} of {seats.rows_total} per end above floor")
+    print(f"  Per row:      {seats.seats_per_row} seats in {seats.sections_per_row} sections, "
+          f"{seats.sections_per_row + 1} aisles of {seats.aisle_width / IN:.0f}\"")
+    print(f"  Capacity:     {total:,} positions "
+          f"(target TELE_EXTRA_SEATS {p.TELE_EXTRA_SEATS:,}, "
+          f"{total - p.TELE_EXTRA_SEATS:+,})")
+    print(f"  - North/South {int((seats.end == 0).sum()):,} / {int((seats.end == 1).sum()):,}")
+    print(f"  Wheelchair:   {counts['wheelchair']} spaces "
+          f"(required {seats.wheelchair_required}) + {counts['companion']} companion")
+    if seats.wheelchair_placed < seats.wheelchair_required:
+        print(f"  WARNING:      only {seats.wheelchair_placed} wheelchair spaces fit")
+    print(f"  Aisle seats:  {counts['designated_aisle']} designated")
+    print(f"  Memory:       {sum(getattr(seats, c).nbytes for c in ('x', 'y', 'z', 'end', 'row', 'section', 'seat', 'kind')) / 1024:.1f} KB "
+          f"in {elapsed * 1000:.2f} ms")
+    print("=" * 60)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m facility.seating",
+                                     description="Seat-level PLEX FLEX layout.")
+    parser.add_argument("overrides", nargs="*", metavar="NAME=VALUE",
+                        help="parameter overrides (feet for lengths)")
+    parser.add_argument("-o", "--output", help="per-seat table (.csv or .parquet)")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    seats = generate_seats(cli_params.parse_overrides(args.overrides))
+    elapsed = time.perf_counter() - t0
+    print_seating(seats, elapsed)
+
+    if args.output:
+        writer = open_writer(args.output)
+        writer.write(seat_columns(seats))
+        writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+# ============================================================================
+# server.py — warm worker pool serving model builds over local HTTP
+# ============================================================================
+# Starting FreeCAD costs seconds; a build costs milliseconds.  This keeps a
+# pool of headless worker processes alive (FreeCADCmd when it is on PATH,
+# otherwise plain python3 with the in-memory scene), each holding one warm
+# document that is cleared and reused between requests.  A threaded HTTP
+# front end hands each request to an idle worker, so up to --workers
+# planner requests build concurrently with no cold start.
+#
+# Workers connect back to the pool over a localhost socket
+# (multiprocessing.connection, random auth key per pool).  A worker that
+# dies or exceeds --timeout is killed and replaced.
+#
+# API (parameter values in feet, like the other tools):
+#   GET  /health                          pool size, idle workers, backend
+#   GET  /params                          parameter names and defaults
+#   POST /build  {"params": {"SUPPORT_DEPTH": 26}, "format": "json"}
+#        format: json  - summary (object counts, build ms, worker pid)
+#                glb   - instanced binary glTF of the build (facility.gltf)
+#                fcstd - the FreeCAD document (FreeCAD workers only)
+#
+# Run:
+#   python3 -m facility.server --workers 4 --port 8765
+#   curl -s localhost:8765/build -d '{"params": {"TELE_ROWS": 24}}'
+# ============================================================================
+
+import argparse
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.connection import Client, Listener, answer_challenge, deliver_challenge
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 120.0   # s per build before the worker is replaced
+HANDSHAKE_TIMEOUT = 10.0  # s for a connecting worker to authenticate and say hello
+READ_TIMEOUT = 30.0       # s an HTTP client may take to send its request
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKER_CODE = "from facility.server import worker_main; worker_main()"
+FREECAD_COMMANDS = ("FreeCADCmd", "freecadcmd")
+
+CONTENT_TYPES = {"json": "application/json", "glb": "model/gltf-binary",
+                 "fcstd": "application/octet-stream"}
+
+# ============================================================================
+# WORKER (runs inside FreeCADCmd or python3)
+# ============================================================================
+
+def _new_backend():
+    batch = os.environ.get("FACILITY_WORKER_BATCH") == "1"
+    try:
+        return model.FreeCADBackend("FacilityWorker", batch=batch), "freecad"
+    except ImportError:
+        return None, "scene"
+
+
+def _handle(job, backend):
+    """Build one request into the worker's document; return a reply dict."""
+    fmt = job.get("format", "json")
+    t0 = time.perf_counter()
+    if backend is not None:
+        backend.clear()
+    scene = model.build_facility(job.get("params"), backend)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    reply = {"boxes": len(scene), "labels": len(scene.labels),
+             "build_ms": round(build_ms, 3), "worker": os.getpid()}
+
+    if fmt == "glb":
+        from facility.gltf import build_glb
+        if backend is not None:  # glTF is written from the in-memory records
+            scene = model.build_facility(job.get("params"))
+        reply["data"] = build_glb(scene)
+    elif fmt == "fcstd":
+        if backend is None:
+            raise ValueError("fcstd output needs FreeCAD workers")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "facility.FCStd")
+            backend.doc.saveAs(path)
+            with open(path, "rb") as f:
+                reply["data"] = f.read()
+    elif fmt != "json":
+        raise ValueError(f"Unknown format: {fmt}")
+    return reply
+
+
+def worker_main():
+    """Worker loop: warm up, connect to the pool, serve jobs until told to stop."""
+    address = (os.environ["FACILITY_WORKER_HOST"], int(os.environ["FACILITY_WORKER_PORT"]))
+    key = bytes.fromhex(os.environ["FACILITY_WORKER_KEY"])
+    backend, kind = _new_backend()
+    _handle({}, backend)  # Warm-up: imports, first document recompute
+
+    conn = Client(address, authkey=key)
+    conn.send_bytes(json.dumps({"pid": os.getpid(), "backend": kind}).encode())
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        try:
+            reply = _handle(job, backend)
+        except Exception as e:
+            reply = {"error": f"{type(e).__name__}: {e}"}
+        conn.send(reply)
+    conn.close()
+
+# ============================================================================
+# POOL
+# ============================================================================
+
+def default_command():
+    """FreeCADCmd if installed, else this Python (in-memory scene workers)."""
+    for name in FREECAD_COMMANDS:
+        path = shutil.which(name)
+        if path:
+            return [path]
+    return [sys.executable]
+
+
+class WorkerError(RuntimeError):
+    pass
+
+
+class _Deadline:
+    """Connection view whose reads give up after `timeout` seconds."""
+
+    def __init__(self, conn, timeout):
+        self._conn = conn
+        self._timeout = timeout
+
+    def send_bytes(self, data):
+        self._conn.send_bytes(data)
+
+    def recv_bytes(self, maxlength=None):
+        if not self._conn.poll(self._timeout):
+            raise TimeoutError(f"nothing received in {self._timeout:g} s")
+        return self._conn.recv_bytes(maxlength)
+
+
+class WorkerPool:
+    """Fixed-size pool of warm worker processes; submit() blocks for an idle one."""
+
+    def __init__(self, size, command=None, timeout=DEFAULT_TIMEOUT, batch=False):
+        self.size = size
+        self.batch = batch
+        self.command = command or default_command()
+        self.timeout = timeout
+        self.backend = None
+        self._key = os.urandom(16)
+        # Authenticated by hand in _accept, with a deadline
+        self._listener = Listener(("127.0.0.1", 0))
+        self._idle = queue.Queue()
+        self._procs = {}     # pid -> Popen
+        self._lock = threading.Lock()
+        self._closed = False
+        threading.Thread(target=self._accept, daemon=True).start()
+        for _ in range(size):
+            self._spawn()
+
+    def _spawn(self):
+        host, port = self._listener.address
+        env = dict(os.environ,
+                   FACILITY_WORKER_HOST=host, FACILITY_WORKER_PORT=str(port),
+                   FACILITY_WORKER_KEY=self._key.hex(),
+                   FACILITY_WORKER_BATCH="1" if self.batch else "0",
+                   PYTHONPATH=os.pathsep.join(
+                       filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+        proc = subprocess.Popen(self.command + ["-c", WORKER_CODE], env=env,
+                                cwd=REPO_ROOT, stdout=subprocess.DEVNULL)
+        with self._lock:
+            self._procs[proc.pid] = proc
+
+    def _accept(self):
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except OSError:  # Closed listener
+                continue
+            try:
+                timed = _Deadline(conn, HANDSHAKE_TIMEOUT)
+                deliver_challenge(timed, self._key)
+                answer_challenge(timed, self._key)
+                hello = json.loads(timed.recv_bytes(1024))
+                pid, backend = int(hello["pid"]), hello["backend"]
+            except Exception:  # Bad auth key, silent client, dead worker
+                conn.close()
+                continue
+            self.backend = backend
+            self._idle.put((conn, pid))
+
+    def wait_ready(self, timeout=60.0):
+        """Block until every worker has connected (or raise WorkerError)."""
+        deadline = time.monotonic() + timeout
+        while self._idle.qsize() < self.size:
+            dead = [p for p in self._procs.values() if p.poll() is not None]
+            if dead:
+                raise WorkerError(f"worker exited with code {dead[0].returncode}")
+            if time.monotonic() > deadline:
+                raise WorkerError("workers did not start in time")
+            time.sleep(0.05)
+
+    def _replace(self, conn, pid):
+        conn.close()
+        with self._lock:
+            proc = self._procs.pop(pid, None)
+        if proc is not None:
+            proc.kill()
+            proc.wait()
+        if not self._closed:
+            self._spawn()
+
+    def submit(self, job, wait=None):
+        """Run one job on an idle worker and return its reply dict."""
+        try:
+            conn, pid = self._idle.get(timeout=wait)
+        except queue.Empty:
+            raise WorkerError("no idle worker") from None
+        try:
+            conn.send(job)
+            if not conn.poll(self.timeout):
+                raise WorkerError(f"worker {pid} timed out after {self.timeout:g} s")
+            reply = conn.recv()
+        except (OSError, EOFError, WorkerError) as e:
+            self._replace(conn, pid)
+            if isinstance(e, WorkerError):
+                raise
+            raise WorkerError(f"worker {pid} died") from e
+        self._idle.put((conn, pid))
+        return reply
+
+    def idle(self):
+        return self._idle.qsize()
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                conn, _pid = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.send(None)
+                conn.close()
+            except OSError:
+                pass
+        for proc in list(self._procs.values()):
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        self._listener.close()
+
+# ============================================================================
+# HTTP API
+# ============================================================================
+
+def parse_job(body):
+    """Request JSON -> worker job (params converted from feet to mm)."""
+    request = json.loads(body or b"{}")
+    params = {}
+    for name, value in (request.get("params") or {}).items():
+        cli_params.check_name(name)
+        params[name] = cli_params.to_model(name, value)
+    cli_params.check_fit(model.resolve_params(params))
+    fmt = request.get("format", "json")
+    if fmt not in CONTENT_TYPES:
+        raise ValueError(f"Unknown format: {fmt}")
+    return {"params": params, "format": fmt}
+
+
+class BuildHandler(BaseHTTPRequestHandler):
+    pool = None       # Set by serve()
+    queue_wait = 30.0
+    timeout = READ_TIMEOUT
+
+    def _send(self, status, payload, content_type="application/json"):
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"workers": self.pool.size, "idle": self.pool.idle(),
+                             "backend": self.pool.backend})
+        elif self.path == "/params":
+            self._send(200, {name: cli_params.from_model(name, value)
+                             for name, value in model.default_params().items()})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/build":
+            self._send(404, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            job = parse_job(self.rfile.read(length))
+        except (ValueError, TypeError, AttributeError) as e:
+            self._send(400, {"error": str(e)})
+            return
+        if job["format"] == "fcstd" and self.pool.backend != "freecad":
+            self._send(400, {"error": "fcstd output needs FreeCAD workers"})
+            return
+        try:
+            reply = self.pool.submit(job, wait=self.queue_wait)
+        except WorkerError as e:
+            self._send(503, {"error": str(e)})
+            return
+        if "error" in reply:
+            self._send(500, reply)
+        elif "data" in reply:
+            self._send(200, reply["data"], CONTENT_TYPES[job["format"]])
+        else:
+            self._send(200, reply)
+
+    def log_message(self, fmt, *args):
+        sys.stderr.write("  %s %s\n" % (self.log_date_time_string(), fmt % args))
+
+
+def serve(pool, host="127.0.0.1", port=DEFAULT_PORT):
+    handler = type("Handler", (BuildHandler,), {"pool": pool})
+    return ThreadingHTTPServer((host, port), handler)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m facility.server",
+                                     description="Serve model builds from warm workers.")
+    parser.add_argument("--workers", type=int, default=min(os.cpu_count() or 1, 4))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="seconds per build before a worker is replaced")
+    parser.add_argument("--worker-cmd", help="worker interpreter (default: FreeCADCmd "
+                        "if on PATH, else this python)")
+    parser.add_argument("--batch", action="store_true",
+                        help="FreeCAD workers build one compound per category")
+    args = parser.parse_args(argv)
+
+    command = args.worker_cmd.split() if args.worker_cmd else None
+    t0 = time.perf_counter()
+    pool = WorkerPool(args.workers, command, args.timeout, args.batch)
+    try:
+        pool.wait_ready()
+        httpd = serve(pool, args.host, args.port)
+        print("=" * 60)
+        print("  FACILITY BUILD SERVER")
+        print("=" * 60)
+        print(f"  Workers:      {pool.size} x {pool.backend} ({' '.join(pool.command)})")
+        print(f"  Warm in:      {time.perf_counter() - t0:.2f} s")
+        print(f"  Listening:    http://{args.host}:{args.port}/build")
+        print("=" * 60)
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        httpd.server_close()
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+# ============================================================================
+# sightlines.py — C-values and obstructions from every seat to the mats
+# ============================================================================
+# For each PLEX FLEX seat (facility.seating) and each target mat, at several
+# deploy heights between stowed (TELE_STOW_Z) and deployed (TELE_DEPLOY_Z):
+#
+#   C-value      how far the sightline from this spectator's eye to the
+#                nearest visible point of the mat passes above the eye of
+#                the spectator in the row in front (mm; 60 minimum, 90 good)
+#   obstruction  share of a grid of points on the mat hidden behind the
+#                model's columns, walls, doors and beam rows
+#
+# Everything is one batched NumPy computation: C-values for (heights x mats
+# x seats) at once, and a slab ray/box test of every (seat, mat point) ray
+# against every obstructing box.  Rows move as in facility.kinematics; a
+# row is occupied at a height only once its seat surface clears the floor.
+#
+# Output: per-seat table (.csv/.parquet), full arrays (.npz) and a PPM
+# heatmap of the worst C-value per seat (one panel per end, rows x seats).
+# summary_batch() condenses a run to a few numbers for facility.sweep:
+#   python3 -m facility.sweep --range TELE_HORIZ_STEP=3:5:0.5 \
+#       --range TELE_BEAM_HEIGHT=2:4:0.5 --sightlines
+#
+# Run:
+#   python3 -m facility.sightlines --heights 5 -o seats_c.csv --ppm c.ppm
+# ============================================================================
+
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+from facility.columnar import open_writer
+from facility.seating import generate_seats
+
+FT = model.FT
+
+EYE_HEIGHT = 800.0        # mm, seated eye above the seat surface
+C_MIN = 60.0              # mm, acceptable
+C_GOOD = 90.0             # mm, good
+TARGET_MATS = ("Wrestling_Mat_1", "Wrestling_Mat_2")
+MAT_SAMPLES = 3           # n x n points per mat for the obstruction test
+# The roof is left out: it is modelled as a flat panel at eave height, which
+# deployed upper rows rise through (a clash facility.clash reports).
+OBSTRUCTING = {"column", "int_wall", "ext_wall", "door", "beam"}
+RAY_CHUNK = 200_000       # rays per ray/box batch
+
+# ============================================================================
+# RAY TEST
+# ============================================================================
+
+def ray_hits(origin, target, lo, hi, chunk=RAY_CHUNK):
+    """(n,) bool: segment origin -> target crosses any box [lo, hi] (slab test).
+
+    Touching a face does not count; boxes containing an end point do.
+    Boxes outside the bounds of all segments are culled first.
+    """
+    origin = np.asarray(origin, dtype=float)
+    target = np.asarray(target, dtype=float)
+    hit = np.zeros(len(origin), dtype=bool)
+    if len(origin):
+        reach_lo = np.minimum(origin, target).min(axis=0)
+        reach_hi = np.maximum(origin, target).max(axis=0)
+        keep = ((lo < reach_hi) & (hi > reach_lo)).all(axis=1)
+        lo, hi = lo[keep], hi[keep]
+    if not len(lo):
+        return hit
+    step = max(chunk // len(lo), 1)
+    for a in range(0, len(origin), step):
+        o = origin[a:a + step]
+        d = target[a:a + step] - o
+        d = np.where(np.abs(d) < 1e-9, 1e-9, d)
+        enter = np.full((len(o), len(lo)), -np.inf)
+        leave = np.full((len(o), len(lo)), np.inf)
+        for k in range(3):  # One slab per axis
+            inv = 1.0 / d[:, k, None]
+            t1 = (lo[None, :, k] - o[:, k, None]) * inv
+            t2 = (hi[None, :, k] - o[:, k, None]) * inv
+            np.maximum(enter, np.minimum(t1, t2), out=enter)
+            np.minimum(leave, np.maximum(t1, t2), out=leave)
+        crossed = (leave - np.maximum(enter, 0.0) > 1e-9) & (enter < 1.0)
+        hit[a:a + step] = crossed.any(axis=1)
+    return hit
+
+# ============================================================================
+# ANALYSIS
+# ============================================================================
+
+def analyze(params=None, heights=5, mats=TARGET_MATS):
+    """C-values and obstruction for every seat, mat and deploy height.
+
+    Returns a namespace: fractions (H,) deploy fraction 0..1, mats, seats
+    (facility.seating arrays), occupied (H, S) bool, c (H, M, S) mm (NaN
+    where the seat is empty, nobody sits in front or the mat is not ahead),
+    obstructed (H, M, S) share of mat points hidden.
+    """
+    seats = generate_seats(params)
+    p = seats.params
+    scene = model.build_facility(params)
+    fractions = np.linspace(0.0, 1.0, heights) if heights > 1 else np.ones(1)
+
+    stroke = p.TELE_DEPLOY_Z - (p.TELE_STOW_Z + (p.TELE_ROWS - 1) * p.TELE_BEAM_HEIGHT)
+    drop = (1.0 - fractions)[:, None] * stroke                  # (H, 1) below deployed
+    seat_z = seats.z[None, :] - drop                            # (H, S)
+    occupied = seat_z >= 0
+    front_present = seat_z - p.TELE_BEAM_HEIGHT >= 0
+
+    toward = np.where(seats.end == 0, -1.0, 1.0)                # North faces south
+    x, y = seats.x.astype(float), seats.y.astype(float)
+    eye_z = seat_z + EYE_HEIGHT
+    front_y = y + toward * p.TELE_HORIZ_STEP
+    # Front edge of each stand: one step ahead of its lowest occupied row
+    edge = np.empty((len(fractions), len(y)))
+    for e in (0, 1):
+        mine = seats.end == e
+        lead = np.where(occupied[:, mine], toward[mine] * y[mine], -np.inf).max(axis=1)
+        edge[:, mine] = toward[mine] * (lead[:, None] + p.TELE_HORIZ_STEP)
+
+    boxes = {b.name: b for b in scene.boxes}
+    obstacles = [b for b in scene.boxes
+                 if model.object_category(b.name) in OBSTRUCTING]
+    is_beam = np.array([model.object_category(b.name) == "beam" for b in obstacles])
+    lo0 = np.array([(b.x, b.y, b.z) for b in obstacles], dtype=float).reshape(-1, 3)
+    hi0 = lo0 + np.array([(b.length, b.width, b.height) for b in obstacles]).reshape(-1, 3)
+
+    H, M, S = len(fractions), len(mats), len(x)
+    c = np.full((H, M, S), np.nan, dtype=np.float32)
+    obstructed = np.zeros((H, M, S), dtype=np.float32)
+    u = (np.arange(MAT_SAMPLES) + 0.5) / MAT_SAMPLES
+
+    for m, name in enumerate(mats):
+        mat = boxes[name]
+        top = mat.z + mat.height
+        # ---- C-value: nearest point of the mat in front of the stand ----
+        near = np.where(toward < 0, mat.y + mat.width, mat.y)   # Edge facing the stand
+        far = np.where(toward < 0, mat.y, mat.y + mat.width)
+        fy = np.where(toward < 0, np.minimum(near, edge), np.maximum(near, edge))
+        ahead = np.where(toward < 0, far < edge, far > edge)    # (H, S)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = (y - front_y) / (y - fy)                        # Front row along the sightline
+        line_z = eye_z + t * (top - eye_z)
+        value = line_z - (eye_z - p.TELE_BEAM_HEIGHT)
+        valid = occupied & front_present & ahead & (t > 0) & (t < 1)
+        c[:, m] = np.where(valid, value, np.nan)
+
+        # ---- Obstruction: rays to an n x n grid of mat points ----
+        gx, gy = np.meshgrid(mat.x + u * mat.length, mat.y + u * mat.width)
+        points = np.stack([gx.ravel(), gy.ravel(), np.full(gx.size, top + 1.0)], axis=1)
+        P = len(points)
+        for h in range(H):
+            lo, hi = lo0.copy(), hi0.copy()
+            lo[is_beam, 2] -= drop[h, 0]
+            hi[is_beam, 2] -= drop[h, 0]
+            idx = np.flatnonzero(occupied[h])
+            if not len(idx):
+                continue
+            origin = np.repeat(np.stack([x[idx], y[idx], eye_z[h, idx]], axis=1), P, axis=0)
+            target = np.tile(points, (len(idx), 1))
+            blocked = ray_hits(origin, target, lo, hi).reshape(len(idx), P)
+            obstructed[h, m, idx] = blocked.mean(axis=1)
+
+    return SimpleNamespace(fractions=fractions, mats=list(mats), seats=seats,
+                           occupied=occupied, c=c, obstructed=obstructed)
+
+
+def summarize(result):
+    """Per-height rows: occupied seats, worst-mat C percentiles, share of
+    rated seats meeting C_MIN/C_GOOD and mean share of mat area hidden."""
+    rows = []
+    for h, f in enumerate(result.fractions):
+        occ = result.occupied[h]
+        c = result.c[h][:, occ]
+        worst = np.nanmin(np.where(np.isnan(c), np.inf, c), axis=0) if c.size else c
+        rated = worst[np.isfinite(worst)]
+        rows.append({
+            "deploy": float(f), "occupied": int(occ.sum()),
+            "c_min_mm": float(rated.min()) if len(rated) else None,
+            "c_p10_mm": float(np.percentile(rated, 10)) if len(rated) else None,
+            "c_ok_pct": 100.0 * float((rated >= C_MIN).mean()) if len(rated) else None,
+            "c_good_pct": 100.0 * float((rated >= C_GOOD).mean()) if len(rated) else None,
+            "hidden_pct": 100.0 * float(result.obstructed[h][:, occ].mean())
+                          if occ.any() else None,
+        })
+    return rows
+
+
+def summary_batch(param_sets, heights=1):
+    """{column: (variants,) array} of fully deployed sightline summaries."""
+    keys = ("occupied", "c_min_mm", "c_p10_mm", "c_ok_pct", "c_good_pct", "hidden_pct")
+    cols = {k: np.full(len(param_sets), np.nan) for k in keys}
+    for i, params in enumerate(param_sets):
+        last = summarize(analyze(params, heights))[-1]
+        for k in keys:
+            if last[k] is not None:
+                cols[k][i] = last[k]
+    return {"sight_" + k: v for k, v in cols.items()}
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def seat_table(result):
+    """Per-seat columns: worst C per mat over all heights, full-deploy obstruction."""
+    s = result.seats
+    cols = {"end": np.where(s.end == 0, "north", "south"), "row": s.row, "seat": s.seat,
+            "x_ft": s.x / FT, "y_ft": s.y / FT}
+    for m, name in enumerate(result.mats):
+        c = result.c[:, m]
+        cols[f"c_min_mm_{name}"] = np.where(np.isnan(c).all(axis=0), np.nan,
+                                            np.nanmin(np.where(np.isnan(c), np.inf, c), axis=0))
+        cols[f"obstructed_{name}"] = result.obstructed[-1, m]
+    return cols
+
+
+def _color(c, blocked):
+    if blocked:
+        return (120, 0, 120)
+    if np.isnan(c):
+        return (200, 200, 200)
+    if c >= C_GOOD:
+        return (40, 170, 60)
+    if c >= C_MIN:
+        return (230, 190, 40)
+    return (210, 40, 40)
+
+
+def write_heatmap(path, result, cell=6):
+    """PPM: worst C per seat (green good, amber ok, red poor, purple blocked,
+    grey no row in front).  One panel per end, top row at the top."""
+    s = result.seats
+    worst = seat_table(result)
+    c = np.fmin.reduce([worst[f"c_min_mm_{n}"] for n in result.mats])
+    blocked = np.any([worst[f"obstructed_{n}"] > 0 for n in result.mats], axis=0)
+    rows = np.unique(s.row)
+    width = int(s.seat.max()) + 1
+    panel = np.full((len(rows), width, 3), 255, dtype=np.uint8)
+    panels = []
+    for e in (0, 1):
+        img = panel.copy()
+        for i in np.flatnonzero(s.end == e):
+            r = len(rows) - 1 - np.searchsorted(rows, s.row[i])
+            img[r, s.seat[i]] = _color(c[i], blocked[i])
+        panels.append(img)
+    gap = np.full((1, width, 3), 255, dtype=np.uint8)
+    image = np.concatenate([panels[0], gap, panels[1]]).repeat(cell, 0).repeat(cell, 1)
+    with open(path, "wb") as f:
+        f.write(b"P6 %d %d 255\n" % (image.shape[1], image.shape[0]))
+        f.write(np.ascontiguousarray(image).tobytes())
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def print_sightlines(result, elapsed):
+    print("=" * 60)
+    print("  SIGHTLINES (C-values to " + ", ".join(result.mats) + ")")
+    print("=" * 60)
+    print(f"  Seats:        {len(result.seats.x):,}  x  {len(result.mats)} mats  x  "
+          f"{len(result.fractions)} heights in {elapsed * 1000:.0f} ms")
+    print(f"  {'deploy':>7}{'seats':>7}{'C min':>8}{'C p10':>8}"
+          f"{'>=60':>7}{'>=90':>7}{'hidden':>8}")
+    for row in summarize(result):
+        def fmt(v, spec):
+            return format(v, spec) if v is not None else "-"
+        print(f"  {row['deploy']:>6.0%}{row['occupied']:>7}"
+              f"{fmt(row['c_min_mm'], '>8.0f')}{fmt(row['c_p10_mm'], '>8.0f')}"
+              f"{fmt(row['c_ok_pct'], '>6.0f')}%{fmt(row['c_good_pct'], '>6.0f')}%"
+              f"{fmt(row['hidden_pct'], '>7.0f')}%")
+    print("=" * 60)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m facility.sightlines",
+                                     description="Seat-to-mat sightline analysis.")
+    parser.add_argument("overrides", nargs="*", metavar="NAME=VALUE",
+                        help="parameter overrides (feet for lengths)")
+    parser.add_argument("--heights", type=int, default=5,
+                        help="deploy heights from stowed to deployed (default 5)")
+    parser.add_argument("-o", "--output", help="per-seat table (.csv or .parquet)")
+    parser.add_argument("--npz", help="full (height, mat, seat) arrays")
+    parser.add_argument("--ppm", help="worst-C heatmap image")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    result = analyze(cli_params.parse_overrides(args.overrides), args.heights)
+    print_sightlines(result, time.perf_counter() - t0)
+
+    if args.output:
+        writer = open_writer(args.output)
+        writer.write(seat_table(result))
+        writer.close()
+    if args.npz:
+        np.savez_compressed(args.npz, fractions=result.fractions, mats=np.array(result.mats),
+                            c=result.c, obstructed=result.obstructed,
+                            occupied=result.occupied, x=result.seats.x,
+                            y=result.seats.y, row=result.seats.row, end=result.seats.end)
+    if args.ppm:
+        write_heatmap(args.ppm, result)
+
+
+if __name__ == "__main__":
+    main()
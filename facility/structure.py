@@ -0,0 +1,431 @@
+# ============================================================================
+# structure.py — frame analysis of the PLEX FLEX beams and lift columns
+# ============================================================================
+# Nothing in the macro checks what the deployed rows carry.  This builds a
+# plane frame (x-z) for every ElevatingBeam in the scene: the beam spans the
+# pit length on LIFT_COLUMNS telescopic steel columns, fixed at the pit
+# floor (Pit_* z) and rigidly joined to the beam underside, at every deploy
+# height between stowed and deployed (rows move as in facility.kinematics).
+#
+# Load cases (N, mm):
+#   dead          concrete beam self weight
+#   live          LIVE_LOAD over the row's tread (TELE_HORIZ_STEP), rows
+#                 whose seat surface (facility.seating) is at or above
+#                 the floor only
+#   live_pattern  live on alternate spans
+#   sway          SWAY_LOAD along the row (ICC 300 parallel sway)
+#
+# All (beam, height) frames go into one block-diagonal stiffness matrix,
+# assembled as COO triplets and solved for every load case at once - with
+# scipy.sparse (splu) when installed, else as a batched dense NumPy solve
+# of the identical per-frame blocks.  Reported: deflection and span ratio,
+# lift column reactions, Euler buckling utilisation and sway drift.  The
+# columns shorten under load, so reactions are not the rigid-support
+# continuous beam coefficients (0.393 / 1.143 / 0.929 wL over four spans);
+# the solver reproduces those when LIFT_AREA is made very large.
+# annotate() writes per-row results back into the scene as labels and
+# summary_batch() gives facility.sweep its struct_* columns, solving the
+# frames of every variant in the chunk as one block system (NaN for
+# variants whose rows have no deploy stroke - facility.kinematics).
+#
+# Run:
+#   python3 -m facility.structure --heights 5
+#   python3 -m facility.structure TELE_ROWS=20 -o frames.csv --glb loads.glb
+# ============================================================================
+
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+from facility.columnar import open_writer
+from facility.kinematics import plexflex_rig
+from facility.seating import FLUSH, seat_surface_z
+
+try:
+    from scipy.sparse import csc_matrix
+    from scipy.sparse.linalg import splu
+except ImportError:  # Dense per-frame solves instead
+    csc_matrix = splu = None
+
+FT = model.FT
+IN = model.IN
+
+CONCRETE_WEIGHT = 23.6e-6        # N/mm3 (2,400 kg/m3)
+E_CONCRETE = 30_000.0            # MPa
+E_STEEL = 200_000.0              # MPa
+LIFT_COLUMNS = 5                 # per beam, evenly spaced, ends included
+LIFT_AREA = 13.5 * IN ** 2       # HSS 8x8x1/2
+LIFT_INERTIA = 125.0 * IN ** 4
+LIFT_K = 2.0                     # Effective length factor (fixed base, sway)
+LIVE_LOAD = 4.79e-3              # N/mm2 (100 psf, assembly seating)
+SWAY_LOAD = 24 * 4.448 / FT      # N/mm (24 plf parallel to the row)
+SEGMENTS = 4                     # beam elements per span
+DEFLECTION_LIMIT = 360           # span / live load deflection
+DENSE_BLOCK = 64                 # frames per batched dense solve (no scipy)
+
+CASES = ("dead", "live", "live_pattern", "sway")
+
+# ============================================================================
+# ELEMENTS
+# ============================================================================
+
+def element_stiffness(E, A, I, length, angle):
+    """(n, 6, 6) global stiffness of 2D frame elements (ux, uz, rotation)."""
+    E, A, I, length, angle = np.broadcast_arrays(E, A, I, length, angle)
+    a = E * A / length
+    b = 12 * E * I / length ** 3
+    c = 6 * E * I / length ** 2
+    d = 4 * E * I / length
+    e = 2 * E * I / length
+    z = np.zeros_like(a)
+    k = np.stack([
+        np.stack([a, z, z, -a, z, z], -1),
+        np.stack([z, b, c, z, -b, c], -1),
+        np.stack([z, c, d, z, -c, e], -1),
+        np.stack([-a, z, z, a, z, z], -1),
+        np.stack([z, -b, -c, z, b, -c], -1),
+        np.stack([z, c, e, z, -c, d], -1),
+    ], -2)
+    cos, sin = np.cos(angle), np.sin(angle)
+    t = np.zeros(a.shape + (6, 6))
+    for o in (0, 3):
+        t[..., o, o] = t[..., o + 1, o + 1] = cos
+        t[..., o, o + 1] = sin
+        t[..., o + 1, o] = -sin
+        t[..., o + 2, o + 2] = 1.0
+    return np.swapaxes(t, -1, -2) @ k @ t
+
+# ============================================================================
+# FRAME MODEL
+# ============================================================================
+
+def frame_model(params=None, heights=5):
+    """Geometry, section properties and loads of every (height, beam) frame."""
+    scene = model.build_facility(params)
+    p = scene.params
+    rig = plexflex_rig(scene=scene)
+    boxes = {b.name: b for b in scene.boxes}
+    beams = [boxes[name] for name in rig.names]
+    pit_floor = {0: boxes["Pit_North"].z, 1: boxes["Pit_South"].z}
+
+    fractions = np.linspace(0.0, 1.0, heights) if heights > 1 else np.ones(1)
+    drop = (1.0 - fractions)[:, None] * rig.stroke                  # (H, 1) below deployed
+    z = rig.z_stowed[None, :] + fractions[:, None] * rig.stroke     # (H, B) beam base
+    seat = seat_surface_z(p, rig.row)[None, :] - drop               # (H, B) as seated
+    floor = np.array([pit_floor[e] for e in rig.end])[None, :]
+
+    m = SimpleNamespace(params=p, scene=scene, rig=rig, fractions=fractions)
+    m.length = np.array([b.length for b in beams])
+    m.x0 = np.array([b.x for b in beams])
+    m.area = np.array([b.width * b.height for b in beams])
+    m.inertia = np.array([b.width * b.height ** 3 / 12 for b in beams])
+    m.column_length = np.maximum(z - floor, 1.0)                    # (H, B)
+    m.occupied = seat >= -FLUSH
+    m.dead = CONCRETE_WEIGHT * m.area                                # (B,) N/mm
+    m.live = np.where(m.occupied, LIVE_LOAD * p.TELE_HORIZ_STEP, 0.0)  # (H, B)
+    m.sway = np.where(m.occupied, SWAY_LOAD, 0.0)
+    return m
+
+
+def _topology():
+    """Node and element tables shared by every frame (beam nodes first)."""
+    spans = LIFT_COLUMNS - 1
+    beam_nodes = spans * SEGMENTS + 1
+    tops = np.arange(0, beam_nodes, SEGMENTS)                       # Column tops
+    bases = beam_nodes + np.arange(LIFT_COLUMNS)                     # Fixed
+    beam_el = np.stack([np.arange(beam_nodes - 1), np.arange(1, beam_nodes)], 1)
+    column_el = np.stack([bases, tops], 1)
+    return beam_nodes, tops, bases, beam_el, column_el
+
+
+def solve(m):
+    """Displacements and column base reactions for every frame and case.
+
+    The frames are the elements of m.column_length - (H, B) for one model,
+    (frames,) for summary_batch's stack of variants - and the per-beam
+    arrays (length, area, inertia, dead) broadcast against it.  Returns a
+    namespace: ux, uz (..., beam nodes, cases) and reactions rx, rz,
+    moment (..., LIFT_COLUMNS, cases).
+    """
+    shape = m.column_length.shape
+    frames = m.column_length.size
+
+    def per_frame(a):
+        return np.broadcast_to(a, shape).reshape(frames)
+
+    beam_nodes, tops, bases, beam_el, column_el = _topology()
+    nodes = beam_nodes + LIFT_COLUMNS
+    ndof = 3 * nodes
+    seg = per_frame(m.length) / (SEGMENTS * (LIFT_COLUMNS - 1))     # (frames,)
+
+    # ---- Element matrices: (frames, elements, 6, 6) ----
+    k_beam = element_stiffness(E_CONCRETE, per_frame(m.area), per_frame(m.inertia),
+                               seg, 0.0)                             # (frames, 6, 6)
+    k_beam = np.broadcast_to(k_beam[:, None], (frames, len(beam_el), 6, 6))
+    k_col = element_stiffness(E_STEEL, LIFT_AREA, LIFT_INERTIA,
+                              per_frame(m.column_length), np.pi / 2)
+    k_col = np.broadcast_to(k_col[:, None], (frames, LIFT_COLUMNS, 6, 6))
+    k_el = np.concatenate([k_beam, k_col], axis=1)
+    conn = np.concatenate([beam_el, column_el])
+    dofs = (3 * conn[:, :, None] + np.arange(3)).reshape(len(conn), 6)
+
+    # ---- Equivalent nodal loads: (frames, ndof, cases) ----
+    live = per_frame(m.live)[:, None]
+    q = np.zeros((frames, len(beam_el), len(CASES)))                 # Downward N/mm
+    q[..., 0] = per_frame(m.dead)[:, None]
+    q[..., 1] = live
+    pattern = (np.arange(len(beam_el)) // SEGMENTS) % 2 == 0
+    q[..., 2] = live * pattern
+    s = np.zeros_like(q)                                             # Along +x N/mm
+    s[..., 3] = per_frame(m.sway)[:, None]
+    L = seg[:, None, None]
+    f_el = np.zeros((frames, len(beam_el), 6, len(CASES)))
+    f_el[..., 0, :] = f_el[..., 3, :] = s * L / 2
+    f_el[..., 1, :] = f_el[..., 4, :] = -q * L / 2
+    f_el[..., 2, :] = -q * L ** 2 / 12
+    f_el[..., 5, :] = q * L ** 2 / 12
+    f = np.zeros((frames, ndof, len(CASES)))
+    np.add.at(f, (slice(None), dofs[:len(beam_el)]), f_el)
+
+    # ---- Assemble free-free block, solve ----
+    fixed = np.zeros(ndof, dtype=bool)
+    fixed[(3 * bases[:, None] + np.arange(3)).ravel()] = True
+    free = np.flatnonzero(~fixed)
+    nfree = len(free)
+    local = np.full(ndof, -1)
+    local[free] = np.arange(nfree)
+
+    rows = np.broadcast_to(dofs[:, :, None], (len(conn), 6, 6)).ravel()
+    cols = np.broadcast_to(dofs[:, None, :], (len(conn), 6, 6)).ravel()
+    vals = k_el.reshape(frames, -1)
+    keep = (local[rows] >= 0) & (local[cols] >= 0)
+    r, c, v = local[rows[keep]], local[cols[keep]], vals[:, keep]
+    rhs = f[:, free]                                                 # (frames, nfree, cases)
+
+    if splu is not None:
+        offset = (np.arange(frames) * nfree)[:, None]
+        K = csc_matrix((v.ravel(), ((offset + r).ravel(), (offset + c).ravel())),
+                       shape=(frames * nfree, frames * nfree))
+        u_free = splu(K).solve(rhs.reshape(frames * nfree, -1)).reshape(rhs.shape)
+    else:
+        # Same (r, c) pattern in every frame: sort once, sum duplicates per block
+        flat = r * nfree + c
+        order = np.argsort(flat, kind="stable")
+        cells, starts = np.unique(flat[order], return_index=True)
+        u_free = np.empty_like(rhs)
+        for start in range(0, frames, DENSE_BLOCK):                  # Bounded memory
+            stop = min(start + DENSE_BLOCK, frames)
+            K = np.zeros((stop - start, nfree * nfree))
+            K[:, cells] = np.add.reduceat(v[start:stop, order], starts, axis=1)
+            u_free[start:stop] = np.linalg.solve(K.reshape(-1, nfree, nfree),
+                                                 rhs[start:stop])
+
+    u = np.zeros((frames, ndof, len(CASES)))
+    u[:, free] = u_free
+
+    # ---- Column base reactions from the column elements ----
+    col_dofs = dofs[len(beam_el):]                                   # (columns, 6)
+    d_col = u[:, col_dofs]                                           # (frames, cols, 6, cases)
+    k_cols = k_el[:, len(beam_el):]                                  # (frames, cols, 6, 6)
+    end_forces = k_cols @ d_col                                      # Base = first 3
+    reaction = end_forces[:, :, :3].reshape(shape + (LIFT_COLUMNS, 3, len(CASES)))
+
+    u = u.reshape(shape + (nodes, 3, len(CASES)))
+    return SimpleNamespace(ux=u[..., :beam_nodes, 0, :], uz=u[..., :beam_nodes, 1, :],
+                           rx=reaction[..., 0, :], rz=reaction[..., 1, :],
+                           moment=reaction[..., 2, :],
+                           applied=f.reshape(shape + (nodes, 3, len(CASES))))
+
+# ============================================================================
+# RESULTS
+# ============================================================================
+
+def sag_between_columns(uz):
+    """Beam deflection relative to the chord between adjacent column tops."""
+    nodes = uz.shape[-2]
+    i = np.arange(nodes)
+    span = np.minimum(i // SEGMENTS, LIFT_COLUMNS - 2)
+    t = ((i - span * SEGMENTS) / SEGMENTS)[:, None]
+    chord = (uz[..., span * SEGMENTS, :] * (1 - t)
+             + uz[..., (span + 1) * SEGMENTS, :] * t)
+    return uz - chord
+
+
+def frame_results(m, sol):
+    """Governing results of every frame (shaped like m.column_length)."""
+    span = m.length / (LIFT_COLUMNS - 1)
+    sag = sag_between_columns(sol.uz)
+    service = sag[..., 0] + sag[..., 1]                              # Dead + live
+    live = np.minimum(sag[..., 1], sag[..., 2])                      # Worst live pattern
+    axial = np.maximum(sol.rz[..., 0] + sol.rz[..., 1], sol.rz[..., 0] + sol.rz[..., 2])
+    euler = np.pi ** 2 * E_STEEL * LIFT_INERTIA / (LIFT_K * m.column_length) ** 2
+
+    r = SimpleNamespace(model=m, solution=sol)
+    r.deflection = -service.min(axis=-1)                             # mm sag
+    live_defl = -live.min(axis=-1)
+    r.span_ratio = np.where(live_defl > 1e-9, span / np.maximum(live_defl, 1e-9), np.inf)
+    r.column_load = axial.max(axis=-1)                               # N
+    r.utilization = r.column_load / euler
+    r.drift = np.abs(sol.ux[..., 3]).max(axis=-1)                    # mm under sway
+    applied = -sol.applied[..., 1, :].sum(axis=-2)                   # Vertical load per case
+    r.equilibrium = float(np.abs(sol.rz.sum(axis=-2) - applied).max())
+    return r
+
+
+def analyze(params=None, heights=5):
+    """Frame model plus per-(height, beam) results under dead + live."""
+    t0 = time.perf_counter()
+    m = frame_model(params, heights)
+    r = frame_results(m, solve(m))
+    r.elapsed = time.perf_counter() - t0
+    return r
+
+
+def summarize(r):
+    """Per-height rows of governing results over all beams."""
+    rows = []
+    for h, f in enumerate(r.model.fractions):
+        rows.append({
+            "deploy": float(f), "loaded_rows": int(r.model.occupied[h].sum()),
+            "deflection_mm": float(r.deflection[h].max()),
+            "span_ratio": float(r.span_ratio[h].min()),
+            "column_kN": float(r.column_load[h].max() / 1000),
+            "utilization": float(r.utilization[h].max()),
+            "drift_mm": float(r.drift[h].max()),
+        })
+    return rows
+
+
+FRAME_FIELDS = ("length", "area", "inertia", "column_length", "dead", "live", "sway")
+
+
+def summary_batch(param_sets, heights=2):
+    """{column: (variants,) array} of governing results over the deploy range.
+
+    Each variant's model is built once; the frames of all variants (every
+    beam at every height) then go into one block-diagonal solve.  Variants
+    whose rows have no deploy stroke get NaN.
+    """
+    n = len(param_sets)
+    models, owner = [], []
+    for i, params in enumerate(param_sets):
+        try:
+            models.append(frame_model(params, heights))
+        except ValueError:
+            continue
+        owner.append(i)
+
+    results = {"deflection_mm": np.maximum, "span_ratio": np.minimum,
+               "column_kN": np.maximum, "utilization": np.maximum, "drift_mm": np.maximum}
+    cols = {k: np.full(n, np.nan) for k in results}
+    if models:
+        batch = SimpleNamespace(**{
+            field: np.concatenate([np.broadcast_to(getattr(m, field), m.column_length.shape)
+                                   .ravel() for m in models])
+            for field in FRAME_FIELDS})
+        r = frame_results(batch, solve(batch))
+        variant = np.repeat(owner, [m.column_length.size for m in models])
+        values = {"deflection_mm": r.deflection, "span_ratio": r.span_ratio,
+                  "column_kN": r.column_load / 1000, "utilization": r.utilization,
+                  "drift_mm": r.drift}
+        for k, reduce in results.items():
+            out = np.full(n, np.inf if reduce is np.minimum else -np.inf)
+            reduce.at(out, variant, values[k])
+            cols[k][owner] = out[owner]
+    return {"struct_" + k: v for k, v in cols.items()}
+
+
+def frame_table(r):
+    """Per-(height, beam) columns for a columnar file."""
+    m = r.model
+    H, B = r.deflection.shape
+    return {
+        "deploy": np.repeat(m.fractions, B),
+        "beam": np.tile(np.array(m.rig.names), H),
+        "column_length_ft": (m.column_length / FT).ravel(),
+        "loaded": m.occupied.ravel(),
+        "deflection_mm": r.deflection.ravel(),
+        "span_ratio": r.span_ratio.ravel(),
+        "column_kN": (r.column_load / 1000).ravel(),
+        "utilization": r.utilization.ravel(),
+        "drift_mm": r.drift.ravel(),
+    }
+
+
+def annotate(backend, r):
+    """Label each deployed beam with its deflection, column load and utilisation."""
+    m = r.model
+    for b, name in enumerate(m.rig.names):
+        x = m.x0[b] + m.length[b] / 2
+        y = m.rig.y[b]
+        z = m.rig.z_deployed[b] + m.rig.height[b]
+        text = (f"{r.deflection[-1, b]:.1f} mm / {r.column_load[-1, b] / 1000:.0f} kN"
+                f" / {r.utilization[-1, b]:.0%}")
+        backend.add_label(name.replace("ElevatingBeam_", "Label_Load_"), text, x, y, z)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def print_structure(r):
+    m = r.model
+    H, B = r.deflection.shape
+    print("=" * 60)
+    print("  PLEX FLEX FRAME ANALYSIS")
+    print("=" * 60)
+    print(f"  Frames:       {H * B} ({B} beams x {H} heights), {LIFT_COLUMNS} lift "
+          f"columns per beam, {'scipy.sparse' if splu is not None else 'numpy'} "
+          f"in {r.elapsed * 1000:.0f} ms")
+    print(f"  Loads:        live {LIVE_LOAD * 1e3:.2f} kPa x "
+          f"{m.params.TELE_HORIZ_STEP / FT:g}' tread, sway {SWAY_LOAD:.2f} N/mm")
+    print(f"  {'deploy':>7}{'rows':>6}{'defl mm':>9}{'L/d':>7}{'col kN':>8}"
+          f"{'buckle':>8}{'drift':>8}")
+    for row in summarize(r):
+        ratio = f"{row['span_ratio']:.0f}" if np.isfinite(row["span_ratio"]) else "-"
+        print(f"  {row['deploy']:>6.0%}{row['loaded_rows']:>6}{row['deflection_mm']:>9.1f}"
+              f"{ratio:>7}{row['column_kN']:>8.0f}{row['utilization']:>7.0%} "
+              f"{row['drift_mm']:>7.1f}")
+    worst = summarize(r)
+    if min(row["span_ratio"] for row in worst) < DEFLECTION_LIMIT:
+        print(f"  WARNING:      live deflection exceeds span/{DEFLECTION_LIMIT}")
+    if max(row["utilization"] for row in worst) > 1:
+        print("  WARNING:      lift columns exceed their Euler buckling load")
+    print(f"  Equilibrium:  {r.equilibrium:.2e} N max residual")
+    print("=" * 60)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m facility.structure",
+                                     description="Frame analysis of the PLEX FLEX beams.")
+    parser.add_argument("overrides", nargs="*", metavar="NAME=VALUE",
+                        help="parameter overrides (feet for lengths)")
+    parser.add_argument("--heights", type=cli_params.positive_int, default=5,
+                        help="deploy heights from stowed to deployed (default 5)")
+    parser.add_argument("-o", "--output", help="per-frame table (.csv or .parquet)")
+    parser.add_argument("--glb", help="model with result labels on the beams (.glb)")
+    args = parser.parse_args(argv)
+
+    params = cli_params.parse_overrides(args.overrides)
+    try:
+        r = analyze(params, args.heights)
+    except ValueError as e:
+        parser.error(str(e))
+    print_structure(r)
+
+    if args.output:
+        writer = open_writer(args.output)
+        writer.write(frame_table(r))
+        writer.close()
+    if args.glb:
+        from facility.gltf import export_glb
+        annotate(r.model.scene, r)
+        export_glb(r.model.scene, args.glb)
+        print(f"  Saved:        {args.glb}")
+
+
+if __name__ == "__main__":
+    main()
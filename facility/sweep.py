@@ -0,0 +1,362 @@
+# ============================================================================
+# sweep.py — parallel parametric sweep over the BUILDING PARAMETERS block
+# ============================================================================
+# Evaluates the cartesian product of parameter ranges without building a
+# scene per variant: the model's own facility_layout() and sections run on
+# NumPy arrays (one element per variant) - the sections once per group of
+# variants with the same object set (mats, column frames, beam rows) - so
+# thousands of designs cost a handful of passes.  Counts, quantities and
+# the mat fit are measured on the boxes the sections draw.  Chunks are
+# spread across a process pool and streamed to a columnar file.
+#
+# mats_fit uses facility.optimize's rules on the macro's hand layout, which
+# puts mats 1-2 at MAT_OFFSET_Y (6') - inside the 12' south pit.  It is
+# False for every variant until a sweep moves MAT_OFFSET_Y or
+# TELE_PIT_WIDTH far enough; mat_slack_ft says by how much each one misses.
+#
+# Run:
+#   python3 -m facility.sweep --range SUPPORT_DEPTH=20:30:1 \
+#       --range TELE_ROWS=12:24:2 --set MAT_GAP=5 -o sweep.parquet
+#
+# Output: .parquet (needs pyarrow) or .csv, one row per variant, lengths in
+# feet and areas in SF.  --takeoff adds the full per-material quantity
+# takeoff (facility.takeoff), which builds each variant's scene,
+# --sightlines the fully deployed seat C-value summary (facility.sightlines)
+# and --structure the governing beam/lift column results (facility.structure).
+# ============================================================================
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+from facility.columnar import open_writer
+from facility.seating import capacity as seat_capacity
+from facility.sightlines import summary_batch as sightline_batch
+from facility.structure import summary_batch as structure_batch
+from facility.optimize import KEEP_OUT, layout_slack
+from facility.takeoff import MATERIAL_NAMES, measure, scene_codes, takeoff_batch
+
+FT = model.FT
+SF = FT * FT
+CY = (3 * FT) ** 3
+
+DEFAULT_CHUNK = 20000
+TAKEOFF_CHUNK = 1000   # Takeoff builds scenes - smaller tasks keep the pool busy
+SIGHTLINE_CHUNK = 100  # Sightlines cast rays per seat
+STRUCTURE_CHUNK = 500  # Structure solves every beam frame
+
+# Quantity columns: facility.takeoff materials summed per variant (pit
+# excavation is the modeled void, not the takeoff's cast shell)
+QUANTITY_COLUMNS = {
+    "slab_concrete_cy": ("slab_concrete", "footing_concrete"),
+    "beam_concrete_cy": ("beam_concrete",),
+    "ext_wall_sf": ("metal_wall_panel",),
+    "roof_sf": ("roof_panel",),
+}
+
+# ============================================================================
+# VARIANT GRID
+# ============================================================================
+
+def grid_size(axes):
+    """Number of variants in the cartesian product of `axes`."""
+    return int(np.prod([len(values) for _, values in axes], dtype=np.int64))
+
+
+def grid_params(axes, start, stop, fixed=None):
+    """Parameter namespace of arrays for variants [start, stop) of the grid.
+
+    `axes` is a list of (name, values) in model units; `fixed` overrides
+    the remaining parameters for every variant.
+    """
+    base = model.default_params()
+    base.update(fixed or {})
+    n = stop - start
+    cols = {name: np.full(n, value) for name, value in base.items()}
+    if axes:
+        shape = [len(values) for _, values in axes]
+        index = np.unravel_index(np.arange(start, stop), shape)
+        for (name, values), idx in zip(axes, index):
+            cols[name] = np.asarray(values)[idx]
+    return SimpleNamespace(**cols)
+
+# ============================================================================
+# VECTORIZED EVALUATION
+# ============================================================================
+
+class ArrayRecorder:
+    """Backend that keeps each box with (n,) arrays - one value per variant."""
+
+    def __init__(self, n):
+        self.n = n
+        self.boxes = []
+
+    def add_box(self, name, length, width, height, x, y, z, color):
+        values = (np.broadcast_to(np.asarray(v, dtype=float), (self.n,))
+                  for v in (length, width, height, x, y, z))
+        self.boxes.append(model.Box(name, *values, color))
+
+    def add_label(self, name, text, x, y, z):
+        pass
+
+    def recompute(self):
+        pass
+
+
+def shape_groups(p, L):
+    """Yield (key, variant indices) per distinct object set.
+
+    The sections loop over mats, column frames and beam rows; every other
+    parameter only moves or sizes boxes, so one section run per group
+    covers all of its variants.
+    """
+    keys = np.stack([np.asarray(L.mat_count), np.asarray(L.col_frames),
+                     np.asarray(p.TELE_ROWS)], axis=1).astype(np.int64)
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    for g, key in enumerate(unique):
+        yield key, np.flatnonzero(inverse.ravel() == g)
+
+
+def section_boxes(p, key, idx):
+    """Run every model section for variants `idx` (one shape group)."""
+    sub = SimpleNamespace(**{name: np.asarray(values)[idx]
+                             for name, values in vars(p).items()})
+    sub.TELE_ROWS = int(key[2])
+    L = model.facility_layout(sub)
+    L.mat_count, L.col_frames = int(key[0]), int(key[1])
+    recorder = ArrayRecorder(len(idx))
+    with model.drawing_into(recorder):
+        for _key, _title, section in model.SECTIONS:
+            section(sub, L)
+    return sub, L, recorder
+
+
+def scene_columns(p, L):
+    """Columns measured on the boxes the sections actually build."""
+    n = len(p.BLDG_LENGTH)
+    r = {"box_count": np.zeros(n, dtype=np.int64)}
+    for name in ("slab_concrete_cy", "pit_excavation_cy", "beam_concrete_cy",
+                 "ext_wall_sf", "roof_sf", "mat_slack_ft", "mats_east", "mats_north",
+                 "mats_south"):
+        r[name] = np.full(n, np.nan)
+    for key, idx in shape_groups(p, L):
+        sub, SL, recorder = section_boxes(p, key, idx)
+        boxes = recorder.boxes
+        r["box_count"][idx] = len(boxes)
+
+        codes = scene_codes(recorder)
+        for column, materials in QUANTITY_COLUMNS.items():
+            rows = [i for i, code in enumerate(codes) if MATERIAL_NAMES[code] in materials]
+            dims = np.stack([np.stack([boxes[i].length, boxes[i].width, boxes[i].height],
+                                      axis=1) for i in rows])
+            qty = measure(np.repeat(codes[rows], len(idx)), dims.reshape(-1, 3))["quantity"]
+            r[column][idx] = qty.reshape(len(rows), len(idx)).sum(axis=0)
+        r["pit_excavation_cy"][idx] = sum(b.length * b.width * b.height for b in boxes
+                                          if model.object_category(b.name) == "pit") / CY
+
+        # Same rule as facility.optimize: clearance to walls, divider,
+        # columns and pits, MAT_GAP between mats
+        mat_boxes = [b for b in boxes if model.object_category(b.name) == "mat"]
+        if mat_boxes:
+            r["mats_east"][idx] = np.max([b.x + b.length for b in mat_boxes], axis=0)
+            r["mats_north"][idx] = np.max([b.y + b.width for b in mat_boxes], axis=0)
+            r["mats_south"][idx] = np.min([b.y for b in mat_boxes], axis=0)
+        mats = [(b.x, b.y) for b in mat_boxes]
+        keep_out = [(b.x, b.y, b.x + b.length, b.y + b.width) for b in boxes
+                    if model.object_category(b.name) in KEEP_OUT]
+        region = (sub.EXT_WALL_THICK, sub.EXT_WALL_THICK,
+                  SL.divider_x, sub.BLDG_WIDTH - sub.EXT_WALL_THICK)
+        r["mat_slack_ft"][idx] = layout_slack(mats, sub.MAT_SIZE, sub.MAT_GAP,
+                                              region, keep_out) / FT
+    return r
+
+
+def evaluate(p):
+    """Compact result columns for a namespace of parameter arrays."""
+    L = model.facility_layout(p)
+    S = scene_columns(p, L)
+    r = {}
+
+    # ---- Mat fit (clearances in feet; negative = overlap, NaN = no mats) ----
+    mats_east, mats_north, mats_south = S.pop("mats_east"), S.pop("mats_north"), S.pop("mats_south")
+    r["mat_area_width_ft"] = L.mat_area_width / FT
+    r["mats_placed"] = np.asarray(L.mat_count).astype(np.int64)
+    r["mat_clear_divider_ft"] = (L.divider_x - mats_east) / FT
+    r["mat_clear_north_wall_ft"] = (p.BLDG_WIDTH - p.EXT_WALL_THICK - mats_north) / FT
+    r["mat_clear_pit_south_ft"] = (mats_south - (L.pit_south_y + p.TELE_PIT_WIDTH)) / FT
+    r["mat_clear_pit_north_ft"] = (L.pit_north_y - mats_north) / FT
+    r["mat_slack_ft"] = S.pop("mat_slack_ft")
+    r["mats_fit"] = (r["mats_placed"] == p.MAT_COUNT) & (r["mat_slack_ft"] >= -1e-6 / FT)
+
+    # ---- Support rooms ----
+    room_depth = p.SUPPORT_DEPTH - p.INT_WALL_THICK
+    r["area_office_sf"] = room_depth * p.OFFICE_WIDTH / SF
+    r["area_locker_m_sf"] = room_depth * p.LOCKER_M_WIDTH / SF
+    r["area_locker_w_sf"] = room_depth * p.LOCKER_W_WIDTH / SF
+    r["area_weight_sf"] = room_depth * p.WEIGHT_WIDTH / SF
+    r["area_mech_sf"] = room_depth * L.mech_height / SF
+    r["mech_height_ft"] = L.mech_height / FT
+    r["rooms_fit"] = L.mech_height >= 0
+
+    # ---- PLEX FLEX pit and beam envelope ----
+    pit_east = p.EXT_WALL_THICK + p.TELE_PIT_LENGTH
+    stack = (p.TELE_ROWS - 1) * p.TELE_HORIZ_STEP
+    north_min_y = L.pit_north_y - stack
+    south_max_y = L.pit_south_y + stack + L.beam_width
+    r["pit_east_x_ft"] = pit_east / FT
+    r["pit_clear_divider_ft"] = (L.divider_x - pit_east) / FT
+    r["beam_top_z_ft"] = (p.TELE_STOW_Z + (p.TELE_ROWS - 1) * p.TELE_BEAM_HEIGHT
+                          + p.TELE_BEAM_HEIGHT * 0.9) / FT
+    r["beam_north_min_y_ft"] = north_min_y / FT
+    r["beam_south_max_y_ft"] = south_max_y / FT
+    r["beam_stacks_clear_ft"] = (north_min_y - south_max_y) / FT
+
+    # ---- Quantity totals (as built by the sections) ----
+    r.update(S)
+
+    # ---- Seating (facility.seating) ----
+    seats = seat_capacity(p)
+    r["seat_capacity"] = seats["seat_capacity"]
+    r["seat_rows_usable"] = seats["usable_rows"]
+    r["wheelchair_spaces"] = seats["wheelchair_spaces"]
+    return r
+
+
+def quantity_batch(param_sets):
+    """Full per-material takeoff as qty_* columns."""
+    return {"qty_" + material: qty for material, qty in takeoff_batch(param_sets).items()}
+
+
+# Per-variant analyses beyond the layout: name -> (summary_batch, chunk).
+# A summary_batch takes a list of parameter dicts and returns
+# {column: (variants,) array}; chunk is the task size that keeps the pool busy.
+EXTRAS = {
+    "takeoff": (quantity_batch, TAKEOFF_CHUNK),
+    "sightlines": (sightline_batch, SIGHTLINE_CHUNK),
+    "structure": (structure_batch, STRUCTURE_CHUNK),
+}
+
+
+def evaluate_chunk(axes, start, stop, fixed=None, extras=None):
+    """Evaluate variants [start, stop); returns {column: array} in file order.
+
+    extras maps a name to a summary_batch (see EXTRAS); each one gets the
+    chunk's variants as parameter dicts and adds its columns, in order.
+    """
+    p = grid_params(axes, start, stop, fixed)
+    cols = {"variant": np.arange(start, stop)}
+    for name, _ in axes:
+        cols[name] = cli_params.from_model(name, getattr(p, name))
+    for name, values in evaluate(p).items():
+        cols[name] = np.broadcast_to(values, (stop - start,))
+    if extras:
+        param_sets = [{name: getattr(p, name)[i].item() for name in model.PARAM_NAMES}
+                      for i in range(stop - start)]
+        for batch in extras.values():
+            cols.update(batch(param_sets))
+    return cols
+
+# ============================================================================
+# SWEEP DRIVER
+# ============================================================================
+
+def iter_chunks(total, chunk):
+    for start in range(0, total, chunk):
+        yield start, min(start + chunk, total)
+
+
+def run_sweep(axes, fixed=None, workers=None, chunk=DEFAULT_CHUNK, extras=None):
+    """Yield result column chunks in variant order.
+
+    workers=1 evaluates inline; otherwise chunks go to a process pool.
+    """
+    total = grid_size(axes)
+    spans = list(iter_chunks(total, chunk))
+    if workers == 1 or len(spans) <= 1:
+        for start, stop in spans:
+            yield evaluate_chunk(axes, start, stop, fixed, extras)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(evaluate_chunk, axes, start, stop, fixed, extras)
+                   for start, stop in spans]
+        for future in futures:
+            yield future.result()
+
+
+def sweep_to_file(path, axes, fixed=None, workers=None, chunk=DEFAULT_CHUNK, extras=None):
+    """Stream a full sweep into `path`.
+
+    Returns (variants, mats_fit count, best mat_slack_ft over all variants).
+    """
+    writer = open_writer(path)
+    rows = fits = 0
+    best = -np.inf
+    try:
+        for cols in run_sweep(axes, fixed, workers, chunk, extras):
+            writer.write(cols)
+            rows += len(cols["variant"])
+            fits += int(np.count_nonzero(cols["mats_fit"]))
+            best = max(best, float(np.nanmax(cols["mat_slack_ft"], initial=-np.inf)))
+    finally:
+        writer.close()
+    return rows, fits, best
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel parametric sweep over the building parameters.",
+                                     prog="python3 -m facility.sweep")
+    parser.add_argument("--range", action="append", default=[], metavar="NAME=SPEC",
+                        help="swept parameter: start:stop:step or a,b,c (feet for lengths)")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="fixed override applied to every variant")
+    parser.add_argument("-o", "--output", default="sweep.csv",
+                        help="output file (.parquet or .csv)")
+    parser.add_argument("--workers", type=cli_params.positive_int, default=os.cpu_count(),
+                        help="process pool size (1 = run inline)")
+    parser.add_argument("--chunk", type=cli_params.positive_int, default=None,
+                        help=f"variants per worker task (default {DEFAULT_CHUNK}, "
+                             f"{TAKEOFF_CHUNK} with --takeoff, "
+                             f"{SIGHTLINE_CHUNK} with --sightlines, "
+                             f"{STRUCTURE_CHUNK} with --structure)")
+    parser.add_argument("--takeoff", action="store_true",
+                        help="add full per-material takeoff columns (builds each variant)")
+    parser.add_argument("--sightlines", action="store_true",
+                        help="add deployed seat C-value and obstruction columns")
+    parser.add_argument("--structure", action="store_true",
+                        help="add beam deflection and lift column load columns")
+    args = parser.parse_args(argv)
+
+    axes = [cli_params.parse_range(text) for text in args.range]
+    fixed = cli_params.parse_overrides(args.set)
+
+    t0 = time.perf_counter()
+    chosen = [name for name in EXTRAS if getattr(args, name)]
+    extras = {name: EXTRAS[name][0] for name in chosen}
+    chunk = args.chunk or min((EXTRAS[name][1] for name in chosen), default=DEFAULT_CHUNK)
+    rows, fits, best = sweep_to_file(args.output, axes, fixed, args.workers, chunk, extras)
+    elapsed = time.perf_counter() - t0
+
+    print("=" * 60)
+    print("  PARAMETER SWEEP")
+    print("=" * 60)
+    for name, values in axes:
+        print(f"  {name:<18} {len(values)} values")
+    print(f"  Variants:     {rows:,}")
+    print(f"  Mats fit:     {fits:,} (best spare clearance {best:+.1f}')")
+    print(f"  Time:         {elapsed:.2f} s ({rows / max(elapsed, 1e-9):,.0f} variants/s)")
+    print(f"  Output:       {args.output}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
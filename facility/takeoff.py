@@ -0,0 +1,248 @@
+# ============================================================================
+# takeoff.py — quantity takeoff for pricing (SRM Concrete, Summer Time Metals)
+# ============================================================================
+# Classifies every generated box by material and computes its volume, area
+# and weight in one vectorized pass over the scene's struct-of-arrays
+# (names + (n, 3) dims).  Emits per-material totals in each material's
+# pricing unit (CY / SF / LB / EA) plus a per-object ledger.
+#
+# Quantities are gross, as modeled: footings lap the slab edge and the
+# corners, pits are priced as a cast shell (PIT_WALL_THICK walls and floor)
+# around the modeled void, steel columns by weight per foot.
+#
+# takeoff_batch() does the same for many parameter sets at once (one
+# bincount over all variants) so the sweep can carry full takeoffs:
+#   python3 -m facility.sweep --range SUPPORT_DEPTH=20:30:1 --takeoff
+#
+# Run:
+#   python3 -m facility.takeoff --ledger ledger.csv --totals totals.json
+# ============================================================================
+
+import argparse
+import json
+from collections import namedtuple
+
+import numpy as np
+
+import wrestling_facility_phase1 as model
+from facility import params as cli_params
+from facility.columnar import open_writer
+
+FT = model.FT
+IN = model.IN
+CF = FT ** 3
+CY = 27 * CF
+SF = FT * FT
+
+PIT_WALL_THICK = 12 * IN   # Cast-in-place pit walls and floor
+
+# basis: how the pricing quantity is measured
+#   volume - box volume (CY)         shell - pit shell concrete (CY)
+#   plan   - top area l x w (SF)     face  - wall face, longest side x height (SF)
+#   weight - LB (density lb/ft3, or lb per foot along the longest side)
+#   count  - EA
+Material = namedtuple("Material", "contractor unit basis density lb_per_ft")
+
+MATERIALS = {
+    "slab_concrete":      Material("SRM Concrete", "CY", "volume", 150, None),
+    "footing_concrete":   Material("SRM Concrete", "CY", "volume", 150, None),
+    "pit_concrete":       Material("SRM Concrete", "CY", "shell", 150, None),
+    "beam_concrete":      Material("PLEX FLEX", "CY", "volume", 115, None),  # Lightweight
+    "steel_flap":         Material("PLEX FLEX", "LB", "weight", 490, None),
+    "steel_column":       Material("Summer Time Metals", "LB", "weight", None, 31),  # W8x31
+    "steel_ridge":        Material("Summer Time Metals", "LB", "weight", None, 26),  # W12x26
+    "metal_wall_panel":   Material("Summer Time Metals", "SF", "face", None, None),
+    "roof_panel":         Material("Summer Time Metals", "SF", "plan", None, None),
+    "interior_partition": Material("Owner / TBD", "SF", "face", None, None),
+    "mat_surface":        Material("Owner / TBD", "SF", "plan", None, None),
+    "floor_finish":       Material("Owner / TBD", "SF", "plan", None, None),
+    "door":               Material("Owner / TBD", "EA", "count", None, None),
+    "other":              Material("Owner / TBD", "EA", "count", None, None),
+}
+MATERIAL_NAMES = list(MATERIALS)
+_CODE = {name: i for i, name in enumerate(MATERIAL_NAMES)}
+
+CATEGORY_MATERIAL = {
+    "slab": "slab_concrete",
+    "footing": "footing_concrete",
+    "pit": "pit_concrete",
+    "beam": "beam_concrete",
+    "flap": "steel_flap",
+    "column": "steel_column",
+    "ext_wall": "metal_wall_panel",
+    "roof": "roof_panel",
+    "int_wall": "interior_partition",
+    "mat": "mat_surface",
+    "floor": "floor_finish",
+    "door": "door",
+}
+NAME_MATERIAL = {"Ridge_Beam": "steel_ridge"}  # Exceptions to the category
+
+
+def material_of(name):
+    if name in NAME_MATERIAL:
+        return NAME_MATERIAL[name]
+    return CATEGORY_MATERIAL.get(model.object_category(name), "other")
+
+
+# Per-material lookup columns, indexed by material code
+_BASIS = np.array([m.basis for m in MATERIALS.values()])
+_DENSITY = np.array([m.density or 0.0 for m in MATERIALS.values()])
+_LB_PER_FT = np.array([m.lb_per_ft or 0.0 for m in MATERIALS.values()])
+
+# ============================================================================
+# VECTORIZED MEASURES
+# ============================================================================
+
+def measure(codes, dims):
+    """Per-object measures for material codes (n,) and dims (n, 3) in mm.
+
+    Returns a dict of (n,) arrays: volume_cy, area_sf, weight_lb, quantity
+    (in the material's pricing unit).
+    """
+    l, w, h = dims[:, 0], dims[:, 1], dims[:, 2]
+    t = PIT_WALL_THICK
+    basis = _BASIS[codes]
+
+    box_volume = l * w * h
+    shell = (l + 2 * t) * (w + 2 * t) * (h + t) - box_volume
+    volume = np.where(basis == "shell", shell, box_volume)
+    plan = l * w
+    face = np.maximum(l, w) * h
+    area = np.where(basis == "face", face, plan)
+
+    weight = (volume / CF * _DENSITY[codes]
+              + dims.max(axis=1) / FT * _LB_PER_FT[codes])
+
+    quantity = np.select(
+        [np.isin(basis, ("volume", "shell")), np.isin(basis, ("plan", "face")),
+         basis == "weight"],
+        [volume / CY, area / SF, weight],
+        default=1.0)
+    return {"volume_cy": volume / CY, "area_sf": area / SF,
+            "weight_lb": weight, "quantity": quantity}
+
+
+def scene_codes(scene):
+    return np.array([_CODE[material_of(b.name)] for b in scene.boxes], dtype=np.int64)
+
+# ============================================================================
+# TAKEOFF
+# ============================================================================
+
+def takeoff(scene):
+    """(totals, ledger) for one in-memory scene.
+
+    totals: {material: {contractor, unit, quantity, volume_cy, area_sf,
+    weight_lb, count}}; ledger: column dict, one row per box.
+    """
+    names, dims, _origin = scene.to_arrays()
+    codes = scene_codes(scene)
+    m = measure(codes, dims)
+    k = len(MATERIAL_NAMES)
+
+    totals = {}
+    sums = {key: np.bincount(codes, weights=m[key], minlength=k) for key in m}
+    count = np.bincount(codes, minlength=k)
+    for i, name in enumerate(MATERIAL_NAMES):
+        if count[i]:
+            mat = MATERIALS[name]
+            totals[name] = {
+                "contractor": mat.contractor, "unit": mat.unit,
+                "quantity": round(float(sums["quantity"][i]), 2),
+                "volume_cy": round(float(sums["volume_cy"][i]), 2),
+                "area_sf": round(float(sums["area_sf"][i]), 1),
+                "weight_lb": round(float(sums["weight_lb"][i]), 0),
+                "count": int(count[i]),
+            }
+
+    material = np.array(MATERIAL_NAMES)[codes]
+    ledger = {
+        "name": np.array(names),
+        "material": material,
+        "contractor": np.array([MATERIALS[n].contractor for n in MATERIAL_NAMES])[codes],
+        "unit": np.array([MATERIALS[n].unit for n in MATERIAL_NAMES])[codes],
+        "length_ft": dims[:, 0] / FT, "width_ft": dims[:, 1] / FT,
+        "height_ft": dims[:, 2] / FT,
+        **m,
+    }
+    return totals, ledger
+
+
+def takeoff_batch(param_sets):
+    """Pricing quantity per material for many parameter dicts.
+
+    Builds each variant's in-memory scene, then measures all boxes of all
+    variants in one pass.  Returns {material: (variants,) array}.
+    """
+    codes, dims, variant = [], [], []
+    for v, params in enumerate(param_sets):
+        scene = model.build_facility(params)
+        _names, d, _origin = scene.to_arrays()
+        codes.append(scene_codes(scene))
+        dims.append(d)
+        variant.append(np.full(len(d), v))
+    n = len(param_sets)
+    k = len(MATERIAL_NAMES)
+    codes = np.concatenate(codes) if codes else np.zeros(0, dtype=np.int64)
+    dims = np.concatenate(dims) if dims else np.zeros((0, 3))
+    variant = np.concatenate(variant) if variant else np.zeros(0, dtype=np.int64)
+
+    quantity = measure(codes, dims)["quantity"]
+    sums = np.bincount(variant * k + codes, weights=quantity,
+                       minlength=n * k).reshape(n, k)
+    return {name: sums[:, i] for i, name in enumerate(MATERIAL_NAMES)
+            if name != "other"}
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def print_totals(totals):
+    print("=" * 60)
+    print("  QUANTITY TAKEOFF")
+    print("=" * 60)
+    by_contractor = {}
+    for name, row in totals.items():
+        by_contractor.setdefault(row["contractor"], []).append((name, row))
+    for contractor, rows in by_contractor.items():
+        print(f"  {contractor}")
+        for name, row in rows:
+            print(f"  - {name:<20} {row['quantity']:>12,.1f} {row['unit']:<3}"
+                  f"  ({row['count']} objects)")
+    print("=" * 60)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m facility.takeoff",
+                                     description="Quantity takeoff by material.")
+    parser.add_argument("overrides", nargs="*", metavar="NAME=VALUE",
+                        help="parameter overrides (feet for lengths)")
+    parser.add_argument("--ledger", help="per-object ledger (.csv or .parquet)")
+    parser.add_argument("--totals", help="material totals (.json or .csv)")
+    args = parser.parse_args(argv)
+
+    scene = model.build_facility(cli_params.parse_overrides(args.overrides))
+    totals, ledger = takeoff(scene)
+    print_totals(totals)
+
+    if args.ledger:
+        writer = open_writer(args.ledger)
+        writer.write(ledger)
+        writer.close()
+    if args.totals:
+        if args.totals.endswith(".json"):
+            with open(args.totals, "w") as f:
+                json.dump(totals, f, indent=2)
+        else:
+            fields = list(next(iter(totals.values())))
+            cols = {"material": np.array(list(totals))}
+            for field in fields:
+                cols[field] = np.array([row[field] for row in totals.values()])
+            writer = open_writer(args.totals)
+            writer.write(cols)
+            writer.close()
+
+
+if __name__ == "__main__":
+    main()
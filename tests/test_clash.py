@@ -0,0 +1,97 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import wrestling_facility_phase1 as model
+from facility import clash
+
+FT = model.FT
+
+
+def brute_pairs(lo, hi, pad):
+    """Every unordered pair within `pad` of each other in plan."""
+    n = len(lo)
+    return {(i, j) for i, j in itertools.combinations(range(n), 2)
+            if lo[i, 0] < hi[j, 0] + pad and lo[j, 0] < hi[i, 0] + pad
+            and lo[i, 1] < hi[j, 1] + pad and lo[j, 1] < hi[i, 1] + pad}
+
+
+def brute_clashes(scene, rules=None):
+    """Narrow phase applied to every pair of boxes, one pair at a time."""
+    rules = clash.CLASH_RULES if rules is None else rules
+    found = set()
+    for a, b in itertools.combinations(scene.boxes, 2):
+        ca, cb = model.object_category(a.name), model.object_category(b.name)
+        mode, value = rules.get((ca, cb), rules.get((cb, ca),
+                                                    (clash.SOLID, clash.DEFAULT_TOLERANCE)))
+        over = [min(a.x + a.length, b.x + b.length) - max(a.x, b.x),
+                min(a.y + a.width, b.y + b.width) - max(a.y, b.y),
+                min(a.z + a.height, b.z + b.height) - max(a.z, b.z)]
+        plan = min(over[0], over[1])
+        gap = np.hypot(max(-over[0], 0), max(-over[1], 0))
+        if ((mode == clash.SOLID and min(plan, over[2]) > value)
+                or (mode == clash.PLAN and plan > value)
+                or (mode == clash.CLEARANCE and gap < value)):
+            found.add((*sorted((a.name, b.name)), clash.MODE_NAMES[mode]))
+    return found
+
+
+def random_boxes(rng, n):
+    """Mostly small boxes with a few that span the whole site."""
+    lo = rng.uniform(0, 100 * FT, (n, 3))
+    size = rng.choice([1 * FT, 4 * FT, 20 * FT], (n, 3)) * rng.uniform(0.2, 1.0, (n, 3))
+    big = rng.random(n) < 0.05
+    lo[big, :2] = 0.0
+    size[big, :2] = 100 * FT
+    return lo, lo + size
+
+
+def index_pairs(index, pad, chunk=2_000_000):
+    pairs = set()
+    for i, j in index.pairs(pad=pad, chunk=chunk):
+        pairs.update(zip(np.minimum(i, j).tolist(), np.maximum(i, j).tolist()))
+    return pairs
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("pad", [0.0, 5 * FT])
+def test_pairs_match_brute_force(seed, pad):
+    rng = np.random.default_rng(seed)
+    lo, hi = random_boxes(rng, 150)
+    index = clash.BoxIndex(lo, hi)
+    assert index_pairs(index, pad) == brute_pairs(lo, hi, pad)
+
+
+def test_pairs_are_unique_across_chunks():
+    lo, hi = random_boxes(np.random.default_rng(42), 200)
+    index = clash.BoxIndex(lo, hi)
+    seen = []
+    for i, j in index.pairs(pad=2 * FT, chunk=7):
+        seen.extend(zip(np.minimum(i, j).tolist(), np.maximum(i, j).tolist()))
+    assert len(seen) == len(set(seen))
+    assert set(seen) == brute_pairs(lo, hi, 2 * FT)
+
+
+def test_query_matches_brute_force():
+    rng = np.random.default_rng(7)
+    lo, hi = random_boxes(rng, 150)
+    index = clash.BoxIndex(lo, hi)
+    for _ in range(20):
+        qlo, qhi = random_boxes(rng, 1)
+        expect = [k for k in range(len(lo))
+                  if lo[k, 0] < qhi[0, 0] + FT and qlo[0, 0] < hi[k, 0] + FT
+                  and lo[k, 1] < qhi[0, 1] + FT and qlo[0, 1] < hi[k, 1] + FT]
+        assert index.query(qlo[0], qhi[0], pad=FT).tolist() == expect
+
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"MAT_GAP": 2 * FT},
+    {"MAT_OFFSET_Y": 10 * FT, "MAT_COUNT": 2},
+    {"BLDG_LENGTH": 120 * FT, "SUPPORT_DEPTH": 30 * FT},
+])
+def test_find_clashes_matches_brute_force(overrides):
+    scene = model.build_facility(overrides)
+    got = {(c["a"], c["b"], c["rule"]) for c in clash.find_clashes(scene)}
+    assert got == brute_clashes(scene)
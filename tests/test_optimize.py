@@ -0,0 +1,83 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import wrestling_facility_phase1 as model
+from facility import optimize
+
+FT = model.FT
+
+
+def brute_layouts(x, y, base, n, size, gap, keep):
+    """Every n-subset of candidates scored the way search_mats ranks them."""
+    found = []
+    for idx in itertools.combinations(range(len(x)), n):
+        idx = np.array(idx)
+        margins = base[idx].copy()
+        for k in range(n):
+            pair = optimize.pair_slack(x[idx], y[idx], k, size, gap)
+            pair[k] = np.inf
+            margins = np.minimum(margins, pair)
+        score = margins.min()
+        if score >= -1e-6:
+            found.append((float(score), float(margins.mean()), tuple(idx.tolist())))
+    return sorted(found, reverse=True)[:keep]
+
+
+def assert_same_ranking(got, expect):
+    assert len(got) == len(expect)
+    for (score, mean, idx), (e_score, e_mean, e_idx) in zip(got, expect):
+        assert score == pytest.approx(e_score)
+        assert mean == pytest.approx(e_mean)
+        assert tuple(idx) == e_idx
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_search_mats_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    count = int(rng.integers(8, 18))
+    x = rng.integers(0, 40, count) * FT
+    y = rng.integers(0, 40, count) * FT
+    base = rng.uniform(0, 6 * FT, count)
+    n = int(rng.integers(2, 5))
+    keep = int(rng.integers(1, 6))
+    size, gap = 10 * FT, 2 * FT
+    got, complete = optimize.search_mats(x.astype(float), y.astype(float), base,
+                                         n, size, gap, keep)
+    assert complete
+    assert_same_ranking(got, brute_layouts(x, y, base, n, size, gap, keep))
+
+
+def test_search_mats_parts_cover_the_search():
+    rng = np.random.default_rng(99)
+    x = rng.integers(0, 30, 14) * FT * 1.0
+    y = rng.integers(0, 30, 14) * FT * 1.0
+    base = rng.uniform(0, 4 * FT, 14)
+    parts = []
+    for part in range(3):
+        found, _ = optimize.search_mats(x, y, base, 3, 8 * FT, 2 * FT, 4,
+                                        firsts=set(range(part, 14, 3)))
+        parts.extend(found)
+    assert_same_ranking(sorted(parts, reverse=True)[:4],
+                        brute_layouts(x, y, base, 3, 8 * FT, 2 * FT, 4))
+
+
+@pytest.mark.parametrize("over_pits", [False, True])
+def test_optimize_mats_on_the_model(over_pits):
+    params = {"MAT_COUNT": 2}
+    result = optimize.optimize_mats(params, step=6 * FT, over_pits=over_pits, keep=3)
+    assert result["complete"]
+
+    scene = model.build_facility(params)
+    p = scene.params
+    region, keep_out = optimize.mat_region(scene, over_pits)
+    x, y, base, _step = optimize.candidates(p, region, keep_out, step=6 * FT)
+    expect = brute_layouts(x, y, base, 2, p.MAT_SIZE, p.MAT_GAP, 3)
+    assert [score for score, _ in result["layouts"]] == pytest.approx(
+        [score for score, _, _ in expect])
+
+    # Each reported score is the layout's own spare clearance
+    for score, mats in result["layouts"]:
+        slack = optimize.layout_slack(mats, p.MAT_SIZE, p.MAT_GAP, region, keep_out)
+        assert float(slack) == pytest.approx(score)
@@ -0,0 +1,205 @@
+import json
+import re
+import struct
+
+import numpy as np
+import pytest
+
+import wrestling_facility_phase1 as model
+from facility import floorplan, gltf, kinematics
+
+# ============================================================================
+# .pfkf
+# ============================================================================
+
+@pytest.fixture(scope="module")
+def rig():
+    return kinematics.plexflex_rig()
+
+
+def test_keyframes_round_trip(tmp_path, rig):
+    path = tmp_path / "cycle.pfkf"
+    timing = {"hold_time": 2.0}
+    frames, _counts, _first = kinematics.export_timeline(path, rig, fps=10, cycles=2,
+                                                         timing=timing, block=37)
+    meta, beam_z, flap_open = kinematics.read_keyframes(path)
+
+    times = np.arange(frames) / 10
+    z, flap, _, _ = kinematics.evaluate(rig, times, timing)
+    assert frames == int(round(kinematics.cycle_length(
+        rig, dict(kinematics.DEFAULT_TIMING, **timing)) * 2 * 10))
+    assert beam_z.shape == (frames, len(rig.names))
+    assert flap_open.shape == (frames, len(rig.flap_names))
+    np.testing.assert_array_equal(beam_z, z.astype("<f4"))
+    np.testing.assert_array_equal(flap_open, flap.astype("<f4"))
+
+    assert meta["fps"] == 10
+    assert meta["beams"] == rig.names
+    assert meta["flaps"] == rig.flap_names
+    assert meta["x"] == rig.x.tolist()
+    assert meta["y"] == rig.y.tolist()
+    assert meta["height"] == rig.height.tolist()
+    assert meta["timing"] == dict(kinematics.DEFAULT_TIMING, **timing)
+
+
+def test_keyframes_empty_file(tmp_path, rig):
+    path = tmp_path / "empty.pfkf"
+    kinematics.KeyframeWriter(path, rig, 30.0, {}).close()
+    meta, beam_z, flap_open = kinematics.read_keyframes(path)
+    assert beam_z.shape == (0, len(rig.names))
+    assert flap_open.shape == (0, 2)
+    assert meta["beams"] == rig.names
+
+
+def test_keyframes_reject_other_files(tmp_path):
+    path = tmp_path / "other.pfkf"
+    path.write_bytes(b"glTF" + bytes(40))
+    with pytest.raises(ValueError):
+        kinematics.read_keyframes(path)
+
+# ============================================================================
+# .glb
+# ============================================================================
+
+def parse_glb(data):
+    magic, version, total = struct.unpack_from("<4sII", data, 0)
+    assert (magic, version, total) == (b"glTF", 2, len(data))
+    size, kind = struct.unpack_from("<I4s", data, 12)
+    assert kind == b"JSON" and size % 4 == 0
+    doc = json.loads(data[20:20 + size])
+    offset = 20 + size
+    bin_size, kind = struct.unpack_from("<I4s", data, offset)
+    assert kind == b"BIN\0"
+    binary = data[offset + 8:offset + 8 + bin_size]
+    assert offset + 8 + bin_size == len(data)
+    assert doc["buffers"] == [{"byteLength": bin_size}]
+    return doc, binary
+
+
+def read_accessor(doc, binary, index):
+    accessor = doc["accessors"][index]
+    view = doc["bufferViews"][accessor["bufferView"]]
+    dtype = {gltf.FLOAT: "<f4", gltf.UNSIGNED_SHORT: "<u2"}[accessor["componentType"]]
+    width = {"SCALAR": 1, "VEC3": 3}[accessor["type"]]
+    data = np.frombuffer(binary, dtype=dtype, count=accessor["count"] * width,
+                         offset=view["byteOffset"])
+    assert data.nbytes == view["byteLength"]
+    return data.reshape(accessor["count"], width) if width > 1 else data
+
+
+def glb_boxes(doc, binary):
+    """name -> (translation, scale) for every box node or instance."""
+    boxes = {}
+    for node in doc["nodes"]:
+        if "mesh" not in node:
+            continue
+        ext = node.get("extensions", {}).get("EXT_mesh_gpu_instancing")
+        if ext:
+            t = read_accessor(doc, binary, ext["attributes"]["TRANSLATION"])
+            s = read_accessor(doc, binary, ext["attributes"]["SCALE"])
+            for name, ti, si in zip(node["extras"]["instances"], t, s):
+                boxes[name] = (ti, si)
+        else:
+            boxes[node["name"]] = (np.array(node["translation"], dtype="<f4"),
+                                   np.array(node["scale"], dtype="<f4"))
+    return boxes
+
+
+@pytest.mark.parametrize("gpu_instancing", [True, False])
+def test_glb_round_trip(tmp_path, gpu_instancing):
+    scene = model.build_facility()
+    path = tmp_path / "facility.glb"
+    size = gltf.export_glb(scene, path, gpu_instancing)
+    data = path.read_bytes()
+    assert size == len(data)
+    assert data == gltf.build_glb(scene, gpu_instancing)
+    doc, binary = parse_glb(data)
+
+    np.testing.assert_array_equal(read_accessor(doc, binary, 0), gltf.CUBE_POSITIONS)
+    np.testing.assert_array_equal(read_accessor(doc, binary, 1), gltf.CUBE_NORMALS)
+    np.testing.assert_array_equal(read_accessor(doc, binary, 2), gltf.CUBE_INDICES)
+
+    names, dims, origin = scene.to_arrays()
+    translation, scale = gltf.to_gltf_frame(dims, origin)
+    boxes = glb_boxes(doc, binary)
+    assert sorted(boxes) == sorted(names)
+    for i, name in enumerate(names):
+        np.testing.assert_allclose(boxes[name][0], translation[i], rtol=1e-6)
+        np.testing.assert_allclose(boxes[name][1], scale[i], rtol=1e-6)
+
+    labels = {n["name"]: n["extras"]["text"] for n in doc["nodes"] if "mesh" not in n}
+    assert labels == {label.name: label.text for label in scene.labels}
+    if gpu_instancing:
+        assert doc["extensionsRequired"] == ["EXT_mesh_gpu_instancing"]
+    else:
+        assert "extensionsUsed" not in doc
+
+
+def test_glb_frame_maps_model_axes():
+    # A 1 x 2 x 3 m box at (4, 5, 6) m: glTF is Y-up with -y pointing north
+    dims = np.array([[1000.0, 2000.0, 3000.0]])
+    origin = np.array([[4000.0, 5000.0, 6000.0]])
+    translation, scale = gltf.to_gltf_frame(dims, origin)
+    np.testing.assert_allclose(translation, [[4.0, 6.0, -7.0]])
+    np.testing.assert_allclose(scale, [[1.0, 3.0, 2.0]])
+
+# ============================================================================
+# .pdf
+# ============================================================================
+
+def parse_pdf(data):
+    """Check the xref table and return the decoded content stream."""
+    assert data.startswith(b"%PDF-1.4\n")
+    assert data.endswith(b"%%EOF\n")
+    xref = int(re.search(rb"startxref\n(\d+)\n%%EOF\n$", data).group(1))
+    assert data[xref:xref + 5] == b"xref\n"
+    count = int(re.match(rb"xref\n0 (\d+)\n", data[xref:]).group(1))
+    entries = data[xref:].split(b"\n")[2:2 + count]
+    assert entries[0] == b"0000000000 65535 f "
+    for num, entry in enumerate(entries[1:], start=1):
+        offset = int(entry[:10])
+        assert data[offset:].startswith(b"%d 0 obj\n" % num)
+
+    start = data.index(b"stream\n") + len(b"stream\n")
+    end = data.index(b"endstream\n")
+    length = int(re.search(rb"6 0 obj\n(\d+)\nendobj", data).group(1))
+    assert end - start == length
+    return data[start:end].decode("latin-1")
+
+
+def test_pdf_plan_round_trip(tmp_path):
+    scene = model.build_facility()
+    path = tmp_path / "plan.pdf"
+    cut, below = floorplan.write_plan(scene, str(path))
+    stream = parse_pdf(path.read_bytes())
+
+    rects = re.findall(r"re [fBS]$", stream, flags=re.M)
+    assert len(rects) == 1 + cut + below      # Page background + every box
+
+    shown = re.findall(r"\(((?:\\.|[^\\)])*)\) Tj", stream)
+    shown = [re.sub(r"\\(.)", r"\1", s) for s in shown]
+    for label in scene.labels:
+        for line in label.text.split("\n"):
+            assert line in shown
+
+    p = scene.params
+    k = floorplan.SCALE / model.FT
+    media = re.search(rb"/MediaBox \[0 0 ([\d.]+) ([\d.]+)\]", path.read_bytes())
+    assert float(media.group(1)) == pytest.approx(p.BLDG_LENGTH * k + 2 * floorplan.MARGIN,
+                                                  abs=0.01)
+    assert float(media.group(2)) == pytest.approx(p.BLDG_WIDTH * k + 2 * floorplan.MARGIN,
+                                                  abs=0.01)
+
+
+def test_pdf_escapes_text(tmp_path):
+    path = tmp_path / "text.pdf"
+    out = floorplan.PdfWriter(str(path), 100, 100)
+    out.text(10, 10, r"Mech (24') \ Storage", 8)
+    out.close()
+    stream = parse_pdf(path.read_bytes())
+    assert r"(Mech \(24'\) \\ Storage) Tj" in stream
+
+
+def test_plan_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        floorplan.write_plan(model.build_facility(), str(tmp_path / "plan.png"))
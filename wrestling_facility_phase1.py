@@ -17,10 +17,17 @@
 #
 # Run: Open FreeCAD > Macro > Execute Macro > Select this file
 # Or: Copy/paste into FreeCAD Python console
+# Or: python3 wrestling_facility_phase1.py   (headless in-memory scene, no FreeCAD)
+#
+# As a library:
+#   import wrestling_facility_phase1 as model
+#   scene = model.build_facility({"SUPPORT_DEPTH": 26 * model.FT})
 # ============================================================================
 
-import FreeCAD as App
-import Draft
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from types import SimpleNamespace
 
 # ============================================================================
 # CONVERSION: All FreeCAD dimensions in mm
@@ -59,6 +66,7 @@ EXT_WALL_THICK = 6 * IN    # Metal panel wall thickness
 INT_WALL_THICK = 4 * IN    # Interior partition thickness
 
 # Wrestling Mats (3 mats side by side along the length)
+MAT_COUNT   = 3            # Mats 1-2 competition, 3 warm-up; more go north in pairs
 MAT_SIZE    = 42 * FT      # 42' x 42' competition mat with safety border
 MAT_THICK   = 2 * IN       # 2 inch mat thickness
 MAT_GAP     = 4 * FT       # 4 feet between mats
@@ -94,264 +102,613 @@ COLOR_BEAM      = (0.82, 0.80, 0.76)  # Concrete beam (light gray)
 COLOR_PIT       = (0.35, 0.35, 0.35)  # Pit interior (dark)
 COLOR_FLAP      = (0.65, 0.65, 0.60)  # Safety flap (steel gray)
 
+# FreeCAD document mode: False = one Part::Box per box (each editable in the
+# tree); True = one compound per category (columns, beams, ...) for big models
+BATCH_GEOMETRY = False
+
+# Every name above that can be overridden per build (colors stay global)
+PARAM_NAMES = [
+    "BLDG_LENGTH", "BLDG_WIDTH", "EAVE_HEIGHT", "ROOF_PITCH",
+    "SLAB_THICK", "SLAB_DEPTH",
+    "TELE_ROWS", "TELE_EXTRA_SEATS", "TELE_STOW_Z", "TELE_DEPLOY_Z",
+    "TELE_BEAM_HEIGHT", "TELE_HORIZ_STEP", "TELE_PIT_DEPTH",
+    "TELE_PIT_LENGTH", "TELE_PIT_WIDTH", "TELE_FLAP_THICK",
+    "EXT_WALL_THICK", "INT_WALL_THICK",
+    "MAT_COUNT", "MAT_SIZE", "MAT_THICK", "MAT_GAP", "MAT_OFFSET_Y",
+    "SUPPORT_DEPTH",
+    "OFFICE_WIDTH", "LOCKER_M_WIDTH", "LOCKER_W_WIDTH", "WEIGHT_WIDTH",
+    "MECH_WIDTH",
+    "ROLL_DOOR_W", "ROLL_DOOR_H", "MAN_DOOR_W", "MAN_DOOR_H",
+]
+
+
+def default_params():
+    """Return the BUILDING PARAMETERS block as a {name: value} dict."""
+    return {name: globals()[name] for name in PARAM_NAMES}
+
+
+def resolve_params(overrides=None):
+    """Merge `overrides` onto the defaults and return them as a namespace."""
+    params = default_params()
+    for name, value in (overrides or {}).items():
+        if name not in params:
+            raise KeyError(f"Unknown building parameter: {name}")
+        params[name] = value
+    return SimpleNamespace(**params)
+
+
 # ============================================================================
-# CREATE DOCUMENT
+# GEOMETRY BACKENDS
 # ============================================================================
+# make_box / make_text_label draw into whichever backend is active.
+#   SceneBackend   - plain Python records, builds the facility in milliseconds
+#                    (layout checks, CI, parameter studies)
+#   FreeCADBackend - real Part::Box document objects (final renders)
 
-doc = App.newDocument("WrestlingFacility_Phase1")
-App.setActiveDocument("WrestlingFacility_Phase1")
+Box = namedtuple("Box", "name length width height x y z color")
+Label = namedtuple("Label", "name text x y z")
+
+
+class SceneBackend:
+    """In-memory scene: every box and label kept as a plain named tuple."""
+
+    def __init__(self):
+        self.boxes = []
+        self.labels = []
+        self._by_name = {}
+        self._label_by_name = {}
+
+    def add_box(self, name, length, width, height, x, y, z, color):
+        box = Box(name, length, width, height, x, y, z, color)
+        self._by_name[name] = len(self.boxes)
+        self.boxes.append(box)
+        return box
+
+    def add_label(self, name, text, x, y, z):
+        label = Label(name, text, x, y, z)
+        self._label_by_name[name] = len(self.labels)
+        self.labels.append(label)
+        return label
+
+    def update_box(self, box):
+        """Replace the box of the same name in place."""
+        self.boxes[self._by_name[box.name]] = box
+
+    def update_label(self, label):
+        self.labels[self._label_by_name[label.name]] = label
+
+    def remove(self, name):
+        """Drop a box or label by name."""
+        for items, index in ((self.boxes, self._by_name),
+                             (self.labels, self._label_by_name)):
+            if name in index:
+                del items[index.pop(name)]
+                index.update({item.name: i for i, item in enumerate(items)})
+
+    def recompute(self):
+        pass  # Nothing to tessellate - records are final as soon as added
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def get(self, name):
+        """Return the box called `name` (KeyError if it was never built)."""
+        return self.boxes[self._by_name[name]]
+
+    def get_label(self, name):
+        return self.labels[self._label_by_name[name]]
+
+    def to_arrays(self):
+        """Struct-of-arrays view: names list plus (n, 3) NumPy arrays in mm."""
+        import numpy as np
+        names = [b.name for b in self.boxes]
+        dims = np.array([(b.length, b.width, b.height) for b in self.boxes],
+                        dtype=float).reshape(-1, 3)
+        origin = np.array([(b.x, b.y, b.z) for b in self.boxes],
+                          dtype=float).reshape(-1, 3)
+        return names, dims, origin
+
+
+class FreeCADBackend:
+    """Real FreeCAD document - one Part::Box object per box.
+
+    `batch` (True, or an iterable of object_category() names) instead
+    collects those boxes and materializes each category as a single
+    Part::Feature compound on recompute(), with per-box colors kept as
+    per-face DiffuseColor and the model names in its Instances property.
+    Sections restored from facility.cache arrive the same way, as one
+    compound per section (add_shape).
+    """
+
+    def __init__(self, doc_name="WrestlingFacility_Phase1", batch=False):
+        import FreeCAD as App
+        self.App = App
+        self.doc = App.newDocument(doc_name)
+        App.setActiveDocument(doc_name)
+        if batch is True:
+            batch = {category for _prefix, category in CATEGORY_PREFIXES} | {"other"}
+        self.batch = frozenset(batch or ())
+        import Part
+        self.Part = Part
+        self._reset()
+
+    def _reset(self):
+        self.objects = {}    # model name -> document object (boxes and labels)
+        self.records = {}    # model name -> Box, every box
+        self.labels = []     # Label records that made it into the document
+        self._groups = {}    # batched category / cached section -> {name: Box}
+        self._compounds = {} # batched category / cached section -> Part::Feature
+        self._cached = {}    # model name -> cached section group
+        self._dirty = set()
+
+    def _batched(self, name):
+        if name in self._cached:
+            return self._cached[name]
+        category = object_category(name)
+        return category if category in self.batch else None
+
+    def add_box(self, name, length, width, height, x, y, z, color):
+        box = Box(name, length, width, height, x, y, z, color)
+        self.records[name] = box
+        category = self._batched(name)
+        if category:
+            self._groups.setdefault(category, {})[name] = box
+            self._dirty.add(category)
+            return box
+        obj = self.doc.addObject("Part::Box", name)
+        self.objects[name] = obj
+        self._apply(obj, box)
+        return obj
+
+    def _apply(self, obj, box):
+        obj.Length = box.length
+        obj.Width = box.width
+        obj.Height = box.height
+        obj.Placement = self.App.Placement(
+            self.App.Vector(box.x, box.y, box.z),
+            self.App.Rotation(0, 0, 0)
+        )
+        if box.color and obj.ViewObject is not None:  # No ViewObject in FreeCADCmd
+            obj.ViewObject.ShapeColor = box.color
+
+    def add_label(self, name, text, x, y, z):
+        try:
+            import Draft
+            label = Draft.make_text([text], self.App.Vector(x, y, z))
+            label.Label = name
+            self.objects[name] = label
+            self.labels.append(Label(name, text, x, y, z))
+            return label
+        except Exception:
+            pass  # Text may not work in all FreeCAD versions
+
+    def update_box(self, box):
+        """Push new dims/placement/color onto the existing object (marks it touched)."""
+        self.records[box.name] = box
+        category = self._batched(box.name)
+        if category:
+            self._groups[category][box.name] = box
+            self._dirty.add(category)
+        else:
+            self._apply(self.objects[box.name], box)
+
+    def update_label(self, label):
+        obj = self.objects.get(label.name)
+        if obj is not None:
+            obj.Text = [label.text]
+            placement = obj.Placement  # Property returns a copy
+            placement.Base = self.App.Vector(label.x, label.y, label.z)
+            obj.Placement = placement
+            self.labels = [label if lb.name == label.name else lb for lb in self.labels]
+
+    def remove(self, name):
+        self.records.pop(name, None)
+        self.labels = [lb for lb in self.labels if lb.name != name]
+        category = self._batched(name)
+        if category and name in self._groups.get(category, {}):
+            del self._groups[category][name]
+            self._dirty.add(category)
+            return
+        obj = self.objects.pop(name, None)
+        if obj is not None:
+            self.doc.removeObject(obj.Name)
+
+    def clear(self):
+        """Empty the document so the next build can reuse it."""
+        for obj in list(self.doc.Objects):
+            self.doc.removeObject(obj.Name)
+        self._reset()
+
+    def compound_shape(self, boxes):
+        """One Part compound of `boxes` (6 faces per box, in box order)."""
+        V = self.App.Vector
+        return self.Part.makeCompound([
+            self.Part.makeBox(b.length, b.width, b.height, V(b.x, b.y, b.z))
+            for b in boxes])
+
+    def _set_compound(self, group, boxes, shape, prefix="Batch"):
+        obj = self._compounds.get(group)
+        if obj is None:
+            obj = self.doc.addObject("Part::Feature", f"{prefix}_{group}")
+            obj.addProperty("App::PropertyStringList", "Instances", "Batch",
+                            "Model names of the boxes in this compound")
+            self._compounds[group] = obj
+        obj.Shape = shape
+        obj.Instances = [b.name for b in boxes]
+        obj.Label = f"{group} x{len(boxes)}"
+        if obj.ViewObject is not None:  # 6 faces per box, in box order
+            obj.ViewObject.DiffuseColor = [
+                tuple(b.color or (0.8, 0.8, 0.8)) for b in boxes for _face in range(6)]
+
+    def add_shape(self, group, brep, boxes):
+        """Restore a cached section: one compound read back from BREP text.
+
+        The boxes stay editable - update_box / remove rebuild the compound
+        like a batched category.
+        """
+        shape = self.Part.Shape()
+        shape.importBrepFromString(brep)
+        self._groups[group] = {b.name: b for b in boxes}
+        for b in boxes:
+            self.records[b.name] = b
+            self._cached[b.name] = group
+        self._set_compound(group, boxes, shape, prefix="Cached")
+        return shape
+
+    def _flush(self):
+        """Rebuild the compound of every batched category that changed."""
+        for category in sorted(self._dirty):
+            boxes = list(self._groups.get(category, {}).values())
+            obj = self._compounds.get(category)
+            if not boxes:
+                if obj is not None:
+                    self.doc.removeObject(obj.Name)
+                    del self._compounds[category]
+                continue
+            self._set_compound(category, boxes, self.compound_shape(boxes))
+        self._dirty.clear()
+
+    def recompute(self):
+        self._flush()
+        self.doc.recompute()  # FreeCAD only recomputes touched objects
+
+    def __len__(self):
+        return len(self.records)
+
+
+_backend = None  # Set by build_facility() while a build is running
+
+
+@contextmanager
+def drawing_into(backend):
+    """Route make_box/make_text_label into `backend` for the with-block."""
+    global _backend
+    previous, _backend = _backend, backend
+    try:
+        yield backend
+    finally:
+        _backend = previous
+
+
+def active_backend():
+    """The backend make_box / make_text_label currently draw into."""
+    return _backend
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
 def make_box(name, length, width, height, x=0, y=0, z=0, color=None):
-    """Create a box (Part::Box) at given position with optional color."""
-    obj = doc.addObject("Part::Box", name)
-    obj.Length = length
-    obj.Width = width
-    obj.Height = height
-    obj.Placement = App.Placement(
-        App.Vector(x, y, z),
-        App.Rotation(0, 0, 0)
-    )
-    if color:
-        obj.ViewObject.ShapeColor = color
-    return obj
+    """Create a box at given position with optional color."""
+    return _backend.add_box(name, length, width, height, x, y, z, color)
 
 def make_text_label(name, text, x, y, z=500):
     """Create a text annotation at position."""
-    try:
-        label = Draft.make_text([text], App.Vector(x, y, z))
-        label.Label = name
-        return label
-    except:
-        pass  # Text may not work in all FreeCAD versions
+    return _backend.add_label(name, text, x, y, z)
+
+# Object categories, by the name prefixes the sections below use
+# (first match wins - exterior wall names before the generic "Wall_")
+CATEGORY_PREFIXES = [
+    ("Slab_", "slab"),
+    ("Footing_", "footing"),
+    ("Wall_North", "ext_wall"),
+    ("Wall_South", "ext_wall"),
+    ("Wall_East", "ext_wall"),
+    ("Wall_West", "ext_wall"),
+    ("Wall_", "int_wall"),
+    ("Wrestling_Mat_", "mat"),
+    ("Floor_", "floor"),
+    ("Roof_", "roof"),
+    ("Ridge_", "roof"),
+    ("Column_", "column"),
+    ("Door_", "door"),
+    ("Pit_", "pit"),
+    ("ElevatingBeam_", "beam"),
+    ("SafetyFlap_", "flap"),
+    ("Label_", "label"),
+]
+
+def object_category(name):
+    """Category of a generated object from its name ("other" if unknown)."""
+    for prefix, category in CATEGORY_PREFIXES:
+        if name.startswith(prefix):
+            return category
+    return "other"
 
 # ============================================================================
-# 1. CONCRETE SLAB FOUNDATION (SRM Concrete)
+# DERIVED LAYOUT (positions shared between sections)
 # ============================================================================
 
-slab = make_box(
-    "Slab_Foundation",
-    BLDG_LENGTH, BLDG_WIDTH, SLAB_THICK,
-    x=0, y=0, z=-SLAB_THICK,
-    color=COLOR_SLAB
-)
+def facility_layout(p):
+    """Compute every derived position/size the sections below share."""
+    L = SimpleNamespace()
 
-# Thickened edge (perimeter footing - 12" wide x 18" deep)
-footing_width = 12 * IN
-footing_depth = 18 * IN
+    # Thickened edge (perimeter footing - 12" wide x 18" deep)
+    L.footing_width = 12 * IN
+    L.footing_depth = 18 * IN
 
-# North footing
-make_box("Footing_North", BLDG_LENGTH, footing_width, footing_depth,
-         x=0, y=BLDG_WIDTH - footing_width, z=-footing_depth, color=COLOR_SLAB)
-# South footing
-make_box("Footing_South", BLDG_LENGTH, footing_width, footing_depth,
-         x=0, y=0, z=-footing_depth, color=COLOR_SLAB)
-# East footing
-make_box("Footing_East", footing_width, BLDG_WIDTH, footing_depth,
-         x=BLDG_LENGTH - footing_width, y=0, z=-footing_depth, color=COLOR_SLAB)
-# West footing
-make_box("Footing_West", footing_width, BLDG_WIDTH, footing_depth,
-         x=0, y=0, z=-footing_depth, color=COLOR_SLAB)
+    # Main divider wall - runs North-South, 76' from west wall (leaving 24' for support)
+    L.divider_x = p.BLDG_LENGTH - p.SUPPORT_DEPTH
 
-# ============================================================================
-# 2. EXTERIOR WALLS (Summer Time Metals)
-# ============================================================================
+    # Room layout from South to North along east wall:
+    # [Office 20'] [Men's Locker 16'] [Women's Locker 16'] [Weight Room 24'] [Mech 24']
+    L.rooms = [
+        ("Wall_Office_North", p.OFFICE_WIDTH),
+        ("Wall_LockerM_North", p.LOCKER_M_WIDTH),
+        ("Wall_LockerW_North", p.LOCKER_W_WIDTH),
+        ("Wall_Weight_North", p.WEIGHT_WIDTH),
+        # Mech fills remaining space to north wall
+    ]
 
-# North wall (back)
-make_box("Wall_North", BLDG_LENGTH, EXT_WALL_THICK, EAVE_HEIGHT,
-         x=0, y=BLDG_WIDTH - EXT_WALL_THICK, z=0, color=COLOR_EXT_WALL)
+    # Mat area: West side of building, 76' wide x 100' long
+    # 3 mats arranged: 1 row of 3, each 42' x 42'
+    # Total mat width: 3 x 42' = 126' -- TOO WIDE
+    # Arrange: 2 mats side by side (84') + 1 mat offset, or 3 in an L
 
-# South wall (front - main entrance)
-make_box("Wall_South", BLDG_LENGTH, EXT_WALL_THICK, EAVE_HEIGHT,
-         x=0, y=0, z=0, color=COLOR_EXT_WALL)
+    # REVISED: 76' width available. Each mat is 42'.
+    # Layout: 2 mats side-by-side along south wall (84' needed but only 76' wide)
+    # Better: Mats are 40' competition + 2' safety = 42'. Use 38' mats + 2' buffer.
+    # BEST: Place mats lengthwise (3 across the 100' length, 42' deep into 76' width)
 
-# East wall
-make_box("Wall_East", EXT_WALL_THICK, BLDG_WIDTH, EAVE_HEIGHT,
-         x=BLDG_LENGTH - EXT_WALL_THICK, y=0, z=0, color=COLOR_EXT_WALL)
+    # 3 mats along the length (north-south): 3 x 42' = 126' > 100'
+    # 3 mats: use 38' mats with 2' safety = 40' each
+    # 3 x 40' = 120' -- still too long
 
-# West wall
-make_box("Wall_West", EXT_WALL_THICK, BLDG_WIDTH, EAVE_HEIGHT,
-         x=0, y=0, z=0, color=COLOR_EXT_WALL)
+    # ACTUAL LAYOUT: 2 mats side by side + 1 stacked
+    # Row 1 (south): 2 mats @ 42' each = 84' in 100' length, centered
+    # Row 2 (north): 1 mat centered for warm-up / practice
+    L.mat_area_width = L.divider_x - p.EXT_WALL_THICK  # ~76' usable
 
-# ============================================================================
-# 3. INTERIOR PARTITION WALL (Separates mat area from support rooms)
-# ============================================================================
+    # Row 1: Two mats side by side (south half)
+    L.mat1_x = 8 * FT                                # 8' from west wall
+    L.mat1_y = p.MAT_OFFSET_Y                        # 6' from south wall
+
+    L.mat2_x = L.mat1_x + p.MAT_SIZE + p.MAT_GAP     # Second mat east of first
+    L.mat2_y = p.MAT_OFFSET_Y
 
-# Main divider wall - runs North-South, 76' from west wall (leaving 24' for support)
-divider_x = BLDG_LENGTH - SUPPORT_DEPTH
+    # Row 2: One mat centered (north half, for practice/warm-up)
+    L.mat3_x = (L.mat_area_width - p.MAT_SIZE) / 2 + p.EXT_WALL_THICK  # Centered
+    L.mat3_y = p.MAT_OFFSET_Y + p.MAT_SIZE + p.MAT_GAP   # Above row 1
 
-make_box("Wall_Divider_Main", INT_WALL_THICK, BLDG_WIDTH, EAVE_HEIGHT,
-         x=divider_x, y=0, z=0, color=COLOR_INT_WALL)
+    # Mats 4+ go north in pairs; only rows that end inside the north wall
+    # are placed, so MAT_COUNT is clamped to what the building holds
+    # (plain arithmetic so it also runs on the sweep's parameter arrays)
+    mat_rows = (p.BLDG_WIDTH - p.EXT_WALL_THICK - p.MAT_OFFSET_Y - p.MAT_SIZE) \
+        // (p.MAT_SIZE + p.MAT_GAP) + 1
+    mat_rows = mat_rows * (mat_rows > 0)
+    room = 2 * mat_rows - (mat_rows >= 2)            # 2, 3, 5, 7, ... mats
+    L.mat_count = p.MAT_COUNT - (p.MAT_COUNT - room) * (room < p.MAT_COUNT)
+
+    # Support room floors (colored floors to show room use)
+    L.room_z = 1  # Just above slab (1mm) for visibility
+    L.mech_y = p.OFFICE_WIDTH + p.LOCKER_M_WIDTH + p.LOCKER_W_WIDTH + p.WEIGHT_WIDTH
+    L.mech_height = p.BLDG_WIDTH - L.mech_y
+
+    # Ridge beam (center peak for gable indication)
+    L.ridge_height = (p.BLDG_WIDTH / 2) * (p.ROOF_PITCH / 12)  # Rise from 3:12 pitch
+
+    # Steel columns (typical metal building frame - every 25', plus end frame)
+    L.col_size = 8 * IN  # W8 column representation
+    L.col_spacing = 25 * FT
+    L.col_frames = -(-p.BLDG_WIDTH // L.col_spacing) + 1  # 5 frames for 100'
+
+    # Main entrance - double door on south wall (centered on mat area)
+    L.entrance_x = L.mat_area_width / 2 - p.MAN_DOOR_W
+
+    # PLEX FLEX pits - north pit against the north wall, south against the south
+    L.pit_north_y = p.BLDG_WIDTH - p.EXT_WALL_THICK - p.TELE_PIT_WIDTH
+    L.pit_south_y = p.EXT_WALL_THICK
+    L.beam_length = p.TELE_PIT_LENGTH                # Each beam spans the pit length
+    L.beam_width  = p.TELE_PIT_WIDTH / p.TELE_ROWS * 3   # Width per beam section
+
+    return L
 
 # ============================================================================
-# 4. SUPPORT ROOM DIVIDER WALLS (East side, 24' deep section)
+# 1. CONCRETE SLAB FOUNDATION (SRM Concrete)
 # ============================================================================
 
-# Room layout from South to North along east wall:
-# [Office 20'] [Men's Locker 16'] [Women's Locker 16'] [Weight Room 24'] [Mech 24']
+def build_slab(p, L):
+    make_box("Slab_Foundation",
+             p.BLDG_LENGTH, p.BLDG_WIDTH, p.SLAB_THICK,
+             x=0, y=0, z=-p.SLAB_THICK,
+             color=COLOR_SLAB)
 
-room_start_y = 0
-rooms = [
-    ("Wall_Office_North", OFFICE_WIDTH),
-    ("Wall_LockerM_North", LOCKER_M_WIDTH),
-    ("Wall_LockerW_North", LOCKER_W_WIDTH),
-    ("Wall_Weight_North", WEIGHT_WIDTH),
-    # Mech fills remaining space to north wall
-]
-
-current_y = 0
-room_positions = []
+    fw, fd = L.footing_width, L.footing_depth
 
-for wall_name, room_width in rooms:
-    room_positions.append(("Room", current_y, current_y + room_width))
-    current_y += room_width
-    # Create divider wall at top of each room
-    make_box(wall_name, SUPPORT_DEPTH, INT_WALL_THICK, 10 * FT,
-             x=divider_x, y=current_y, z=0, color=COLOR_INT_WALL)
+    # North footing
+    make_box("Footing_North", p.BLDG_LENGTH, fw, fd,
+             x=0, y=p.BLDG_WIDTH - fw, z=-fd, color=COLOR_SLAB)
+    # South footing
+    make_box("Footing_South", p.BLDG_LENGTH, fw, fd,
+             x=0, y=0, z=-fd, color=COLOR_SLAB)
+    # East footing
+    make_box("Footing_East", fw, p.BLDG_WIDTH, fd,
+             x=p.BLDG_LENGTH - fw, y=0, z=-fd, color=COLOR_SLAB)
+    # West footing
+    make_box("Footing_West", fw, p.BLDG_WIDTH, fd,
+             x=0, y=0, z=-fd, color=COLOR_SLAB)
 
 # ============================================================================
-# 5. WRESTLING MAT AREA (3 mats - 76' x 100' open space)
+# 2. EXTERIOR WALLS (Summer Time Metals)
 # ============================================================================
 
-# Mat area: West side of building, 76' wide x 100' long
-# 3 mats arranged: 1 row of 3, each 42' x 42'
-# Total mat width: 3 x 42' = 126' -- TOO WIDE
-# Arrange: 2 mats side by side (84') + 1 mat offset, or 3 in an L
+def build_exterior_walls(p, L):
+    # North wall (back)
+    make_box("Wall_North", p.BLDG_LENGTH, p.EXT_WALL_THICK, p.EAVE_HEIGHT,
+             x=0, y=p.BLDG_WIDTH - p.EXT_WALL_THICK, z=0, color=COLOR_EXT_WALL)
 
-# REVISED: 76' width available. Each mat is 42'.
-# Layout: 2 mats side-by-side along south wall (84' needed but only 76' wide)
-# Better: Mats are 40' competition + 2' safety = 42'. Use 38' mats + 2' buffer.
-# BEST: Place mats lengthwise (3 across the 100' length, 42' deep into 76' width)
+    # South wall (front - main entrance)
+    make_box("Wall_South", p.BLDG_LENGTH, p.EXT_WALL_THICK, p.EAVE_HEIGHT,
+             x=0, y=0, z=0, color=COLOR_EXT_WALL)
 
-# 3 mats along the length (north-south): 3 x 42' = 126' > 100'
-# 3 mats: use 38' mats with 2' safety = 40' each
-# 3 x 40' = 120' -- still too long
+    # East wall
+    make_box("Wall_East", p.EXT_WALL_THICK, p.BLDG_WIDTH, p.EAVE_HEIGHT,
+             x=p.BLDG_LENGTH - p.EXT_WALL_THICK, y=0, z=0, color=COLOR_EXT_WALL)
 
-# ACTUAL LAYOUT: 2 mats side by side + 1 stacked
-# Row 1 (south): 2 mats @ 42' each = 84' in 100' length, centered
-# Row 2 (north): 1 mat centered for warm-up / practice
+    # West wall
+    make_box("Wall_West", p.EXT_WALL_THICK, p.BLDG_WIDTH, p.EAVE_HEIGHT,
+             x=0, y=0, z=0, color=COLOR_EXT_WALL)
 
-mat_area_width = divider_x - EXT_WALL_THICK  # ~76' usable
+# ============================================================================
+# 3. INTERIOR PARTITION WALL (Separates mat area from support rooms)
+# 4. SUPPORT ROOM DIVIDER WALLS (East side, 24' deep section)
+# ============================================================================
 
-# Row 1: Two mats side by side (south half)
-mat1_x = 8 * FT                              # 8' from west wall
-mat1_y = MAT_OFFSET_Y                        # 6' from south wall
+def build_room_walls(p, L):
+    make_box("Wall_Divider_Main", p.INT_WALL_THICK, p.BLDG_WIDTH, p.EAVE_HEIGHT,
+             x=L.divider_x, y=0, z=0, color=COLOR_INT_WALL)
 
-mat2_x = mat1_x + MAT_SIZE + MAT_GAP         # Second mat east of first
-mat2_y = MAT_OFFSET_Y
+    current_y = 0
+    for wall_name, room_width in L.rooms:
+        current_y += room_width
+        # Create divider wall at top of each room
+        make_box(wall_name, p.SUPPORT_DEPTH, p.INT_WALL_THICK, 10 * FT,
+                 x=L.divider_x, y=current_y, z=0, color=COLOR_INT_WALL)
 
-# Row 2: One mat centered (north half, for practice/warm-up)
-mat3_x = (mat_area_width - MAT_SIZE) / 2 + EXT_WALL_THICK  # Centered
-mat3_y = MAT_OFFSET_Y + MAT_SIZE + MAT_GAP   # Above row 1
+# ============================================================================
+# 5. WRESTLING MAT AREA (3 mats - 76' x 100' open space)
+# ============================================================================
 
-# Create mat surfaces
-make_box("Wrestling_Mat_1", MAT_SIZE, MAT_SIZE, MAT_THICK,
-         x=mat1_x, y=mat1_y, z=0, color=COLOR_MAT)
+def mat_positions(p, L):
+    """(box name, label name, label text, x, y) for each placed mat
+    (MAT_COUNT, clamped to the rows that fit - L.mat_count)."""
+    count = int(L.mat_count)
+    mats = [
+        ("Wrestling_Mat_1", "Label_Mat1", "MAT 1\n(Competition)", L.mat1_x, L.mat1_y),
+        ("Wrestling_Mat_2", "Label_Mat2", "MAT 2\n(Competition)", L.mat2_x, L.mat2_y),
+        ("Wrestling_Mat_3_Warmup", "Label_Mat3", "MAT 3\n(Warm-Up/Practice)", L.mat3_x, L.mat3_y),
+    ][:count]
 
-make_box("Wrestling_Mat_2", MAT_SIZE, MAT_SIZE, MAT_THICK,
-         x=mat2_x, y=mat2_y, z=0, color=COLOR_MAT)
+    # Mats 4+ continue north of the warm-up mat, two per row
+    for n in range(4, count + 1):
+        row = 2 + (n - 4) // 2
+        x = L.mat1_x if n % 2 == 0 else L.mat2_x
+        y = p.MAT_OFFSET_Y + row * (p.MAT_SIZE + p.MAT_GAP)
+        mats.append((f"Wrestling_Mat_{n}", f"Label_Mat{n}", f"MAT {n}", x, y))
+    return mats
 
-make_box("Wrestling_Mat_3_Warmup", MAT_SIZE, MAT_SIZE, MAT_THICK,
-         x=mat3_x, y=mat3_y, z=0, color=COLOR_MAT)
+def build_mats(p, L):
+    for name, _label, _text, x, y in mat_positions(p, L):
+        make_box(name, p.MAT_SIZE, p.MAT_SIZE, p.MAT_THICK,
+                 x=x, y=y, z=0, color=COLOR_MAT)
 
 # ============================================================================
 # 6. SUPPORT ROOM FLOOR MARKERS (colored floors to show room use)
 # ============================================================================
 
-room_z = 1  # Just above slab (1mm) for visibility
+def build_room_floors(p, L):
+    floor_x = L.divider_x + p.INT_WALL_THICK
+    floor_depth = p.SUPPORT_DEPTH - p.INT_WALL_THICK
 
-# Office / Viewing Area (south end, east side)
-make_box("Floor_Office", SUPPORT_DEPTH - INT_WALL_THICK, OFFICE_WIDTH, 50,
-         x=divider_x + INT_WALL_THICK, y=0, z=room_z, color=COLOR_OFFICE)
+    # Office / Viewing Area (south end, east side)
+    make_box("Floor_Office", floor_depth, p.OFFICE_WIDTH, 50,
+             x=floor_x, y=0, z=L.room_z, color=COLOR_OFFICE)
 
-# Men's Locker Room
-make_box("Floor_LockerM", SUPPORT_DEPTH - INT_WALL_THICK, LOCKER_M_WIDTH, 50,
-         x=divider_x + INT_WALL_THICK, y=OFFICE_WIDTH, z=room_z, color=COLOR_LOCKER)
+    # Men's Locker Room
+    make_box("Floor_LockerM", floor_depth, p.LOCKER_M_WIDTH, 50,
+             x=floor_x, y=p.OFFICE_WIDTH, z=L.room_z, color=COLOR_LOCKER)
 
-# Women's Locker Room
-make_box("Floor_LockerW", SUPPORT_DEPTH - INT_WALL_THICK, LOCKER_W_WIDTH, 50,
-         x=divider_x + INT_WALL_THICK,
-         y=OFFICE_WIDTH + LOCKER_M_WIDTH, z=room_z,
-         color=(0.90, 0.75, 0.80))  # Pink tint
+    # Women's Locker Room
+    make_box("Floor_LockerW", floor_depth, p.LOCKER_W_WIDTH, 50,
+             x=floor_x,
+             y=p.OFFICE_WIDTH + p.LOCKER_M_WIDTH, z=L.room_z,
+             color=(0.90, 0.75, 0.80))  # Pink tint
 
-# Weight Room
-make_box("Floor_WeightRoom", SUPPORT_DEPTH - INT_WALL_THICK, WEIGHT_WIDTH, 50,
-         x=divider_x + INT_WALL_THICK,
-         y=OFFICE_WIDTH + LOCKER_M_WIDTH + LOCKER_W_WIDTH, z=room_z,
-         color=COLOR_WEIGHT)
+    # Weight Room
+    make_box("Floor_WeightRoom", floor_depth, p.WEIGHT_WIDTH, 50,
+             x=floor_x,
+             y=p.OFFICE_WIDTH + p.LOCKER_M_WIDTH + p.LOCKER_W_WIDTH, z=L.room_z,
+             color=COLOR_WEIGHT)
 
-# Mechanical / Storage (remaining space)
-mech_y = OFFICE_WIDTH + LOCKER_M_WIDTH + LOCKER_W_WIDTH + WEIGHT_WIDTH
-mech_height = BLDG_WIDTH - mech_y
-make_box("Floor_Mechanical", SUPPORT_DEPTH - INT_WALL_THICK, mech_height, 50,
-         x=divider_x + INT_WALL_THICK, y=mech_y, z=room_z,
-         color=(0.60, 0.60, 0.55))
+    # Mechanical / Storage (remaining space)
+    make_box("Floor_Mechanical", floor_depth, L.mech_height, 50,
+             x=floor_x, y=L.mech_y, z=L.room_z,
+             color=(0.60, 0.60, 0.55))
 
 # ============================================================================
 # 7. ROOF (Simple gable - represented as flat for now)
 # ============================================================================
 
-# Flat roof representation at eave height
-make_box("Roof_Panel", BLDG_LENGTH, BLDG_WIDTH, 4 * IN,
-         x=0, y=0, z=EAVE_HEIGHT, color=COLOR_ROOF)
+def build_roof(p, L):
+    # Flat roof representation at eave height
+    make_box("Roof_Panel", p.BLDG_LENGTH, p.BLDG_WIDTH, 4 * IN,
+             x=0, y=0, z=p.EAVE_HEIGHT, color=COLOR_ROOF)
 
-# Ridge beam (center peak for gable indication)
-ridge_height = (BLDG_WIDTH / 2) * (ROOF_PITCH / 12)  # Rise from 3:12 pitch
-make_box("Ridge_Beam", BLDG_LENGTH, 8 * IN, 12 * IN,
-         x=0, y=BLDG_WIDTH / 2 - 4 * IN, z=EAVE_HEIGHT + ridge_height,
-         color=(0.40, 0.40, 0.40))
+    make_box("Ridge_Beam", p.BLDG_LENGTH, 8 * IN, 12 * IN,
+             x=0, y=p.BLDG_WIDTH / 2 - 4 * IN, z=p.EAVE_HEIGHT + L.ridge_height,
+             color=(0.40, 0.40, 0.40))
 
 # ============================================================================
 # 8. STEEL COLUMNS (Typical metal building frame - every 25')
 # ============================================================================
 
-col_size = 8 * IN  # W8 column representation
-col_spacing = 25 * FT
+def build_columns(p, L):
+    col_size = L.col_size
 
-for i in range(5):  # 5 frames at 0', 25', 50', 75', 100'
-    y_pos = i * col_spacing
-    if y_pos >= BLDG_WIDTH:
-        y_pos = BLDG_WIDTH - col_size
+    for i in range(int(L.col_frames)):  # 5 frames at 0', 25', 50', 75', 100'
+        y_pos = i * L.col_spacing
+        if i == L.col_frames - 1:  # End frame sits inside the north wall
+            y_pos = p.BLDG_WIDTH - col_size
 
-    # West column
-    make_box(f"Column_West_{i}", col_size, col_size, EAVE_HEIGHT,
-             x=col_size, y=y_pos, z=0, color=(0.30, 0.30, 0.30))
+        # West column
+        make_box(f"Column_West_{i}", col_size, col_size, p.EAVE_HEIGHT,
+                 x=col_size, y=y_pos, z=0, color=(0.30, 0.30, 0.30))
 
-    # East column (at divider wall for interior support)
-    make_box(f"Column_East_{i}", col_size, col_size, EAVE_HEIGHT,
-             x=BLDG_LENGTH - SUPPORT_DEPTH, y=y_pos, z=0,
-             color=(0.30, 0.30, 0.30))
+        # East column (at divider wall for interior support)
+        make_box(f"Column_East_{i}", col_size, col_size, p.EAVE_HEIGHT,
+                 x=p.BLDG_LENGTH - p.SUPPORT_DEPTH, y=y_pos, z=0,
+                 color=(0.30, 0.30, 0.30))
 
-    # Far east column (exterior)
-    make_box(f"Column_FarEast_{i}", col_size, col_size, EAVE_HEIGHT,
-             x=BLDG_LENGTH - col_size * 2, y=y_pos, z=0,
-             color=(0.30, 0.30, 0.30))
+        # Far east column (exterior)
+        make_box(f"Column_FarEast_{i}", col_size, col_size, p.EAVE_HEIGHT,
+                 x=p.BLDG_LENGTH - col_size * 2, y=y_pos, z=0,
+                 color=(0.30, 0.30, 0.30))
 
 # ============================================================================
 # 9. DOORS
 # ============================================================================
 
-# Main entrance - double door on south wall (centered on mat area)
-entrance_x = mat_area_width / 2 - MAN_DOOR_W
-make_box("Door_Main_Entrance", MAN_DOOR_W * 2, EXT_WALL_THICK + 100, MAN_DOOR_H,
-         x=entrance_x, y=-50, z=0, color=(0.55, 0.35, 0.15))
+def build_doors(p, L):
+    # Main entrance - double door on south wall (centered on mat area)
+    make_box("Door_Main_Entrance", p.MAN_DOOR_W * 2, p.EXT_WALL_THICK + 100, p.MAN_DOOR_H,
+             x=L.entrance_x, y=-50, z=0, color=(0.55, 0.35, 0.15))
 
-# Roll-up door on north wall (equipment access)
-make_box("Door_RollUp_North", ROLL_DOOR_W, EXT_WALL_THICK + 100, ROLL_DOOR_H,
-         x=20 * FT, y=BLDG_WIDTH - EXT_WALL_THICK - 50, z=0,
-         color=(0.45, 0.45, 0.45))
+    # Roll-up door on north wall (equipment access)
+    make_box("Door_RollUp_North", p.ROLL_DOOR_W, p.EXT_WALL_THICK + 100, p.ROLL_DOOR_H,
+             x=20 * FT, y=p.BLDG_WIDTH - p.EXT_WALL_THICK - 50, z=0,
+             color=(0.45, 0.45, 0.45))
 
-# Office entrance (south wall, east side)
-make_box("Door_Office", MAN_DOOR_W, EXT_WALL_THICK + 100, MAN_DOOR_H,
-         x=divider_x + 4 * FT, y=-50, z=0, color=(0.55, 0.35, 0.15))
+    # Office entrance (south wall, east side)
+    make_box("Door_Office", p.MAN_DOOR_W, p.EXT_WALL_THICK + 100, p.MAN_DOOR_H,
+             x=L.divider_x + 4 * FT, y=-50, z=0, color=(0.55, 0.35, 0.15))
 
-# Emergency exit (east wall)
-make_box("Door_Emergency_East", EXT_WALL_THICK + 100, MAN_DOOR_W, MAN_DOOR_H,
-         x=BLDG_LENGTH - EXT_WALL_THICK - 50, y=50 * FT, z=0,
-         color=(0.80, 0.10, 0.10))
+    # Emergency exit (east wall)
+    make_box("Door_Emergency_East", p.EXT_WALL_THICK + 100, p.MAN_DOOR_W, p.MAN_DOOR_H,
+             x=p.BLDG_LENGTH - p.EXT_WALL_THICK - 50, y=50 * FT, z=0,
+             color=(0.80, 0.10, 0.10))
 
 # ============================================================================
 # 10. TELESCOPIC BEAM SYSTEM — PLEX FLEX™
@@ -361,128 +718,202 @@ make_box("Door_Emergency_East", EXT_WALL_THICK + 100, MAN_DOOR_W, MAN_DOOR_H,
 # to Z = +42' fully deployed) to seat 2,600 additional spectators.
 # Automated safety flaps cover the floor gaps when the bleachers ascend.
 
-mat_area_width_val = divider_x - EXT_WALL_THICK  # Usable mat-area width
-
-# ---- 10a. Deep Pits (North & South) ----
-# North pit — sits against the inside of the north wall
-pit_north_y = BLDG_WIDTH - EXT_WALL_THICK - TELE_PIT_WIDTH
-make_box("Pit_North", TELE_PIT_LENGTH, TELE_PIT_WIDTH, TELE_PIT_DEPTH,
-         x=EXT_WALL_THICK, y=pit_north_y, z=-TELE_PIT_DEPTH,
-         color=COLOR_PIT)
-
-# South pit — sits against the inside of the south wall
-pit_south_y = EXT_WALL_THICK
-make_box("Pit_South", TELE_PIT_LENGTH, TELE_PIT_WIDTH, TELE_PIT_DEPTH,
-         x=EXT_WALL_THICK, y=pit_south_y, z=-TELE_PIT_DEPTH,
-         color=COLOR_PIT)
-
-# ---- 10b. Elevating Beams (stowed position: Z = -24') ----
-beam_length = TELE_PIT_LENGTH       # Each beam spans the pit length
-beam_width  = TELE_PIT_WIDTH / TELE_ROWS * 3   # Width per beam section
-
-for end_tag, pit_y in [("North", pit_north_y), ("South", pit_south_y)]:
-    count = 1 if end_tag == "North" else -1
-    for r in range(TELE_ROWS):
-        elevation = r * TELE_BEAM_HEIGHT
-        horizontal_step = (TELE_ROWS - 1 - r) * TELE_HORIZ_STEP * count
-
-        beam = doc.addObject("Part::Box", f"ElevatingBeam_{end_tag}_Row_{r}")
-        beam.Length = beam_length
-        beam.Width  = beam_width
-        beam.Height = TELE_BEAM_HEIGHT * 0.9  # Slight gap between rows
-        beam.Placement = App.Placement(
-            App.Vector(
-                EXT_WALL_THICK,
-                pit_y - horizontal_step,
-                TELE_STOW_Z + elevation
-            ),
-            App.Rotation()
-        )
-        beam.ViewObject.ShapeColor = COLOR_BEAM
-
-# ---- 10c. Safety Interlock Flaps ----
-# Automated steel flaps cover the floor openings when beams are deployed.
-# One flap per pit, hinged at the pit edge (modeled flat / closed position).
-
-make_box("SafetyFlap_North", TELE_PIT_LENGTH, TELE_PIT_WIDTH, TELE_FLAP_THICK,
-         x=EXT_WALL_THICK, y=pit_north_y, z=-TELE_FLAP_THICK,
-         color=COLOR_FLAP)
-
-make_box("SafetyFlap_South", TELE_PIT_LENGTH, TELE_PIT_WIDTH, TELE_FLAP_THICK,
-         x=EXT_WALL_THICK, y=pit_south_y, z=-TELE_FLAP_THICK,
-         color=COLOR_FLAP)
+def build_plexflex(p, L):
+    # ---- 10a. Deep Pits (North & South) ----
+    # North pit — sits against the inside of the north wall
+    make_box("Pit_North", p.TELE_PIT_LENGTH, p.TELE_PIT_WIDTH, p.TELE_PIT_DEPTH,
+             x=p.EXT_WALL_THICK, y=L.pit_north_y, z=-p.TELE_PIT_DEPTH,
+             color=COLOR_PIT)
+
+    # South pit — sits against the inside of the south wall
+    make_box("Pit_South", p.TELE_PIT_LENGTH, p.TELE_PIT_WIDTH, p.TELE_PIT_DEPTH,
+             x=p.EXT_WALL_THICK, y=L.pit_south_y, z=-p.TELE_PIT_DEPTH,
+             color=COLOR_PIT)
+
+    # ---- 10b. Elevating Beams (stowed position: Z = -24') ----
+    for end_tag, pit_y in [("North", L.pit_north_y), ("South", L.pit_south_y)]:
+        count = 1 if end_tag == "North" else -1
+        for r in range(p.TELE_ROWS):
+            elevation = r * p.TELE_BEAM_HEIGHT
+            horizontal_step = (p.TELE_ROWS - 1 - r) * p.TELE_HORIZ_STEP * count
+
+            make_box(f"ElevatingBeam_{end_tag}_Row_{r}",
+                     L.beam_length, L.beam_width,
+                     p.TELE_BEAM_HEIGHT * 0.9,  # Slight gap between rows
+                     x=p.EXT_WALL_THICK,
+                     y=pit_y - horizontal_step,
+                     z=p.TELE_STOW_Z + elevation,
+                     color=COLOR_BEAM)
+
+    # ---- 10c. Safety Interlock Flaps ----
+    # Automated steel flaps cover the floor openings when beams are deployed.
+    # One flap per pit, hinged at the pit edge (modeled flat / closed position).
+    make_box("SafetyFlap_North", p.TELE_PIT_LENGTH, p.TELE_PIT_WIDTH, p.TELE_FLAP_THICK,
+             x=p.EXT_WALL_THICK, y=L.pit_north_y, z=-p.TELE_FLAP_THICK,
+             color=COLOR_FLAP)
+
+    make_box("SafetyFlap_South", p.TELE_PIT_LENGTH, p.TELE_PIT_WIDTH, p.TELE_FLAP_THICK,
+             x=p.EXT_WALL_THICK, y=L.pit_south_y, z=-p.TELE_FLAP_THICK,
+             color=COLOR_FLAP)
 
 # ============================================================================
 # 11. LABELS (Text annotations for rooms)
 # ============================================================================
 
-labels = [
-    ("Label_Mat1", "MAT 1\n(Competition)", mat1_x + MAT_SIZE/2, mat1_y + MAT_SIZE/2),
-    ("Label_Mat2", "MAT 2\n(Competition)", mat2_x + MAT_SIZE/2, mat2_y + MAT_SIZE/2),
-    ("Label_Mat3", "MAT 3\n(Warm-Up/Practice)", mat3_x + MAT_SIZE/2, mat3_y + MAT_SIZE/2),
-    ("Label_Office", "OFFICE /\nVIEWING AREA", divider_x + SUPPORT_DEPTH/2, OFFICE_WIDTH/2),
-    ("Label_LockerM", "MEN'S\nLOCKER", divider_x + SUPPORT_DEPTH/2, OFFICE_WIDTH + LOCKER_M_WIDTH/2),
-    ("Label_LockerW", "WOMEN'S\nLOCKER", divider_x + SUPPORT_DEPTH/2, OFFICE_WIDTH + LOCKER_M_WIDTH + LOCKER_W_WIDTH/2),
-    ("Label_Weight", "WEIGHT ROOM", divider_x + SUPPORT_DEPTH/2, OFFICE_WIDTH + LOCKER_M_WIDTH + LOCKER_W_WIDTH + WEIGHT_WIDTH/2),
-    ("Label_Mech", "MECH /\nSTORAGE", divider_x + SUPPORT_DEPTH/2, mech_y + mech_height/2),
-    ("Label_Pit_North", "TELESCOPIC PIT\n(NORTH)", TELE_PIT_LENGTH/2 + EXT_WALL_THICK, pit_north_y + TELE_PIT_WIDTH/2),
-    ("Label_Pit_South", "TELESCOPIC PIT\n(SOUTH)", TELE_PIT_LENGTH/2 + EXT_WALL_THICK, pit_south_y + TELE_PIT_WIDTH/2),
+def facility_labels(p, L):
+    """Return the (name, text, x, y) room/mat/pit annotations."""
+    room_x = L.divider_x + p.SUPPORT_DEPTH / 2
+    mats = [(label, text, x + p.MAT_SIZE/2, y + p.MAT_SIZE/2)
+            for _name, label, text, x, y in mat_positions(p, L)]
+    return mats + [
+        ("Label_Office", "OFFICE /\nVIEWING AREA", room_x, p.OFFICE_WIDTH/2),
+        ("Label_LockerM", "MEN'S\nLOCKER", room_x, p.OFFICE_WIDTH + p.LOCKER_M_WIDTH/2),
+        ("Label_LockerW", "WOMEN'S\nLOCKER", room_x, p.OFFICE_WIDTH + p.LOCKER_M_WIDTH + p.LOCKER_W_WIDTH/2),
+        ("Label_Weight", "WEIGHT ROOM", room_x, p.OFFICE_WIDTH + p.LOCKER_M_WIDTH + p.LOCKER_W_WIDTH + p.WEIGHT_WIDTH/2),
+        ("Label_Mech", "MECH /\nSTORAGE", room_x, L.mech_y + L.mech_height/2),
+        ("Label_Pit_North", "TELESCOPIC PIT\n(NORTH)", p.TELE_PIT_LENGTH/2 + p.EXT_WALL_THICK, L.pit_north_y + p.TELE_PIT_WIDTH/2),
+        ("Label_Pit_South", "TELESCOPIC PIT\n(SOUTH)", p.TELE_PIT_LENGTH/2 + p.EXT_WALL_THICK, L.pit_south_y + p.TELE_PIT_WIDTH/2),
+    ]
+
+def build_labels(p, L):
+    for name, text, x, y in facility_labels(p, L):
+        make_text_label(name, text, x, y, z=500)
+
+# ============================================================================
+# 12. BUILD (all sections, in order, into one backend)
+# ============================================================================
+
+# (key, title, builder) - keys are stable; other tools refer to sections by key
+SECTIONS = [
+    ("slab",           "1. Concrete Slab Foundation",   build_slab),
+    ("exterior_walls", "2. Exterior Walls",             build_exterior_walls),
+    ("room_walls",     "3-4. Interior Walls",           build_room_walls),
+    ("mats",           "5. Wrestling Mats",             build_mats),
+    ("room_floors",    "6. Support Room Floors",        build_room_floors),
+    ("roof",           "7. Roof",                       build_roof),
+    ("columns",        "8. Steel Columns",              build_columns),
+    ("doors",          "9. Doors",                      build_doors),
+    ("plexflex",       "10. PLEX FLEX Pits/Beams/Flaps", build_plexflex),
+    ("labels",         "11. Labels",                    build_labels),
 ]
 
-for name, text, x, y in labels:
-    make_text_label(name, text, x, y, z=500)
 
-# ============================================================================
-# 12. RECOMPUTE AND FIT VIEW
-# ============================================================================
-
-doc.recompute()
-
-# Try to fit the view
-try:
-    import FreeCADGui as Gui
-    Gui.activeDocument().activeView().viewIsometric()
-    Gui.SendMsgToActiveView("ViewFit")
-except:
-    pass  # Running headless or no GUI
+@contextmanager
+def _no_span(name, category):
+    yield
+
+
+def build_facility(params=None, backend=None, cache=None, profiler=None):
+    """Build the whole facility and return the backend it was drawn into.
+
+    `params` overrides entries of the BUILDING PARAMETERS block by name
+    (values in mm, like the constants).  `backend` defaults to a fresh
+    in-memory SceneBackend; pass FreeCADBackend() for a real document.
+    `cache` (facility.cache.BuildCache) restores unchanged sections' geometry
+    from disk into FreeCAD backends.
+    `profiler` (facility.profile.Profiler) times each section, helper call
+    and the final recompute.
+    The resolved params and derived layout are kept on the backend as
+    `.params` and `.layout`.
+    """
+    if profiler is None:
+        span, target = _no_span, backend
+    else:
+        span, target = profiler.span, profiler.wrap(backend or SceneBackend())
+        backend = target.inner
+    p = resolve_params(params)
+    L = facility_layout(p)
+    if backend is None:
+        backend = target = SceneBackend()
+
+    with drawing_into(target):
+        for key, title, section in SECTIONS:
+            with span(title, "section"):
+                if cache is None:
+                    section(p, L)
+                else:
+                    cache.run_section(key, section, p, L)
+        with span("recompute", "document"):
+            target.recompute()
+
+    backend.params = p
+    backend.layout = L
+    return backend
 
 # ============================================================================
 # BUILDING SUMMARY
 # ============================================================================
 
-print("=" * 60)
-print("  PHASE 1 WRESTLING TRAINING FACILITY")
-print("  Ben & Gino Wrestling Program - Hazel Green, AL")
-print("=" * 60)
-print(f"  Building:     {BLDG_LENGTH/FT:.0f}' x {BLDG_WIDTH/FT:.0f}' = {(BLDG_LENGTH/FT * BLDG_WIDTH/FT):,.0f} SF")
-print(f"  Eave Height:  {EAVE_HEIGHT/FT:.0f} feet")
-print(f"  Roof Pitch:   {ROOF_PITCH}:12")
-print(f"  Slab:         {SLAB_THICK/IN:.0f}\" reinforced concrete")
-print(f"")
-print(f"  MAT AREA:     {mat_area_width/FT:.0f}' x {BLDG_WIDTH/FT:.0f}'")
-print(f"  - Mat 1:      {MAT_SIZE/FT:.0f}' x {MAT_SIZE/FT:.0f}' (Competition)")
-print(f"  - Mat 2:      {MAT_SIZE/FT:.0f}' x {MAT_SIZE/FT:.0f}' (Competition)")
-print(f"  - Mat 3:      {MAT_SIZE/FT:.0f}' x {MAT_SIZE/FT:.0f}' (Warm-Up)")
-print(f"")
-print(f"  SUPPORT AREA: {SUPPORT_DEPTH/FT:.0f}' deep (east side)")
-print(f"  - Office:     {SUPPORT_DEPTH/FT:.0f}' x {OFFICE_WIDTH/FT:.0f}'")
-print(f"  - Men's Lock: {SUPPORT_DEPTH/FT:.0f}' x {LOCKER_M_WIDTH/FT:.0f}'")
-print(f"  - Women Lock: {SUPPORT_DEPTH/FT:.0f}' x {LOCKER_W_WIDTH/FT:.0f}'")
-print(f"  - Weight Rm:  {SUPPORT_DEPTH/FT:.0f}' x {WEIGHT_WIDTH/FT:.0f}'")
-print(f"  - Mechanical: {SUPPORT_DEPTH/FT:.0f}' x {mech_height/FT:.0f}'")
-print(f"")
-print(f"  PLEX FLEX™ TELESCOPIC BEAMS:")
-print(f"  - Rows:       {TELE_ROWS}")
-print(f"  - Capacity:   {TELE_EXTRA_SEATS:,} extra spectators")
-print(f"  - Stowed Z:   {TELE_STOW_Z/FT:.0f}' (below slab)")
-print(f"  - Deployed Z: {TELE_DEPLOY_Z/FT:.0f}' (above floor)")
-print(f"  - Pit Depth:  {TELE_PIT_DEPTH/FT:.0f}' below grade")
-print(f"  - Safety:     Automated interlock flaps ({TELE_FLAP_THICK/IN:.0f}\" steel)")
-print(f"")
-print(f"  CONTRACTORS:")
-print(f"  - Metal Bldg: Summer Time Metals")
-print(f"  - Concrete:   SRM Concrete")
-print(f"  - Windows:    Coach's Window Company")
-print("=" * 60)
-print("  Model created successfully! Use View > Fit All to see.")
-print("=" * 60)
+def print_summary(p, L):
+    print("=" * 60)
+    print("  PHASE 1 WRESTLING TRAINING FACILITY")
+    print("  Ben & Gino Wrestling Program - Hazel Green, AL")
+    print("=" * 60)
+    print(f"  Building:     {p.BLDG_LENGTH/FT:.0f}' x {p.BLDG_WIDTH/FT:.0f}' = {(p.BLDG_LENGTH/FT * p.BLDG_WIDTH/FT):,.0f} SF")
+    print(f"  Eave Height:  {p.EAVE_HEIGHT/FT:.0f} feet")
+    print(f"  Roof Pitch:   {p.ROOF_PITCH}:12")
+    print(f"  Slab:         {p.SLAB_THICK/IN:.0f}\" reinforced concrete")
+    print(f"")
+    print(f"  MAT AREA:     {L.mat_area_width/FT:.0f}' x {p.BLDG_WIDTH/FT:.0f}'")
+    mat_count = int(L.mat_count)
+    for n, use in enumerate(["Competition", "Competition", "Warm-Up"][:mat_count], 1):
+        print(f"  - Mat {n}:      {p.MAT_SIZE/FT:.0f}' x {p.MAT_SIZE/FT:.0f}' ({use})")
+    if mat_count > 3:
+        print(f"  - Mats 4-{mat_count}:   {p.MAT_SIZE/FT:.0f}' x {p.MAT_SIZE/FT:.0f}' (north, in pairs)")
+    if mat_count < p.MAT_COUNT:
+        print(f"  - Not placed: {p.MAT_COUNT - mat_count} of {p.MAT_COUNT} mats (past the north wall)")
+    print(f"")
+    print(f"  SUPPORT AREA: {p.SUPPORT_DEPTH/FT:.0f}' deep (east side)")
+    print(f"  - Office:     {p.SUPPORT_DEPTH/FT:.0f}' x {p.OFFICE_WIDTH/FT:.0f}'")
+    print(f"  - Men's Lock: {p.SUPPORT_DEPTH/FT:.0f}' x {p.LOCKER_M_WIDTH/FT:.0f}'")
+    print(f"  - Women Lock: {p.SUPPORT_DEPTH/FT:.0f}' x {p.LOCKER_W_WIDTH/FT:.0f}'")
+    print(f"  - Weight Rm:  {p.SUPPORT_DEPTH/FT:.0f}' x {p.WEIGHT_WIDTH/FT:.0f}'")
+    print(f"  - Mechanical: {p.SUPPORT_DEPTH/FT:.0f}' x {L.mech_height/FT:.0f}'")
+    print(f"")
+    print(f"  PLEX FLEX™ TELESCOPIC BEAMS:")
+    print(f"  - Rows:       {p.TELE_ROWS}")
+    print(f"  - Capacity:   {p.TELE_EXTRA_SEATS:,} extra spectators")
+    print(f"  - Stowed Z:   {p.TELE_STOW_Z/FT:.0f}' (below slab)")
+    print(f"  - Deployed Z: {p.TELE_DEPLOY_Z/FT:.0f}' (above floor)")
+    print(f"  - Pit Depth:  {p.TELE_PIT_DEPTH/FT:.0f}' below grade")
+    print(f"  - Safety:     Automated interlock flaps ({p.TELE_FLAP_THICK/IN:.0f}\" steel)")
+    print(f"")
+    print(f"  CONTRACTORS:")
+    print(f"  - Metal Bldg: Summer Time Metals")
+    print(f"  - Concrete:   SRM Concrete")
+    print(f"  - Windows:    Coach's Window Company")
+    print("=" * 60)
+
+# ============================================================================
+# MAIN (FreeCAD macro / console, or plain python3 for the in-memory scene)
+# ============================================================================
+
+def main():
+    try:
+        backend = FreeCADBackend(batch=BATCH_GEOMETRY)
+    except ImportError:
+        backend = SceneBackend()  # No FreeCAD here - build the in-memory scene
+
+    t0 = time.perf_counter()
+    build_facility(backend=backend)
+    elapsed = time.perf_counter() - t0
+
+    # Try to fit the view
+    try:
+        import FreeCADGui as Gui
+        Gui.activeDocument().activeView().viewIsometric()
+        Gui.SendMsgToActiveView("ViewFit")
+    except Exception:
+        pass  # Running headless or no GUI
+
+    print_summary(backend.params, backend.layout)
+    if isinstance(backend, FreeCADBackend):
+        print("  Model created successfully! Use View > Fit All to see.")
+    else:
+        print(f"  In-memory scene: {len(backend)} boxes, "
+              f"{len(backend.labels)} labels in {elapsed * 1000:.1f} ms")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()